@@ -12,5 +12,5 @@ class AuditLogViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets
     queryset = AuditLog.objects.select_related("actor").all()
     permission_classes = [IsAuthenticated]
     filterset_fields = ["action", "entity_type", "actor"]
-    search_fields = ["entity_id", "action", "metadata"]
+    search_fields = ["entity_id", "action"]
     ordering_fields = ["created_at"]
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from audit.spool import claim, claimed_files, ingest_file
+
+
+class Command(BaseCommand):
+    help = "Load audit entries spooled with AUDIT_LOG_SINK=spool into the audit log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", type=str, help="Spool file, defaults to AUDIT_SPOOL_PATH")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Entries inserted per bulk insert")
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.AUDIT_SPOOL_PATH
+        # Files left over from an interrupted run go first, then the live spool.
+        pending = claimed_files(path)
+        claimed = claim(path)
+        if claimed:
+            pending.append(claimed)
+        total = 0
+        for spool_file in pending:
+            total += ingest_file(spool_file, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Ingested {total} audit entr{'y' if total == 1 else 'ies'} from {len(pending)} spool file(s)"))
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_entity_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='compact',
+            field=models.BooleanField(default=False),
+        ),
+    ]
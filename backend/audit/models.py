@@ -13,9 +13,25 @@ class AuditLog(TimeStampedModel):
     before = models.JSONField(null=True, blank=True)
     after = models.JSONField(null=True, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
+    # True when before/after hold only the fields that changed; see audit.utils.snapshot_at.
+    compact = models.BooleanField(default=False)
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="audit_keyset_idx"),
+            models.Index(fields=["entity_type", "entity_id", "created_at"], name="audit_entity_idx"),
+        ]
 
     def __str__(self):  # pragma: no cover
         return f"{self.action} {self.entity_type}#{self.entity_id}"
+
+
+class AuditSpoolFile(TimeStampedModel):
+    """A claimed spool file already loaded into the audit log; see ``audit.spool``."""
+
+    name = models.CharField(max_length=255, unique=True)
+    entries = models.PositiveIntegerField(default=0)
+
+    def __str__(self):  # pragma: no cover
+        return self.name
@@ -20,6 +20,20 @@ class AuditLogSerializer(serializers.ModelSerializer):
             "before",
             "after",
             "metadata",
+            "compact",
             "created_at",
         ]
         read_only_fields = fields
+
+
+class AuditReportQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    action = serializers.CharField(required=False)
+    entity_type = serializers.CharField(required=False)
+    actor = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"end": "End must be on or after start."})
+        return attrs
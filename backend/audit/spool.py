@@ -0,0 +1,126 @@
+"""Append-only spool file for audit entries written out of band.
+
+With ``AUDIT_LOG_SINK=spool`` committed entries are appended to
+``AUDIT_SPOOL_PATH`` as JSON lines instead of being inserted, and
+``ingest_audit_spool`` loads them into ``AuditLog`` later. Writers and the
+ingester take an exclusive ``flock`` on the file: the ingester renames the file
+while holding it, and a writer that finds its file renamed underneath it
+reopens the path, so no line is appended to a file already claimed.
+
+A claimed file is recorded in ``AuditSpoolFile`` in the transaction that
+inserts its entries and deleted afterwards; a file left behind by a crash in
+between is recognised by name and not loaded twice.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import glob
+import json
+import os
+import socket
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from django.db import connection, transaction
+
+from .models import AuditLog, AuditSpoolFile
+
+SPOOL_FIELDS = ("actor_id", "action", "entity_type", "entity_id", "before", "after", "metadata", "compact")
+
+_RESTORE_CREATED_AT_SQL = """
+UPDATE {table} AS a SET created_at = v.created_at
+FROM unnest(%(ids)s::bigint[], %(created_at)s::timestamptz[]) AS v(id, created_at)
+WHERE a.id = v.id
+"""
+
+
+def _record(entry: AuditLog) -> Dict:
+    record = {field: getattr(entry, field) for field in SPOOL_FIELDS}
+    record["created_at"] = entry.created_at.isoformat()
+    return record
+
+
+def append_entries(path: str, entries: Iterable[AuditLog]) -> None:
+    payload = "".join(json.dumps(_record(entry), separators=(",", ":")) + "\n" for entry in entries).encode()
+    if not payload:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if current.st_ino != os.fstat(fd).st_ino:
+                # Claimed by the ingester between our open and our lock.
+                continue
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view) :]
+            return
+        finally:
+            os.close(fd)
+
+
+def claim(path: str) -> Optional[str]:
+    """Move the live spool aside for ingestion and return its new path."""
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        # Names must be unique across hosts: ingested files are remembered by name.
+        claimed = f"{path}.{socket.gethostname()}.{datetime.now().strftime('%Y%m%d%H%M%S%f')}.ingesting"
+        os.replace(path, claimed)
+        return claimed
+    finally:
+        os.close(fd)
+
+
+def claimed_files(path: str) -> List[str]:
+    """Spools claimed earlier but not yet ingested (oldest first), e.g. after a crash."""
+
+    return sorted(glob.glob(f"{glob.escape(path)}.*.ingesting"))
+
+
+def _read(path: str) -> Iterator[AuditLog]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.endswith("\n"):
+                break  # A write cut short by a crash; everything before it is intact.
+            record = json.loads(line)
+            created_at = datetime.fromisoformat(record.pop("created_at"))
+            entry = AuditLog(**record)
+            entry.spooled_at = created_at
+            yield entry
+
+
+def ingest_file(path: str, chunk_size: int = 1000) -> int:
+    """Insert a claimed spool file's entries, keeping their original timestamps, then delete it.
+
+    Returns the number of entries inserted: 0 for a file that was already ingested.
+    """
+
+    name = os.path.basename(path)
+    if AuditSpoolFile.objects.filter(name=name).exists():
+        os.remove(path)
+        return 0
+    entries = list(_read(path))
+    with transaction.atomic():
+        # Unique on name, so a concurrent ingest of the same file fails here and rolls back.
+        AuditSpoolFile.objects.create(name=name, entries=len(entries))
+        for start in range(0, len(entries), chunk_size):
+            chunk = AuditLog.objects.bulk_create(entries[start : start + chunk_size])
+            # created_at is auto_now_add, so the insert stamped it with the ingest time.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    _RESTORE_CREATED_AT_SQL.format(table=AuditLog._meta.db_table),
+                    {"ids": [entry.pk for entry in chunk], "created_at": [entry.spooled_at for entry in chunk]},
+                )
+    os.remove(path)
+    return len(entries)
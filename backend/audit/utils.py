@@ -1,19 +1,43 @@
+"""Audit entry writers.
+
+``log_action`` inserts its entry straight away. Inside ``buffered_audit()`` the
+entries are collected instead and inserted with one ``bulk_create`` just before
+the block's transaction commits, so a rolled-back block leaves no entries. With
+``AUDIT_LOG_SINK=spool`` entries are appended to the spool file after commit
+instead (see ``audit.spool``).
+"""
+
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.utils import timezone
 
-from common.utils import diff_model
+from common.utils import diff_model, loaded_values, remember_values
 from .models import AuditLog
+from .spool import append_entries
 
+_local = threading.local()
 
 
 def _to_serializable(value):
     from datetime import date, datetime
+    from decimal import Decimal
+
+    from django.db.models.fields.files import FieldFile
 
     if isinstance(value, (datetime, date)):
         return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, FieldFile):
+        return value.name or None
     if isinstance(value, dict):
         return {k: _to_serializable(v) for k, v in value.items()}
     if isinstance(value, list):
@@ -21,17 +45,125 @@ def _to_serializable(value):
     return value
 
 
-@transaction.atomic
+def write_entries(entries: List[AuditLog]) -> None:
+    if not entries:
+        return
+    if settings.AUDIT_LOG_SINK == "spool":
+        path = settings.AUDIT_SPOOL_PATH
+        transaction.on_commit(lambda: append_entries(path, entries))
+    elif len(entries) == 1:
+        entries[0].save(force_insert=True)
+    else:
+        AuditLog.objects.bulk_create(entries)
+
+
+def _buffer() -> Optional[List[AuditLog]]:
+    return getattr(_local, "buffer", None)
+
+
+def _same(field, old, new) -> bool:
+    # Compare as the field would store them, so "5000" and Decimal("5000.00") are one value.
+    old, new = _to_serializable(old), _to_serializable(new)
+    if field is None:
+        return old == new
+    try:
+        return field.to_python(old) == field.to_python(new)
+    except ValidationError:
+        return old == new
+
+
+def _changes(model, previous: Dict[str, Any], current: Dict[str, Any]):
+    fields = {field.name: field for field in model._meta.concrete_fields}
+    changed = [
+        name for name, value in current.items() if name not in previous or not _same(fields.get(name), previous[name], value)
+    ]
+    return {name: previous.get(name) for name in changed}, {name: current[name] for name in changed}
+
+
 def log_action(*, actor, action: str, instance, before: Optional[Dict[str, Any]] = None, after: Optional[Dict[str, Any]] = None, metadata: Optional[Dict[str, Any]] = None):
-    """Persist an audit entry for the given instance."""
+    """Persist an audit entry for the given instance.
+
+    With ``AUDIT_DIFF_MODE=changes`` (the default), ``before`` and ``after`` hold
+    only the fields that differ from ``before`` or, when it is not given, from the
+    values the instance was loaded with. Entries with no earlier state to compare
+    against (creations, explicit ``after``) store the full snapshot.
+    """
 
-    after_payload = after or diff_model(instance)
-    AuditLog.objects.create(
+    compact = False
+    if after is not None:
+        before_payload, after_payload = _to_serializable(before), _to_serializable(after)
+    else:
+        current = diff_model(instance)
+        previous = before if before is not None else loaded_values(instance)
+        if settings.AUDIT_DIFF_MODE == "changes" and previous is not None:
+            before_payload, after_payload = map(_to_serializable, _changes(type(instance), previous, current))
+            compact = True
+        else:
+            before_payload, after_payload = _to_serializable(before), _to_serializable(current)
+    entry = AuditLog(
         actor=actor,
         action=action,
         entity_type=instance._meta.label,
         entity_id=str(instance.pk),
-        before=_to_serializable(before) if before else None,
-        after=_to_serializable(after_payload) if after_payload else None,
+        before=before_payload or None,
+        after=after_payload or None,
         metadata=_to_serializable(metadata) if metadata else {},
+        compact=compact,
+        created_at=timezone.now(),
     )
+    remember_values(instance)
+    buffer = _buffer()
+    if buffer is None:
+        write_entries([entry])
+    else:
+        buffer.append(entry)
+
+
+@contextmanager
+def buffered_audit() -> Iterator[None]:
+    """Run the block in a transaction and write its audit entries together at the end.
+
+    Nested blocks join the outermost one, which does the single write.
+    """
+
+    if _buffer() is not None:
+        with transaction.atomic():
+            yield
+        return
+
+    _local.buffer = []
+    try:
+        with transaction.atomic():
+            yield
+            write_entries(_local.buffer)
+    finally:
+        _local.buffer = None
+
+
+# Written on every path, audited or not, so never reliable in a rebuilt snapshot.
+UNTRACKED_FIELDS = ("updated_at", "updated_by")
+
+
+def snapshot_at(entity_type: str, entity_id: str, at=None) -> Optional[Dict[str, Any]]:
+    """Rebuild a record's audited fields as of ``at`` (default: now) from its entries.
+
+    Full entries replace the snapshot and compact ones update the fields they
+    changed. Only fields written through ``log_action`` can be rebuilt, so the
+    model's ``UNAUDITED_FIELDS`` (kept up to date by set-based writes, such as
+    statement totals) and ``UNTRACKED_FIELDS`` are left out. Returns None when
+    the record has no entries by then.
+    """
+
+    entries = AuditLog.objects.filter(entity_type=entity_type, entity_id=str(entity_id))
+    if at is not None:
+        entries = entries.filter(created_at__lte=at)
+    snapshot = None
+    for after, compact in entries.order_by("created_at", "id").values_list("after", "compact"):
+        if compact and snapshot is not None:
+            snapshot.update(after or {})
+        else:
+            snapshot = dict(after or {})
+    if snapshot is not None:
+        for name in (*UNTRACKED_FIELDS, *getattr(apps.get_model(entity_type), "UNAUDITED_FIELDS", ())):
+            snapshot.pop(name, None)
+    return snapshot
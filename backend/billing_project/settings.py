@@ -43,6 +43,8 @@ INSTALLED_APPS = [
     "payments",
     "sequences",
     "reports",
+    "ledger",
+    "search",
     "audit",
 ]
 
@@ -105,9 +107,14 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.KeysetPagination",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# List endpoints return keyset pages of this size; `?page_size=` may raise it up to the max
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "30"))),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", "7"))),
@@ -162,6 +169,31 @@ PLAYWRIGHT_LAUNCH_OPTIONS = {
 PLAYWRIGHT_TIMEOUT_MS = int(os.getenv("PLAYWRIGHT_TIMEOUT_MS", "30000"))
 PLAYWRIGHT_STORAGE_PATH = os.getenv("PLAYWRIGHT_STORAGE_PATH", str((MEDIA_ROOT / "pdf")))
 os.makedirs(PLAYWRIGHT_STORAGE_PATH, exist_ok=True)
+# Bump to invalidate every cached SOA PDF (e.g. after changing fonts or CSS assets).
+SOA_TEMPLATE_VERSION = os.getenv("SOA_TEMPLATE_VERSION", "1")
+# Warm Chromium instances kept per process; each is relaunched after N renders.
+PDF_BROWSER_POOL_SIZE = int(os.getenv("PDF_BROWSER_POOL_SIZE", "2"))
+PDF_BROWSER_MAX_RENDERS = int(os.getenv("PDF_BROWSER_MAX_RENDERS", "200"))
+# Background render queue drained by `manage.py run_pdf_worker`.
+PDF_WORKER_CONCURRENCY = int(os.getenv("PDF_WORKER_CONCURRENCY", "2"))
+PDF_JOB_MAX_ATTEMPTS = int(os.getenv("PDF_JOB_MAX_ATTEMPTS", "3"))
+PDF_JOB_STALE_SECONDS = int(os.getenv("PDF_JOB_STALE_SECONDS", "600"))
+# A failed render waits this long before its retry, doubling per failed attempt.
+PDF_JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("PDF_JOB_RETRY_BACKOFF_SECONDS", "30"))
+# Retainer cycle: engagements generated per transaction.
+RETAINER_CYCLE_CHUNK_SIZE = int(os.getenv("RETAINER_CYCLE_CHUNK_SIZE", "500"))
+# Queued cycle runs drained by `manage.py run_cycle_worker`; stale runs resume from their last chunk.
+RETAINER_CYCLE_JOB_MAX_ATTEMPTS = int(os.getenv("RETAINER_CYCLE_JOB_MAX_ATTEMPTS", "3"))
+RETAINER_CYCLE_JOB_STALE_SECONDS = int(os.getenv("RETAINER_CYCLE_JOB_STALE_SECONDS", "600"))
+# Report response cache: "memory" (per process), "file" (shared directory) or "none"; LRU-bounded.
+REPORT_CACHE_BACKEND = os.getenv("REPORT_CACHE_BACKEND", "memory")
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", str(BASE_DIR / "var" / "report-cache"))
+# Audit entries: "database" (inserted in the writing transaction) or "spool" (appended to a file after commit)
+AUDIT_LOG_SINK = os.getenv("AUDIT_LOG_SINK", "database")
+AUDIT_SPOOL_PATH = os.getenv("AUDIT_SPOOL_PATH", str(BASE_DIR / "var" / "audit.spool"))
+# "changes" stores only the changed fields in audit before/after; "full" stores whole snapshots
+AUDIT_DIFF_MODE = os.getenv("AUDIT_DIFF_MODE", "changes")
 
 # Logging
 LOGGING = {
@@ -7,21 +7,34 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, Spec
 
 from accounts.api import UserViewSet, AuthViewSet
 from clients.api import ClientViewSet, ContactViewSet
-from engagements.api import EngagementViewSet
-from statements.api import BillingStatementViewSet, BillingItemViewSet
+from engagements.api import EngagementViewSet, RetainerCycleJobViewSet
+from statements.api import BillingStatementViewSet, BillingItemViewSet, PdfRenderJobViewSet
 from payments.api import PaymentViewSet, PaymentAllocationViewSet, UnappliedCreditViewSet
 from sequences.api import SequenceViewSet
-from reports.api import AgingReportView, CollectionsRegisterView, UnappliedCreditReportView, AuditLogView
+from reports.api import (
+    AgingReportView,
+    AuditEntityHistoryView,
+    AuditLogView,
+    ClientBalanceReportView,
+    CollectionsRegisterView,
+    DashboardView,
+    ReportCacheStatsView,
+    RetainerForecastView,
+    UnappliedCreditReportView,
+)
 from audit.api import AuditLogViewSet
+from search.api import SearchView
 from common.views import DevResetView
 
 router = routers.DefaultRouter()
 router.register(r"users", UserViewSet, basename="user")
 router.register(r"clients", ClientViewSet, basename="client")
 router.register(r"contacts", ContactViewSet, basename="contact")
+router.register(r"engagements/cycle-jobs", RetainerCycleJobViewSet, basename="retainer-cycle-job")
 router.register(r"engagements", EngagementViewSet, basename="engagement")
 router.register(r"billing-statements", BillingStatementViewSet, basename="billing-statement")
 router.register(r"billing-items", BillingItemViewSet, basename="billing-item")
+router.register(r"pdf-jobs", PdfRenderJobViewSet, basename="pdf-job")
 router.register(r"payments", PaymentViewSet, basename="payment")
 router.register(r"payment-allocations", PaymentAllocationViewSet, basename="payment-allocation")
 router.register(r"unapplied-credits", UnappliedCreditViewSet, basename="unapplied-credit")
@@ -35,8 +48,14 @@ urlpatterns = [
     path("api/auth/logout/", AuthViewSet.as_view({"post": "logout"}), name="auth-logout"),
     path("api/reports/aging/", AgingReportView.as_view(), name="report-aging"),
     path("api/reports/collections/", CollectionsRegisterView.as_view(), name="report-collections"),
+    path("api/reports/client-balances/", ClientBalanceReportView.as_view(), name="report-client-balances"),
     path("api/reports/unapplied-credits/", UnappliedCreditReportView.as_view(), name="report-unapplied"),
     path("api/reports/audit/", AuditLogView.as_view(), name="report-audit"),
+    path("api/reports/audit/<str:entity>/<str:entity_id>/", AuditEntityHistoryView.as_view(), name="report-audit-history"),
+    path("api/reports/retainer-forecast/", RetainerForecastView.as_view(), name="report-retainer-forecast"),
+    path("api/reports/cache/", ReportCacheStatsView.as_view(), name="report-cache"),
+    path("api/dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("api/search/", SearchView.as_view(), name="search"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/docs/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
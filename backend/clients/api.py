@@ -1,39 +1,38 @@
 from __future__ import annotations
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
 
 import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from accounts.permissions import IsAdmin, IsAdminOrReviewer
+from common.search import FullTextSearchFilter
+from common.tags import TagFilter, tag_counts
+from reports.balances import client_balances
 from .models import Client, Contact
-from .serializers import ClientSerializer, ContactSerializer
+from .serializers import ClientSerializer, ClientSummarySerializer, ContactSerializer
 
 
 class ClientFilter(django_filters.FilterSet):
-    tags = django_filters.CharFilter(method="filter_tags")
+    tags = TagFilter(field_name="tags")
+    tags_any = TagFilter(field_name="tags", match="any")
+    aliases = TagFilter(field_name="aliases", match="any")
 
     class Meta:
         model = Client
         fields = ["status", "tags"]
 
-    def filter_tags(self, queryset, name, value):
-        if not value:
-            return queryset
-        values = [v.strip() for v in value.split(",") if v.strip()]
-        if not values:
-            return queryset
-        for val in values:
-            queryset = queryset.filter(tags__contains=[val])
-        return queryset
-
 
 class ClientViewSet(viewsets.ModelViewSet):
     serializer_class = ClientSerializer
     queryset = Client.objects.prefetch_related("contacts").all()
     permission_classes = [IsAuthenticated]
     filterset_class = ClientFilter
-    search_fields = ["name", "normalized_name", "aliases", "group", "tags"]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     ordering_fields = ["name", "status", "created_at", "updated_at"]
 
     def get_permissions(self):
@@ -41,6 +40,29 @@ class ClientViewSet(viewsets.ModelViewSet):
             return [IsAdminOrReviewer()]
         return super().get_permissions()
 
+    @action(detail=False, methods=["get"])
+    def tags(self, request):
+        """Tag counts over the clients matching the current filters, for the filter sidebar."""
+
+        return Response({"results": tag_counts(self.filter_queryset(self.get_queryset()))})
+
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summaries(self, request):
+        """Receivables summaries for a page of the clients matching the current filters."""
+
+        clients = self.paginate_queryset(self.filter_queryset(self.get_queryset().prefetch_related(None)))
+        return self.get_paginated_response(ClientSummarySerializer(self._balances(clients), many=True).data)
+
+    @action(detail=True, methods=["get"])
+    def summary(self, request, pk=None):
+        return Response(ClientSummarySerializer(self._balances([self.get_object()])[0]).data)
+
+    def _balances(self, clients):
+        rows = client_balances(client.id for client in clients)
+        for client in clients:
+            rows[client.id].client = client
+        return [rows[client.id] for client in clients]
+
 
 class ContactViewSet(viewsets.ModelViewSet):
     serializer_class = ContactSerializer
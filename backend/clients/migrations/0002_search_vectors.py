@@ -0,0 +1,40 @@
+import common.search
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Fuzzy name matching; skipped where pg_trgm is not installed (see common.search.trigram_available).
+TRIGRAM_INDEXES_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX IF NOT EXISTS client_name_trgm_idx ON clients_client USING gin (normalized_name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS client_aliases_trgm_idx ON clients_client USING gin (lower(billing_array_text(aliases)) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('common', '0001_search_functions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector(models.Func('name', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector(models.Func(common.search.ArrayText('aliases'), models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='A'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(models.Func('group', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(models.Func(common.search.ArrayText('tags'), models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(models.Func('tin', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='client_search_idx'),
+        ),
+        migrations.RunSQL(
+            TRIGRAM_INDEXES_SQL,
+            "DROP INDEX IF EXISTS client_name_trgm_idx; DROP INDEX IF EXISTS client_aliases_trgm_idx;",
+        ),
+    ]
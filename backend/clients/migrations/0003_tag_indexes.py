@@ -0,0 +1,23 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('clients', '0002_search_vectors'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='client_tags_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['aliases'], name='client_aliases_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from common.models import TimeStampedUserModel
+from common.search import ArrayText, weighted_vector
 
 
 class Client(TimeStampedUserModel):
@@ -21,6 +24,19 @@ class Client(TimeStampedUserModel):
     group = models.CharField(max_length=255, blank=True)
     branding_logo = models.ImageField(upload_to="client_logos/", blank=True, null=True)
     branding_header_note = models.TextField(blank=True)
+    search_vector = models.GeneratedField(
+        expression=weighted_vector(("name", "A"), (ArrayText("aliases"), "A"), ("group", "B"), (ArrayText("tags"), "B"), ("tin", "B")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        # Trigram indexes on normalized_name and aliases are created by migration when pg_trgm is available.
+        indexes = [
+            GinIndex(fields=["search_vector"], name="client_search_idx"),
+            GinIndex(fields=["tags"], name="client_tags_idx"),
+            GinIndex(fields=["aliases"], name="client_aliases_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         self.normalized_name = self.name.strip().lower()
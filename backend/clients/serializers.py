@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from rest_framework import serializers
 
+from reports.models import ClientBalance
 from .models import Client, Contact
 
 
@@ -50,3 +51,27 @@ class ClientSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+
+
+class ClientSummarySerializer(serializers.ModelSerializer):
+    client = serializers.IntegerField(source="client_id", read_only=True)
+    name = serializers.CharField(source="client.name", read_only=True)
+    overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ClientBalance
+        fields = [
+            "client",
+            "name",
+            "as_of",
+            "open_ar",
+            "overdue",
+            "unapplied_credit",
+            "last_payment_date",
+            "active_engagements",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_overdue(self, obj):
+        return {bucket: str(getattr(obj, field)) for bucket, field in ClientBalance.OVERDUE_FIELDS.items()}
@@ -0,0 +1,44 @@
+"""Plumbing shared by the database-backed job queues and process pools.
+
+PDF renders (``statements.jobs``) and retainer cycles (``engagements.jobs``)
+are rows claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``; the parallel PDF
+renderer and the sharded retainer catch-up fan work out to process pools.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from django.db import connections
+from django.db.models import Model, QuerySet
+
+
+def lock_next_queued(queued: QuerySet, job_id: Optional[int] = None) -> Optional[Model]:
+    """Lock the oldest row of ``queued`` (or the one with ``job_id``) for the current transaction.
+
+    Rows another worker holds are skipped rather than waited on, so concurrent
+    workers each get a different job.
+    """
+
+    queued = queued.select_for_update(skip_locked=True)
+    if job_id is not None:
+        queued = queued.filter(pk=job_id)
+    return queued.order_by("created_at", "id").first()
+
+
+def _setup_django() -> None:
+    import django
+
+    django.setup()
+
+
+def django_process_pool(workers: int) -> ProcessPoolExecutor:
+    """A process pool whose workers set Django up and open their own database connections.
+
+    This process's connections are closed first; forked workers would otherwise
+    inherit, and interleave queries on, the same sockets.
+    """
+
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=workers, initializer=_setup_django)
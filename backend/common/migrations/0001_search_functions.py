@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# IMMUTABLE so it can be used in generated search columns and expression indexes;
+# array_to_string itself is only STABLE because it accepts any element type.
+ARRAY_TEXT_SQL = """
+CREATE OR REPLACE FUNCTION billing_array_text(varchar[]) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT array_to_string($1, ' ') $$;
+"""
+
+# pg_trgm ships with the standard Postgres images but not every server has it;
+# without it, search still works, just without fuzzy client name matching.
+TRIGRAM_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = []
+
+    operations = [
+        migrations.RunSQL(ARRAY_TEXT_SQL, "DROP FUNCTION IF EXISTS billing_array_text(varchar[]);"),
+        migrations.RunSQL(TRIGRAM_SQL, migrations.RunSQL.noop),
+    ]
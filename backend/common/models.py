@@ -3,6 +3,8 @@ from __future__ import annotations
 from django.conf import settings
 from django.db import models
 
+from .utils import audited_attnames
+
 
 class TimeStampedModel(models.Model):
     """Abstract base model providing created/updated timestamps."""
@@ -42,3 +44,12 @@ class TimeStampedUserModel(TimeStampedModel, UserTrackableModel):
 
     class Meta:
         abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets audit entries record only the fields a request changed; generated and
+        # auto-set columns (search vectors, timestamps) never appear in them.
+        audited = audited_attnames(cls)
+        instance._loaded_values = {name: value for name, value in zip(field_names, values) if name in audited}
+        return instance
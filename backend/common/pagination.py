@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _lookup(obj: Any, path: str) -> Any:
+    for part in path.split("__"):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return getattr(obj, "pk", obj)
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over the queryset's full ordering, with a limit/offset fallback.
+
+    Pages are fetched with ``WHERE (ordering columns) after (last row)`` rather than
+    ``OFFSET``, so deep pages cost the same as the first one when a matching
+    composite index exists. The primary key is appended to every ordering to make it
+    total. Requests that pass ``limit`` or ``offset`` get the old bare-list response.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> Optional[List[Any]]:
+        self.request = request
+        self.legacy = self.limit_query_param in request.query_params or self.offset_query_param in request.query_params
+        if self.legacy:
+            limit = self._int_param(self.limit_query_param, settings.API_PAGE_SIZE, minimum=1, maximum=settings.API_MAX_PAGE_SIZE)
+            offset = self._int_param(self.offset_query_param, 0, minimum=0)
+            return list(queryset[offset : offset + limit])
+
+        self.page_size = self._int_param(
+            self.page_size_query_param, settings.API_PAGE_SIZE, minimum=1, maximum=settings.API_MAX_PAGE_SIZE
+        )
+        self.ordering = self._ordering(queryset)
+        reverse, values = self._decode_cursor()
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+        self.next_row = rows[-1] if rows and (has_more or reverse) else None
+        self.previous_row = rows[0] if rows and values is not None and (has_more or not reverse) else None
+        return rows
+
+    def get_paginated_response(self, data) -> Response:
+        if self.legacy:
+            return Response(data)
+        return Response(
+            {
+                "next": self._link(self.next_row, reverse=False),
+                "previous": self._link(self.previous_row, reverse=True),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        def param(name, kind, description):
+            return {"name": name, "required": False, "in": "query", "description": description, "schema": {"type": kind}}
+
+        return [
+            param(self.cursor_query_param, "string", "Opaque cursor from a previous page's next/previous link."),
+            param(self.page_size_query_param, "integer", "Rows per page."),
+            param(self.limit_query_param, "integer", "Legacy mode: return a bare list of at most this many rows."),
+            param(self.offset_query_param, "integer", "Legacy mode: rows to skip."),
+        ]
+
+    def _int_param(self, name: str, default: int, minimum: int, maximum: Optional[int] = None) -> int:
+        try:
+            value = int(self.request.query_params[name])
+        except (KeyError, ValueError):
+            return default
+        value = max(value, minimum)
+        return min(value, maximum) if maximum is not None else value
+
+    @staticmethod
+    def _flip(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _ordering(self, queryset: QuerySet) -> List[str]:
+        ordering = list(queryset.query.order_by) or list(queryset.query.get_meta().ordering)
+        fields = [field for field in ordering if isinstance(field, str) and field != "?"]
+        if len(fields) != len(ordering):
+            fields = []
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip("-") in ("pk", pk_name) for field in fields):
+            descending = fields[0].startswith("-") if fields else True
+            fields.append(f"-{pk_name}" if descending else pk_name)
+        return fields
+
+    def _after(self, ordering: List[str], values: List[Any]) -> Q:
+        """Rows strictly after ``values`` under ``ordering`` (Postgres sorts NULLs as largest)."""
+
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            if field.startswith("-"):
+                later = Q(**{f"{name}__isnull": False}) if value is None else Q(**{f"{name}__lt": value})
+            else:
+                later = Q(pk__in=[]) if value is None else Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+            condition |= equal & later
+            equal &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+        # Repeat the leading column as a plain range so Postgres can use the index scan.
+        name, value = ordering[0].lstrip("-"), values[0]
+        if value is not None:
+            if ordering[0].startswith("-"):
+                condition &= Q(**{f"{name}__lte": value})
+            else:
+                condition &= Q(**{f"{name}__gte": value}) | Q(**{f"{name}__isnull": True})
+        return condition
+
+    def _decode_cursor(self) -> Tuple[bool, Optional[List[Any]]]:
+        raw = self.request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return False, None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+            reverse, values = bool(payload["r"]), list(payload["v"])
+        except (ValueError, KeyError, TypeError):
+            raise NotFound("Invalid cursor")
+        if len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return reverse, values
+
+    def _link(self, row: Any, reverse: bool) -> Optional[str]:
+        if row is None:
+            return None
+        values = [_encode_value(_lookup(row, field.lstrip("-"))) for field in self.ordering]
+        cursor = base64.urlsafe_b64encode(json.dumps({"r": int(reverse), "v": values}).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
@@ -0,0 +1,87 @@
+"""Postgres full-text and trigram search.
+
+Searchable models carry a stored, generated ``search_vector`` column (GIN
+indexed) built from their own text fields with ``weighted_vector``. Queries
+match word prefixes, so ``"init"`` finds "Initech". Clients additionally get
+fuzzy, misspelling-tolerant name and alias matching through ``pg_trgm`` when the
+extension is installed (see ``common/migrations/0001_search_functions.py``).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Func, Q, TextField, Value
+from rest_framework.filters import SearchFilter
+
+# "simple" keeps names, invoice numbers and codes as typed (no stemming or stop words).
+SEARCH_CONFIG = "simple"
+
+# Words as the "simple" parser sees them once signs are blanked out (see weighted_vector).
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+class ArrayText(Func):
+    """Array elements joined by spaces, in an immutable function usable in generated columns and indexes."""
+
+    function = "billing_array_text"
+    output_field = TextField()
+
+
+def weighted_vector(*fields):
+    """``to_tsvector`` over ``(field_or_expression, weight)`` pairs, for a ``GeneratedField``."""
+
+    # "-" and "+" are blanked first: the parser would read "SOA-2025-0001" as "soa", "-2025", "-0001".
+    vectors = [
+        SearchVector(Func(field, Value("-+"), Value("  "), function="translate", output_field=TextField()), config=SEARCH_CONFIG, weight=weight)
+        for field, weight in fields
+    ]
+    combined = vectors[0]
+    for vector in vectors[1:]:
+        combined = combined + vector
+    return combined
+
+
+def prefix_query(text: str) -> Optional[SearchQuery]:
+    """Every word of ``text`` as a prefix, all required; None when there are no words."""
+
+    terms = _TERM_RE.findall(text.lower())
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), config=SEARCH_CONFIG, search_type="raw")
+
+
+_trigram = None
+
+
+def trigram_available() -> bool:
+    """Whether ``pg_trgm`` is installed; checked once per process."""
+
+    global _trigram
+    if _trigram is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            _trigram = cursor.fetchone()[0]
+    return _trigram
+
+
+class FullTextSearchFilter(SearchFilter):
+    """``?search=`` matched against ``search_vector`` instead of ``icontains`` scans.
+
+    Views may list ``search_related`` foreign keys whose models are searchable too;
+    a row matches when it or one of those related records does. Each side is an
+    index lookup, so the OR stays a bitmap scan.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = prefix_query(" ".join(self.get_search_terms(request)))
+        if query is None:
+            return queryset
+        condition = Q(search_vector=query)
+        for relation in getattr(view, "search_related", ()):
+            related = queryset.model._meta.get_field(relation).related_model
+            condition |= Q(**{f"{relation}__in": related.objects.filter(search_vector=query).values("pk")})
+        return queryset.filter(condition)
@@ -0,0 +1,63 @@
+"""Tag filtering and facet counts over ``ArrayField`` and ``JSONField`` tag lists.
+
+Both filters compile to one GIN-indexable operator however many tags are asked
+for: all-of is ``@>`` for either field type, any-of is ``&&`` on arrays and
+``?|`` on JSON arrays of strings.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import django_filters
+from django.db import connection
+from django.db.models import JSONField, QuerySet
+
+_COUNTS_SQL = """
+SELECT tag, count(*) FROM {table} AS t CROSS JOIN LATERAL {elements}(t.{column}) AS tag
+WHERE t.{pk} IN ({ids}){guard}
+GROUP BY tag ORDER BY count(*) DESC, tag
+"""
+
+
+def _is_json(queryset: QuerySet, field_name: str) -> bool:
+    return isinstance(queryset.model._meta.get_field(field_name), JSONField)
+
+
+class TagFilter(django_filters.CharFilter):
+    """Comma-separated tags; rows must carry all of them, or any of them with ``match="any"``."""
+
+    def __init__(self, *args, match: str = "all", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.match = match
+
+    def filter(self, qs, value):
+        values = [v.strip() for v in (value or "").split(",") if v.strip()]
+        if not values:
+            return qs
+        if self.match == "all":
+            lookup = "contains"
+        else:
+            lookup = "has_any_keys" if _is_json(qs, self.field_name) else "overlap"
+        return qs.filter(**{f"{self.field_name}__{lookup}": values})
+
+
+def tag_counts(queryset: QuerySet, field_name: str = "tags") -> List[Dict]:
+    """``[{"tag", "count"}]`` over the rows of ``queryset``, most used first, in one query."""
+
+    model = queryset.model
+    is_json = _is_json(queryset, field_name)
+    column = connection.ops.quote_name(model._meta.get_field(field_name).column)
+    ids, params = queryset.order_by().values("pk").query.sql_with_params()
+    sql = _COUNTS_SQL.format(
+        table=connection.ops.quote_name(model._meta.db_table),
+        elements="jsonb_array_elements_text" if is_json else "unnest",
+        column=column,
+        pk=connection.ops.quote_name(model._meta.pk.column),
+        ids=ids,
+        # jsonb_array_elements_text raises on anything but an array, e.g. rows written before tags were validated.
+        guard=f" AND jsonb_typeof(t.{column}) = 'array'" if is_json else "",
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{"tag": tag, "count": count} for tag, count in cursor.fetchall()]
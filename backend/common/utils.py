@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Dict, Iterable, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional
 
-from django.db import models
+from django.db import models, transaction
 from django.forms.models import model_to_dict
 
 
@@ -17,6 +18,16 @@ class Money:
         return f"{self.currency} {self.amount:,.2f}"
 
 
+def on_commit_queued(func) -> bool:
+    """Whether ``func`` is still waiting for the current transaction to commit.
+
+    Rolling back a transaction or savepoint drops its callbacks, so state kept
+    for a callback that is no longer queued belongs to writes that never committed.
+    """
+
+    return any(queued is func for _, queued, _ in transaction.get_connection().run_on_commit)
+
+
 def diff_model(instance: models.Model, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """Serialize model fields to a plain dict for audit logging."""
 
@@ -25,3 +36,31 @@ def diff_model(instance: models.Model, fields: Optional[Iterable[str]] = None) -
     data = model_to_dict(instance, field_names)
     data["id"] = getattr(instance, "id", None)
     return data
+
+
+@lru_cache(maxsize=None)
+def audited_attnames(model) -> FrozenSet[str]:
+    """Columns ``diff_model`` reports for ``model``: the primary key and editable fields."""
+
+    return frozenset(f.attname for f in model._meta.concrete_fields if f.editable or f.primary_key)
+
+
+def loaded_values(instance: models.Model) -> Optional[Dict[str, Any]]:
+    """Field values as loaded from the database (or last audited), keyed like ``diff_model``."""
+
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is None:
+        return None
+    values = {}
+    for f in instance._meta.concrete_fields:
+        if f.attname in loaded:
+            value = loaded[f.attname]
+            # File columns load as "" when empty, where the audit payload has None.
+            values[f.name] = (value or None) if isinstance(f, models.FileField) else value
+    return values
+
+
+def remember_values(instance: models.Model) -> None:
+    """Make the instance's current field values the baseline for the next ``loaded_values``."""
+
+    instance._loaded_values = {name: getattr(instance, name) for name in audited_attnames(type(instance))}
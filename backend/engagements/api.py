@@ -1,22 +1,38 @@
 from __future__ import annotations
 
-from rest_framework import status, viewsets
+import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from accounts.permissions import IsAdminOrReviewer
-from .models import Engagement
-from .serializers import EngagementSerializer
-from .services import run_retainer_cycle
+from audit.utils import log_action
+from common.search import FullTextSearchFilter
+from common.tags import TagFilter, tag_counts
+from .jobs import enqueue_cycle_job
+from .models import Engagement, RetainerCycleJob
+from .serializers import EngagementSerializer, RetainerCycleJobSerializer, RunCycleSerializer
+
+
+class EngagementFilter(django_filters.FilterSet):
+    tags = TagFilter(field_name="tags")
+    tags_any = TagFilter(field_name="tags", match="any")
+
+    class Meta:
+        model = Engagement
+        fields = ["client", "type", "status"]
 
 
 class EngagementViewSet(viewsets.ModelViewSet):
     serializer_class = EngagementSerializer
     queryset = Engagement.objects.select_related("client").all()
     permission_classes = [IsAuthenticated]
-    filterset_fields = ["client", "type", "status"]
-    search_fields = ["title", "summary", "client__name", "tags"]
+    filterset_class = EngagementFilter
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    search_related = ["client"]
     ordering_fields = ["title", "client__name", "start_date", "status", "updated_at"]
 
     def get_permissions(self):
@@ -28,8 +44,22 @@ class EngagementViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["post"], url_path="run-cycle")
     def run_cycle(self, request):
-        period = request.data.get("period")
-        if not period:
-            return Response({"detail": "`period` (YYYY-MM) is required"}, status=status.HTTP_400_BAD_REQUEST)
-        summary = run_retainer_cycle(period=period, actor=request.user)
-        return Response(summary, status=status.HTTP_202_ACCEPTED)
+        serializer = RunCycleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue_cycle_job(serializer.validated_data["period"], actor=request.user)
+        log_action(actor=request.user, action="engagement.run_cycle", instance=job, metadata={"period": job.period})
+        return Response(RetainerCycleJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"])
+    def tags(self, request):
+        """Tag counts over the engagements matching the current filters, for the filter sidebar."""
+
+        return Response({"results": tag_counts(self.filter_queryset(self.get_queryset()))})
+
+
+class RetainerCycleJobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    serializer_class = RetainerCycleJobSerializer
+    queryset = RetainerCycleJob.objects.all()
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ["period", "status"]
+    ordering_fields = ["created_at", "finished_at"]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+import numpy as np
+from django.db.models import QuerySet
+
+from statements.models import BillingStatement
+from .services import period_range, retainer_engagements
+
+# Sentinel month index for engagements without an end date.
+OPEN_ENDED = np.iinfo(np.int64).max
+
+
+def _month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def _period_index(period: str) -> int:
+    year, month = map(int, period.split("-"))
+    return year * 12 + month - 1
+
+
+def _shift(period: str, months: int) -> str:
+    index = _period_index(period) + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _money(cents) -> str:
+    return str(Decimal(int(cents)).scaleb(-2))
+
+
+def _breakdown(keys: np.ndarray, rows: np.ndarray, billable: np.ndarray, revenue: np.ndarray):
+    """Sum the engagement ``rows`` of ``billable``/``revenue`` per distinct key."""
+
+    labels, codes = np.unique(keys, return_inverse=True)
+    statements = np.zeros((len(labels), billable.shape[1]), dtype=np.int64)
+    amounts = np.zeros((len(labels), revenue.shape[1]), dtype=np.int64)
+    np.add.at(statements, codes, billable[rows])
+    np.add.at(amounts, codes, revenue[rows])
+    return labels, statements, amounts
+
+
+def forecast_retainers(
+    start: str,
+    months: int,
+    engagements: Optional[QuerySet] = None,
+    respect_dates: bool = True,
+    respect_marker: bool = False,
+) -> Dict[str, Any]:
+    """Project the drafts and revenue the retainer cycle would produce; writes nothing.
+
+    Uses the same ``retainer_engagements()`` scope as ``run_retainer_cycle``. Each
+    engagement bills ``base_fee`` for every period within its start/end dates that
+    does not already have a statement. The projection is a single engagement ×
+    period mask built with NumPy from two queries, so its cost does not depend on
+    per-row ORM work. ``respect_dates=False`` mirrors a single-period cycle exactly,
+    which bills every active retainer regardless of its dates. With both flags,
+    the projection mirrors ``run_retainer_catch_up``, which keeps to each
+    engagement's dates and skips periods up to its ``last_generated_period``.
+    """
+
+    periods = period_range(start, _shift(start, months - 1))
+    engagements = engagements if engagements is not None else retainer_engagements()
+    rows = list(
+        engagements.order_by("id").values_list("id", "client_id", "client__name", "base_fee", "start_date", "end_date", "tags", "last_generated_period")
+    )
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    client_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    fees = np.fromiter((int(row[3] * 100) for row in rows), dtype=np.int64, count=len(rows))
+    starts = np.fromiter((_month_index(row[4]) for row in rows), dtype=np.int64, count=len(rows))
+    ends = np.fromiter(
+        (_month_index(row[5]) if row[5] else OPEN_ENDED for row in rows), dtype=np.int64, count=len(rows)
+    )
+    period_indexes = np.array([_period_index(period) for period in periods], dtype=np.int64)
+
+    if respect_dates:
+        active = (starts[:, None] <= period_indexes) & (period_indexes <= ends[:, None])
+    else:
+        active = np.ones((len(rows), len(periods)), dtype=bool)
+
+    # Periods that already have a statement are skipped by the cycle, so they add nothing.
+    existing = np.zeros_like(active)
+    generated = list(
+        BillingStatement.objects.filter(period__in=periods, engagement_id__in=engagements.values("id")).values_list(
+            "engagement_id", "period"
+        )
+    )
+    if generated:
+        engagement_ids = np.array([engagement_id for engagement_id, _ in generated], dtype=np.int64)
+        columns = np.array([_period_index(period) for _, period in generated], dtype=np.int64) - period_indexes[0]
+        existing[np.searchsorted(ids, engagement_ids), columns] = True
+
+    billable = active & ~existing
+    if respect_marker:
+        markers = np.fromiter((_period_index(row[7]) if row[7] else -1 for row in rows), dtype=np.int64, count=len(rows))
+        billable &= markers[:, None] < period_indexes
+    billable = billable.astype(np.int64)
+    revenue = billable * fees[:, None]
+
+    names = {row[1]: row[2] for row in rows}
+    clients, client_statements, client_revenue = _breakdown(client_ids, np.arange(len(rows)), billable, revenue)
+    by_client = [
+        {
+            "client_id": int(client_id),
+            "client_name": names[int(client_id)],
+            "statements": int(client_statements[index].sum()),
+            "revenue": _money(client_revenue[index].sum()),
+            "monthly_revenue": [_money(value) for value in client_revenue[index]],
+        }
+        for index, client_id in enumerate(clients)
+    ]
+
+    tag_rows = [(index, str(tag)) for index, row in enumerate(rows) for tag in dict.fromkeys(row[6] or [])]
+    tags, tag_statements, tag_revenue = _breakdown(
+        np.array([tag for _, tag in tag_rows], dtype=object),
+        np.array([index for index, _ in tag_rows], dtype=np.int64),
+        billable,
+        revenue,
+    )
+    by_tag = [
+        {
+            "tag": tag,
+            "statements": int(tag_statements[index].sum()),
+            "revenue": _money(tag_revenue[index].sum()),
+            "monthly_revenue": [_money(value) for value in tag_revenue[index]],
+        }
+        for index, tag in enumerate(tags)
+    ]
+
+    return {
+        "start": periods[0],
+        "months": len(periods),
+        "engagements": len(rows),
+        "statements": int(billable.sum()),
+        "revenue": _money(revenue.sum()),
+        "periods": [
+            {"period": period, "statements": int(count), "revenue": _money(amount)}
+            for period, count, amount in zip(periods, billable.sum(axis=0), revenue.sum(axis=0))
+        ],
+        "by_client": sorted(by_client, key=lambda row: (-Decimal(row["revenue"]), row["client_name"])),
+        "by_tag": sorted(by_tag, key=lambda row: (-Decimal(row["revenue"]), row["tag"])),
+    }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import User
+from audit.utils import log_action
+from common.jobs import lock_next_queued
+from .models import RetainerCycleJob
+from .services import CycleSummary, retainer_engagements, run_retainer_cycle
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (RetainerCycleJob.Status.QUEUED, RetainerCycleJob.Status.RUNNING)
+
+
+def enqueue_cycle_job(period: str, actor: User) -> RetainerCycleJob:
+    """Queue a cycle for ``period``, returning the existing job if one is already queued or running."""
+
+    with transaction.atomic():
+        active = RetainerCycleJob.objects.select_for_update().filter(period=period, status__in=ACTIVE_STATUSES).first()
+        if active:
+            return active
+        return RetainerCycleJob.objects.create(period=period, created_by=actor, updated_by=actor)
+
+
+def claim_next_cycle_job(job_id: Optional[int] = None) -> Optional[RetainerCycleJob]:
+    """Mark the oldest queued cycle (or ``job_id``) running, counting its engagements on the first claim.
+
+    A requeued job keeps its original ``started_at`` and resumes after ``last_engagement_id``.
+    """
+
+    with transaction.atomic():
+        job = lock_next_queued(RetainerCycleJob.objects.filter(status=RetainerCycleJob.Status.QUEUED), job_id)
+        if job is None:
+            return None
+        job.status = RetainerCycleJob.Status.RUNNING
+        job.attempts += 1
+        job.started_at = job.started_at or timezone.now()
+        if not job.total:
+            job.total = retainer_engagements().count()
+        job.save(update_fields=["status", "attempts", "started_at", "total", "updated_at"])
+    return job
+
+
+def requeue_stale_cycle_jobs(older_than: Optional[timedelta] = None) -> int:
+    """Return jobs whose worker stopped reporting progress to the queue; they resume from their last chunk."""
+
+    older_than = older_than or timedelta(seconds=settings.RETAINER_CYCLE_JOB_STALE_SECONDS)
+    cutoff = timezone.now() - older_than
+    return RetainerCycleJob.objects.filter(status=RetainerCycleJob.Status.RUNNING, updated_at__lt=cutoff).update(
+        status=RetainerCycleJob.Status.QUEUED,
+        updated_at=timezone.now(),
+    )
+
+
+def _record_progress(job: RetainerCycleJob, last_id: int, summary: CycleSummary) -> None:
+    # Runs inside the chunk's transaction, so the resume point never runs ahead of committed drafts.
+    RetainerCycleJob.objects.filter(pk=job.pk).update(
+        last_engagement_id=last_id,
+        processed=F("processed") + summary.processed,
+        created=F("created") + summary.created,
+        skipped=F("skipped") + summary.skipped_existing,
+        failed=F("failed") + summary.failed,
+        updated_at=timezone.now(),
+    )
+
+
+def process_cycle_job(job: RetainerCycleJob) -> RetainerCycleJob:
+    """Run (or resume) the job's cycle and record the outcome."""
+
+    try:
+        run_retainer_cycle(
+            job.period,
+            actor=job.created_by,
+            after_id=job.last_engagement_id,
+            on_chunk=lambda last_id, summary: _record_progress(job, last_id, summary),
+        )
+    except Exception as exc:
+        logger.exception("Retainer cycle job %s failed", job.pk)
+        job.refresh_from_db()
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        if job.attempts < settings.RETAINER_CYCLE_JOB_MAX_ATTEMPTS:
+            job.status = RetainerCycleJob.Status.QUEUED
+        else:
+            job.status = RetainerCycleJob.Status.FAILED
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+
+    job.refresh_from_db()
+    job.status = RetainerCycleJob.Status.SUCCEEDED
+    job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+    log_action(
+        actor=job.created_by,
+        action="engagement.retainer_cycle",
+        instance=job,
+        metadata={"period": job.period, "created": job.created, "skipped": job.skipped, "failed": job.failed},
+    )
+    return job
+
+
+def drain_cycle_queue(max_jobs: Optional[int] = None) -> int:
+    """Process queued jobs until the queue is empty (or ``max_jobs`` is reached)."""
+
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_cycle_job()
+        if job is None:
+            break
+        process_cycle_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from engagements.jobs import claim_next_cycle_job, process_cycle_job, requeue_stale_cycle_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued retainer cycle jobs, resuming interrupted runs from their last committed chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds to sleep when the queue is empty")
+
+    def handle(self, *args, **options):
+        counts = {"processed": 0, "failed": 0}
+        try:
+            while True:
+                requeued = requeue_stale_cycle_jobs()
+                if requeued:
+                    self.stdout.write(f"Requeued {requeued} stale cycle job(s)")
+                job = claim_next_cycle_job()
+                if job is None:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+                self.stdout.write(f"Running retainer cycle {job.period} (job {job.pk}, from engagement {job.last_engagement_id})")
+                job = process_cycle_job(job)
+                counts["processed"] += 1
+                if job.status == job.Status.FAILED:
+                    counts["failed"] += 1
+                self.stdout.write(
+                    f"Job {job.pk}: {job.status} — created {job.created}, skipped {job.skipped}, failed {job.failed}"
+                )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Cycle worker stopped: {counts}"))
@@ -1,24 +1,68 @@
+import re
+
 from django.core.management.base import BaseCommand, CommandError
 
 from accounts.models import User
-from engagements.services import run_retainer_cycle
+from engagements.forecast import forecast_retainers
+from engagements.services import period_range, run_retainer_catch_up_parallel, run_retainer_cycle
+
+PERIOD_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
 
 
 class Command(BaseCommand):
-    help = "Generate retainer billing drafts for a given YYYY-MM period."
+    help = "Generate retainer billing drafts for a YYYY-MM period, or catch up a --from/--to range."
 
     def add_arguments(self, parser):
-        parser.add_argument("period", type=str, help="Target billing period in YYYY-MM format")
+        parser.add_argument("period", type=str, nargs="?", help="Target billing period in YYYY-MM format")
+        parser.add_argument("--from", dest="start", type=str, help="First period of a catch-up range (YYYY-MM)")
+        parser.add_argument("--to", dest="end", type=str, help="Last period of a catch-up range (YYYY-MM)")
+        parser.add_argument("--workers", type=int, default=1, help="Processes to shard engagements across, by client id")
         parser.add_argument("--user", type=str, dest="username", help="Username executing the cycle (for audit)")
+        parser.add_argument("--dry-run", action="store_true", help="Report the drafts and revenue a run would create; write nothing")
 
     def handle(self, *args, **options):
         period = options["period"]
+        start, end = options["start"], options["end"]
         username = options.get("username")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+        if period and (start or end):
+            raise CommandError("Pass either a period or --from/--to, not both")
+        if not period and not (start and end):
+            raise CommandError("Pass a period, or both --from and --to")
+        for value in filter(None, (period, start, end)):
+            if not PERIOD_RE.match(value):
+                raise CommandError(f"Invalid period '{value}'; use YYYY-MM")
+        if start and start > end:
+            raise CommandError("--from must not be after --to")
+
+        if options["dry_run"]:
+            # Ranges and sharded runs go through the catch-up, which also honours each engagement's dates and marker.
+            catch_up = bool(start) or options["workers"] > 1
+            start = start or period
+            forecast = forecast_retainers(
+                start, len(period_range(start, end or period)), respect_dates=catch_up, respect_marker=catch_up
+            )
+            for row in forecast["periods"]:
+                self.stdout.write(f"{row['period']}: {row['statements']} draft(s), {row['revenue']}")
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run: {forecast['statements']} draft(s) totalling {forecast['revenue']}; nothing written")
+            )
+            return
+
         if not username:
             raise CommandError("--user is required to attribute audit trail")
         try:
             actor = User.objects.get(username=username)
         except User.DoesNotExist as exc:
             raise CommandError(f"User '{username}' not found") from exc
-        summary = run_retainer_cycle(period=period, actor=actor)
-        self.stdout.write(self.style.SUCCESS(f"Retainer cycle completed: {summary}"))
+
+        if period and options["workers"] == 1:
+            summary = run_retainer_cycle(period=period, actor=actor)
+            self.stdout.write(self.style.SUCCESS(f"Retainer cycle completed: {summary}"))
+            return
+
+        results = run_retainer_catch_up_parallel(start or period, end or period, actor, workers=options["workers"])
+        for each_period, summary in results.items():
+            self.stdout.write(f"{each_period}: {summary}")
+        self.stdout.write(self.style.SUCCESS(f"Retainer catch-up completed for {len(results)} period(s)"))
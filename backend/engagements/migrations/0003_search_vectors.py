@@ -0,0 +1,23 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_search_vectors'),
+        ('engagements', '0002_retainercyclejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='engagement',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector(models.Func('title', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector(models.Func('summary', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='engagement',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='engagement_search_idx'),
+        ),
+    ]
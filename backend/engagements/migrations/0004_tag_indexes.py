@@ -0,0 +1,19 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('engagements', '0003_search_vectors'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='engagement',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='engagement_tags_idx'),
+        ),
+    ]
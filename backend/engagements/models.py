@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from common.models import TimeStampedUserModel
+from common.search import weighted_vector
 
 
 class Engagement(TimeStampedUserModel):
@@ -30,10 +33,22 @@ class Engagement(TimeStampedUserModel):
     billing_day = models.PositiveSmallIntegerField(default=1, help_text="Day of month to issue retainer draft")
     tags = models.JSONField(default=list, blank=True)
     last_generated_period = models.CharField(max_length=7, blank=True, help_text="YYYY-MM of latest retainer draft")
+    search_vector = models.GeneratedField(
+        expression=weighted_vector(("title", "A"), ("summary", "C")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # Advanced by the retainer cycle's bulk update, which logs no audit entry; see audit.utils.snapshot_at.
+    UNAUDITED_FIELDS = ["last_generated_period"]
 
     class Meta:
         unique_together = ("client", "title", "type")
         ordering = ("client__name", "title")
+        indexes = [
+            GinIndex(fields=["search_vector"], name="engagement_search_idx"),
+            GinIndex(fields=["tags"], name="engagement_tags_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.client.name} — {self.title}"
@@ -45,3 +60,33 @@ class Engagement(TimeStampedUserModel):
     @property
     def is_retainer(self) -> bool:
         return self.type == self.Types.RETAINER
+
+
+class RetainerCycleJob(TimeStampedUserModel):
+    """A queued retainer cycle run, executed by the `run_cycle_worker` command."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    period = models.CharField(max_length=7, help_text="YYYY-MM")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    total = models.PositiveIntegerField(default=0, help_text="Engagements in scope when the run started")
+    processed = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    last_engagement_id = models.PositiveBigIntegerField(default=0, help_text="Resume point: last committed chunk")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [models.Index(fields=["status", "created_at"], name="cycle_job_queue_idx")]
+
+    def __str__(self):  # pragma: no cover
+        return f"Retainer cycle {self.period} ({self.status})"
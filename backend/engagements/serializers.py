@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from rest_framework import serializers
 
-from .models import Engagement
+from .models import Engagement, RetainerCycleJob
 
 
 class EngagementSerializer(serializers.ModelSerializer):
     client_name = serializers.CharField(source="client.name", read_only=True)
+    # A JSONField would take any JSON; tags are a list of strings like Client.tags.
+    tags = serializers.ListField(child=serializers.CharField(max_length=50), required=False)
 
     class Meta:
         model = Engagement
@@ -35,3 +37,39 @@ class EngagementSerializer(serializers.ModelSerializer):
         if attrs.get("type") == Engagement.Types.RETAINER and attrs.get("base_fee") is None:
             raise serializers.ValidationError({"base_fee": "Retainer engagements require a base fee."})
         return attrs
+
+
+class RunCycleSerializer(serializers.Serializer):
+    period = serializers.RegexField(r"^\d{4}-(0[1-9]|1[0-2])$", error_messages={"invalid": "Period must be in YYYY-MM format."})
+
+
+class RetainerForecastQuerySerializer(serializers.Serializer):
+    start = serializers.RegexField(
+        r"^\d{4}-(0[1-9]|1[0-2])$", required=False, error_messages={"invalid": "Start must be in YYYY-MM format."}
+    )
+    months = serializers.IntegerField(min_value=1, max_value=60, default=12)
+
+
+class RetainerCycleJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+
+    class Meta:
+        model = RetainerCycleJob
+        fields = [
+            "id",
+            "period",
+            "status",
+            "status_display",
+            "total",
+            "processed",
+            "created",
+            "skipped",
+            "failed",
+            "attempts",
+            "error",
+            "started_at",
+            "finished_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
@@ -1,24 +1,43 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
+from functools import partial
 from datetime import date, timedelta
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
 
 from accounts.models import User
 from clients.models import Client
+from common.jobs import django_process_pool
 from statements.models import BillingStatement, BillingItem
+from statements.signals import statements_changed
 from .models import Engagement
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CycleSummary:
-    created: int
-    skipped_existing: int
+    created: int = 0
+    skipped_existing: int = 0
+    failed: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.skipped_existing + self.failed
+
+    def add(self, other: "CycleSummary") -> None:
+        self.created += other.created
+        self.skipped_existing += other.skipped_existing
+        self.failed += other.failed
 
     def as_dict(self) -> Dict[str, int]:
-        return {"created": self.created, "skipped_existing": self.skipped_existing}
+        return {"created": self.created, "skipped_existing": self.skipped_existing, "failed": self.failed}
 
 
 def last_day_of_month(period: str) -> date:
@@ -29,62 +48,205 @@ def last_day_of_month(period: str) -> date:
     return next_month - timedelta(days=1)
 
 
-def run_retainer_cycle(period: str, actor: User) -> Dict[str, int]:
-    """Generate draft billing statements for active retainer engagements."""
+def period_range(start: str, end: str) -> List[str]:
+    """Every ``YYYY-MM`` period from ``start`` to ``end`` inclusive."""
 
-    if len(period) != 7 or period[4] != "-":
-        raise ValueError("Period must be in YYYY-MM format")
+    year, month = map(int, start.split("-"))
+    end_year, end_month = map(int, end.split("-"))
+    periods = []
+    while (year, month) <= (end_year, end_month):
+        periods.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
 
-    created = 0
-    skipped = 0
-    due_date = last_day_of_month(period)
 
-    engagements = Engagement.objects.select_related("client").filter(
+def retainer_engagements(shard: Optional[Tuple[int, int]] = None) -> QuerySet:
+    """Engagements that receive a retainer draft each period.
+
+    ``shard=(index, count)`` keeps the engagements whose client id falls in that
+    shard, so parallel workers never generate drafts for the same client.
+    """
+
+    engagements = Engagement.objects.filter(
         type=Engagement.Types.RETAINER,
         status=Engagement.Status.ACTIVE,
         client__status=Client.Status.ACTIVE,
     )
+    if shard:
+        index, count = shard
+        engagements = engagements.alias(client_shard=F("client_id") % count).filter(client_shard=index)
+    return engagements
+
+
+def run_retainer_cycle(
+    period: str,
+    actor: User,
+    chunk_size: Optional[int] = None,
+    after_id: int = 0,
+    on_chunk: Optional[Callable[[int, CycleSummary], None]] = None,
+    engagements: Optional[QuerySet] = None,
+) -> Dict[str, int]:
+    """Generate draft billing statements for active retainer engagements.
+
+    Engagements are processed in id order, ``chunk_size`` at a time, each chunk in
+    its own transaction. ``on_chunk(last_id, chunk_summary)`` runs inside that
+    transaction, so progress recorded there commits together with the chunk.
+    ``engagements`` narrows the default ``retainer_engagements()`` scope.
+    """
 
-    for engagement in engagements:
-        result = _create_retainer_statement_if_missing(engagement, period, due_date, actor)
-        if result:
-            created += 1
-        else:
-            skipped += 1
-
-    return CycleSummary(created=created, skipped_existing=skipped).as_dict()
-
-
-@transaction.atomic
-def _create_retainer_statement_if_missing(engagement: Engagement, period: str, due_date: date, actor: User) -> bool:
-    statement, created = BillingStatement.objects.get_or_create(
-        client=engagement.client,
-        engagement=engagement,
-        period=period,
-        defaults={
-            "status": BillingStatement.Status.DRAFT,
-            "currency": "PHP",
-            "due_date": due_date,
-            "created_by": actor,
-            "updated_by": actor,
-        },
+    if len(period) != 7 or period[4] != "-":
+        raise ValueError("Period must be in YYYY-MM format")
+
+    chunk_size = chunk_size or settings.RETAINER_CYCLE_CHUNK_SIZE
+    due_date = last_day_of_month(period)
+    total = CycleSummary()
+    engagements = (engagements if engagements is not None else retainer_engagements()).order_by("id").only(
+        "id", "client_id", "base_fee", "default_description", "last_generated_period"
+    )
+    while True:
+        chunk = list(engagements.filter(id__gt=after_id)[:chunk_size])
+        if not chunk:
+            break
+        after_id = chunk[-1].id
+        total.add(_run_chunk(chunk, period, due_date, actor, after_id, on_chunk))
+
+    return total.as_dict()
+
+
+def run_retainer_catch_up(
+    start: str,
+    end: str,
+    actor: User,
+    chunk_size: Optional[int] = None,
+    shard: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Generate every missing draft from ``start`` to ``end``, oldest period first.
+
+    For each period only engagements running during it (started by its last day,
+    not ended before its first) whose ``last_generated_period`` is older are
+    considered, so engagements that are already up to date cost nothing and a
+    backfill never bills months outside an engagement's dates.
+    """
+
+    results = {}
+    for period in period_range(start, end):
+        behind = retainer_engagements(shard).filter(
+            Q(last_generated_period__lt=period) | Q(last_generated_period=""),
+            Q(end_date__isnull=True) | Q(end_date__gte=date.fromisoformat(f"{period}-01")),
+            start_date__lte=last_day_of_month(period),
+        )
+        results[period] = run_retainer_cycle(period, actor, chunk_size=chunk_size, engagements=behind)
+    return results
+
+
+def _run_shard(start: str, end: str, actor_id: int, chunk_size: Optional[int], shard: Tuple[int, int]):
+    actor = User.objects.get(pk=actor_id)
+    try:
+        return run_retainer_catch_up(start, end, actor, chunk_size=chunk_size, shard=shard)
+    finally:
+        connections.close_all()
+
+
+def run_retainer_catch_up_parallel(
+    start: str, end: str, actor: User, workers: int, chunk_size: Optional[int] = None
+) -> Dict[str, Dict[str, int]]:
+    """Run ``run_retainer_catch_up`` across ``workers`` processes, sharded by client id."""
+
+    if workers <= 1:
+        return run_retainer_catch_up(start, end, actor, chunk_size=chunk_size)
+    run_shard = partial(_run_shard, start, end, actor.pk, chunk_size)
+    with django_process_pool(workers) as executor:
+        shard_results = list(executor.map(run_shard, [(index, workers) for index in range(workers)]))
+
+    results: Dict[str, Dict[str, int]] = {}
+    for shard_result in shard_results:
+        for period, counts in shard_result.items():
+            total = results.setdefault(period, CycleSummary().as_dict())
+            for key, value in counts.items():
+                total[key] += value
+    return results
+
+
+def _run_chunk(chunk, period, due_date, actor, last_id, on_chunk) -> CycleSummary:
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                summary = generate_retainer_chunk(chunk, period, due_date, actor)
+                if on_chunk:
+                    on_chunk(last_id, summary)
+            return summary
+        except IntegrityError:
+            # A concurrent run created some of these drafts first; re-read and retry once.
+            if attempt:
+                break
+        except Exception:
+            logger.exception("Retainer chunk ending at engagement %s failed; retrying row by row", last_id)
+            break
+
+    # Isolate the engagements that fail so the rest of the chunk still commits.
+    with transaction.atomic():
+        summary = CycleSummary()
+        for engagement in chunk:
+            try:
+                with transaction.atomic():
+                    summary.add(generate_retainer_chunk([engagement], period, due_date, actor))
+            except Exception:
+                logger.exception("Retainer draft for engagement %s (%s) failed", engagement.id, period)
+                summary.failed += 1
+        if on_chunk:
+            on_chunk(last_id, summary)
+    return summary
+
+
+def generate_retainer_chunk(engagements: List[Engagement], period: str, due_date: date, actor: User) -> CycleSummary:
+    """Create the missing drafts for ``engagements`` with a fixed number of queries."""
+
+    existing = set(
+        BillingStatement.objects.filter(period=period, engagement_id__in=[e.id for e in engagements]).values_list(
+            "engagement_id", flat=True
+        )
+    )
+    missing = [engagement for engagement in engagements if engagement.id not in existing]
+    if not missing:
+        return CycleSummary(skipped_existing=len(engagements))
+
+    statements = BillingStatement.objects.bulk_create(
+        [
+            BillingStatement(
+                client_id=engagement.client_id,
+                engagement_id=engagement.id,
+                period=period,
+                status=BillingStatement.Status.DRAFT,
+                currency="PHP",
+                due_date=due_date,
+                sub_total=engagement.base_fee,
+                balance=engagement.base_fee,
+                created_by=actor,
+                updated_by=actor,
+            )
+            for engagement in missing
+        ]
+    )
+    BillingItem.objects.bulk_create(
+        [
+            BillingItem(
+                billing_statement=statement,
+                description=engagement.default_description or f"Retainer services for {period}",
+                qty=1,
+                unit="month",
+                unit_price=engagement.base_fee,
+                line_total=engagement.base_fee,
+                created_by=actor,
+                updated_by=actor,
+            )
+            for engagement, statement in zip(missing, statements)
+        ]
     )
-    if not created:
-        return False
-
-    description = engagement.default_description or f"Retainer services for {period}"
-    BillingItem.objects.create(
-        billing_statement=statement,
-        description=description,
-        qty=1,
-        unit="month",
-        unit_price=engagement.base_fee,
-        line_total=engagement.base_fee,
-        created_by=actor,
-        updated_by=actor,
+    statements_changed.send(
+        sender=BillingStatement, statement_ids=[statement.id for statement in statements], client_ids=set(), created=True
     )
-    statement.recalculate_totals(save=True)
-    engagement.last_generated_period = period
-    engagement.updated_by = actor
-    engagement.save(update_fields=["last_generated_period", "updated_by", "updated_at"])
-    return True
+    # Backfilling an older period must not move the marker backwards.
+    Engagement.objects.filter(id__in=[e.id for e in missing]).filter(
+        Q(last_generated_period__lt=period) | Q(last_generated_period="")
+    ).update(last_generated_period=period, updated_by=actor, updated_at=timezone.now())
+    return CycleSummary(created=len(missing), skipped_existing=len(existing))
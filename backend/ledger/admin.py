@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import LedgerCheckpoint, LedgerEntry
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("effective_date", "kind", "statement", "client", "amount", "created_at")
+    list_filter = ("kind",)
+    search_fields = ("statement__number", "client__name")
+
+
+@admin.register(LedgerCheckpoint)
+class LedgerCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("as_of", "statement", "client", "balance")
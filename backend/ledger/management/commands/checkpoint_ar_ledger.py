@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ledger.services import LEDGER_STATUSES, sync_statement_ledger, write_checkpoint
+from statements.models import BillingStatement
+
+
+class Command(BaseCommand):
+    help = "Write an AR ledger balance checkpoint; --backfill first records entries for statements issued before the ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--as-of", type=str, help="Checkpoint date (YYYY-MM-DD), defaults to today")
+        parser.add_argument("--backfill", action="store_true", help="Sync every issued, settled and void statement first")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Statements synced per batch when backfilling")
+
+    def handle(self, *args, **options):
+        as_of = timezone.localdate()
+        if options["as_of"]:
+            try:
+                as_of = datetime.strptime(options["as_of"], "%Y-%m-%d").date()
+            except ValueError as exc:
+                raise CommandError(f"Invalid date '{options['as_of']}', expected YYYY-MM-DD") from exc
+
+        if options["backfill"]:
+            statements = BillingStatement.objects.filter(status__in=LEDGER_STATUSES).order_by("id")
+            after_id, created = 0, 0
+            while True:
+                ids = list(statements.filter(id__gt=after_id).values_list("id", flat=True)[: options["chunk_size"]])
+                if not ids:
+                    break
+                created += len(sync_statement_ledger(ids))
+                after_id = ids[-1]
+            self.stdout.write(f"Backfill recorded {created} ledger entr{'y' if created == 1 else 'ies'}")
+
+        rows = write_checkpoint(as_of)
+        self.stdout.write(self.style.SUCCESS(f"Ledger checkpoint for {as_of}: {rows} open statement(s)"))
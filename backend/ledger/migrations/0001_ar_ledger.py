@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('payments', '0003_keyset_index'),
+        ('statements', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clients.client')),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='statements.billingstatement')),
+            ],
+            options={
+                'ordering': ('-as_of', 'statement_id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('issue', 'Issue'), ('adjustment', 'Adjustment'), ('void', 'Void'), ('allocation', 'Allocation'), ('reversal', 'Allocation Rollback')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('effective_date', models.DateField()),
+                ('allocation_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='clients.client')),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='payments.payment')),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='statements.billingstatement')),
+            ],
+            options={
+                'ordering': ('effective_date', 'id'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ledgercheckpoint',
+            constraint=models.UniqueConstraint(fields=('as_of', 'statement'), name='unique_ledger_checkpoint'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['effective_date', 'statement'], name='ledger_effective_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['statement', 'allocation_id'], name='ledger_statement_idx'),
+        ),
+    ]
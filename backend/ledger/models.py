@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class LedgerEntry(models.Model):
+    """One append-only receivable movement for a statement.
+
+    Charges are positive and payments negative, so a statement's balance as of a
+    date is the sum of its entries effective on or before that date. Corrections
+    are new entries; existing rows are never updated or deleted.
+    """
+
+    class Kind(models.TextChoices):
+        ISSUE = "issue", "Issue"
+        ADJUSTMENT = "adjustment", "Adjustment"
+        VOID = "void", "Void"
+        ALLOCATION = "allocation", "Allocation"
+        REVERSAL = "reversal", "Allocation Rollback"
+
+    statement = models.ForeignKey("statements.BillingStatement", on_delete=models.PROTECT, related_name="ledger_entries")
+    client = models.ForeignKey("clients.Client", on_delete=models.PROTECT, related_name="ledger_entries")
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    effective_date = models.DateField()
+    # Allocations are tracked by id because a rolled-back allocation row is deleted.
+    allocation_id = models.BigIntegerField(null=True, blank=True)
+    payment = models.ForeignKey("payments.Payment", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("effective_date", "id")
+        indexes = [
+            models.Index(fields=["effective_date", "statement"], name="ledger_effective_idx"),
+            models.Index(fields=["statement", "allocation_id"], name="ledger_statement_idx"),
+        ]
+
+    def __str__(self):  # pragma: no cover
+        return f"{self.kind} {self.amount} on {self.effective_date}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Ledger entries are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger entries are append-only")
+
+
+class LedgerCheckpoint(models.Model):
+    """A statement's ledger balance at the end of ``as_of``.
+
+    Only non-zero balances are stored. Balance queries start from the latest
+    checkpoint on or before the requested date and add the entries after it.
+    """
+
+    as_of = models.DateField()
+    statement = models.ForeignKey("statements.BillingStatement", on_delete=models.CASCADE, related_name="+")
+    client = models.ForeignKey("clients.Client", on_delete=models.CASCADE, related_name="+")
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        ordering = ("-as_of", "statement_id")
+        constraints = [models.UniqueConstraint(fields=["as_of", "statement"], name="unique_ledger_checkpoint")]
+
+    def __str__(self):  # pragma: no cover
+        return f"Checkpoint {self.as_of} #{self.statement_id}"
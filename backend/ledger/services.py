@@ -0,0 +1,265 @@
+"""Accounts-receivable ledger: recording movements and answering balances as of a date.
+
+``sync_statement_ledger`` compares what the ledger already holds for a set of
+statements with their current charges and allocations and appends the
+difference. It is driven by statement saves and totals flushes, so the ledger
+follows every path that changes a balance without each path writing entries.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, Max, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from payments.models import PaymentAllocation
+from statements.models import BillingStatement
+from .models import LedgerCheckpoint, LedgerEntry
+
+LEDGER_STATUSES = (*BillingStatement.RECEIVABLE_STATUSES, BillingStatement.Status.SETTLED, BillingStatement.Status.VOID)
+
+ZERO = Decimal("0.00")
+
+
+def sync_statement_ledger(statement_ids: Iterable[int]) -> List[LedgerEntry]:
+    """Append the entries that bring the ledger in line with ``statement_ids``.
+
+    Receivable and settled statements carry their ``sub_total`` as a charge. A
+    void statement's charge is cut to what has been applied to it, so it nets to
+    zero. Each allocation carries ``-amount_applied`` dated on its payment date,
+    and is moved to the new date when the payment's date is edited. Increases
+    are dated on their economic date; reductions and rollbacks on the day they
+    are recorded. Drafts are ignored.
+    """
+
+    ids = {int(pk) for pk in statement_ids if pk is not None}
+    statements = list(
+        BillingStatement.objects.filter(id__in=ids, status__in=LEDGER_STATUSES).values(
+            "id", "client_id", "status", "sub_total", "issue_date"
+        )
+    )
+    if not statements:
+        return []
+    ids = [statement["id"] for statement in statements]
+
+    charged: Dict[int, Decimal] = {}
+    applied: Dict[Tuple[int, int], Tuple[Decimal, Optional[int]]] = {}
+    applied_on: Dict[Tuple[int, int], Dict[date, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    recorded = (
+        LedgerEntry.objects.filter(statement_id__in=ids)
+        .values("statement_id", "allocation_id", "payment_id", "effective_date")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for row in recorded:
+        if row["allocation_id"] is None:
+            charged[row["statement_id"]] = charged.get(row["statement_id"], ZERO) + row["total"]
+        else:
+            key = (row["statement_id"], row["allocation_id"])
+            total, payment_id = applied.get(key, (ZERO, None))
+            applied[key] = (total + row["total"], payment_id or row["payment_id"])
+            applied_on[key][row["effective_date"]] += row["total"]
+
+    today = timezone.localdate()
+    entries: List[LedgerEntry] = []
+    active = {
+        statement["id"]
+        for statement in statements
+        # Voided before it was ever charged.
+        if statement["status"] != BillingStatement.Status.VOID or statement["id"] in charged
+    }
+    allocations = list(
+        PaymentAllocation.objects.filter(billing_statement_id__in=active).values(
+            "id", "billing_statement_id", "payment_id", "amount_applied", "payment__payment_date"
+        )
+    )
+    allocated: Dict[int, Decimal] = defaultdict(Decimal)
+    for allocation in allocations:
+        allocated[allocation["billing_statement_id"]] += allocation["amount_applied"]
+
+    for statement in statements:
+        sid, client_id = statement["id"], statement["client_id"]
+        if sid not in active:
+            continue
+        target = allocated[sid] if statement["status"] == BillingStatement.Status.VOID else statement["sub_total"]
+        delta = target - charged.get(sid, ZERO)
+        if delta:
+            if sid not in charged:
+                kind, effective = LedgerEntry.Kind.ISSUE, statement["issue_date"] or today
+            elif statement["status"] == BillingStatement.Status.VOID:
+                kind, effective = LedgerEntry.Kind.VOID, today
+            else:
+                kind, effective = LedgerEntry.Kind.ADJUSTMENT, today
+            entries.append(LedgerEntry(statement_id=sid, client_id=client_id, kind=kind, amount=delta, effective_date=effective))
+
+    clients = {statement["id"]: statement["client_id"] for statement in statements}
+    seen = set()
+    for allocation in allocations:
+        sid, key = allocation["billing_statement_id"], (allocation["billing_statement_id"], allocation["id"])
+        seen.add(key)
+        paid_on = allocation["payment__payment_date"]
+        for effective, total in applied_on.get(key, {}).items():
+            # Applied on a date the payment no longer carries: take it back on that date and apply it on the new one.
+            if total < 0 and effective != paid_on:
+                ref = dict(statement_id=sid, client_id=clients[sid], allocation_id=allocation["id"], payment_id=allocation["payment_id"])
+                entries.append(LedgerEntry(kind=LedgerEntry.Kind.REVERSAL, amount=-total, effective_date=effective, **ref))
+                entries.append(LedgerEntry(kind=LedgerEntry.Kind.ALLOCATION, amount=total, effective_date=paid_on, **ref))
+        delta = -allocation["amount_applied"] - applied.get(key, (ZERO, None))[0]
+        if delta:
+            entries.append(
+                LedgerEntry(
+                    statement_id=sid,
+                    client_id=clients[sid],
+                    kind=LedgerEntry.Kind.ALLOCATION if delta < 0 else LedgerEntry.Kind.REVERSAL,
+                    amount=delta,
+                    effective_date=paid_on if delta < 0 else today,
+                    allocation_id=allocation["id"],
+                    payment_id=allocation["payment_id"],
+                )
+            )
+    for (sid, allocation_id), (total, payment_id) in applied.items():
+        if (sid, allocation_id) not in seen and sid in active and total:
+            entries.append(
+                LedgerEntry(
+                    statement_id=sid,
+                    client_id=clients[sid],
+                    kind=LedgerEntry.Kind.REVERSAL,
+                    amount=-total,
+                    effective_date=today,
+                    allocation_id=allocation_id,
+                    payment_id=payment_id,
+                )
+            )
+
+    if entries:
+        LedgerEntry.objects.bulk_create(entries)
+        _apply_to_checkpoints(entries)
+    return entries
+
+
+def _apply_to_checkpoints(entries: List[LedgerEntry]) -> None:
+    """Carry entries dated on or before existing checkpoints into those checkpoints."""
+
+    earliest = min(entry.effective_date for entry in entries)
+    dates = sorted(set(LedgerCheckpoint.objects.filter(as_of__gte=earliest).values_list("as_of", flat=True)))
+    if not dates:
+        return
+    deltas: Dict[Tuple[date, int], Decimal] = defaultdict(Decimal)
+    clients = {}
+    for entry in entries:
+        clients[entry.statement_id] = entry.client_id
+        for as_of in dates:
+            if as_of >= entry.effective_date:
+                deltas[(as_of, entry.statement_id)] += entry.amount
+    existing = {
+        (checkpoint.as_of, checkpoint.statement_id): checkpoint
+        for checkpoint in LedgerCheckpoint.objects.filter(as_of__in=dates, statement_id__in=clients)
+    }
+    to_update, to_create = [], []
+    for (as_of, sid), delta in deltas.items():
+        checkpoint = existing.get((as_of, sid))
+        if checkpoint is None:
+            to_create.append(LedgerCheckpoint(as_of=as_of, statement_id=sid, client_id=clients[sid], balance=delta))
+        else:
+            checkpoint.balance += delta
+            to_update.append(checkpoint)
+    LedgerCheckpoint.objects.bulk_update(to_update, ["balance"])
+    LedgerCheckpoint.objects.bulk_create(to_create)
+
+
+def statement_balances_as_of(as_of: date, client_ids: Optional[Iterable[int]] = None) -> Dict[int, Decimal]:
+    """Non-zero ledger balance per statement id at the end of ``as_of``.
+
+    Starts from the latest checkpoint on or before ``as_of`` and adds only the
+    entries dated after it, so the scan is bounded by the checkpoint interval.
+    """
+
+    checkpoints: QuerySet = LedgerCheckpoint.objects.all()
+    entries: QuerySet = LedgerEntry.objects.filter(effective_date__lte=as_of)
+    if client_ids is not None:
+        client_ids = list(client_ids)
+        checkpoints = checkpoints.filter(client_id__in=client_ids)
+        entries = entries.filter(client_id__in=client_ids)
+
+    base = LedgerCheckpoint.objects.filter(as_of__lte=as_of).aggregate(latest=Max("as_of"))["latest"]
+    balances: Dict[int, Decimal] = defaultdict(Decimal)
+    if base is not None:
+        for statement_id, balance in checkpoints.filter(as_of=base).values_list("statement_id", "balance"):
+            balances[statement_id] += balance
+        entries = entries.filter(effective_date__gt=base)
+    for statement_id, total in entries.values("statement_id").annotate(total=Sum("amount")).values_list("statement_id", "total"):
+        balances[statement_id] += total
+    return {statement_id: balance for statement_id, balance in balances.items() if balance}
+
+
+def ledger_balances(as_of: date) -> QuerySet:
+    """Ledger statements annotated with ``ledger_balance`` at the end of ``as_of``.
+
+    The database equivalent of ``statement_balances_as_of``, for callers that
+    stream rows instead of holding every balance in memory.
+    """
+
+    money = DecimalField(max_digits=14, decimal_places=2)
+    zero = Value(ZERO, output_field=money)
+    base = LedgerCheckpoint.objects.filter(as_of__lte=as_of).aggregate(latest=Max("as_of"))["latest"]
+    entries = LedgerEntry.objects.filter(statement=OuterRef("pk"), effective_date__lte=as_of)
+    balance = zero
+    if base is not None:
+        checkpoint = LedgerCheckpoint.objects.filter(as_of=base, statement=OuterRef("pk")).values("balance")
+        balance = Coalesce(Subquery(checkpoint, output_field=money), zero)
+        entries = entries.filter(effective_date__gt=base)
+    entries = entries.order_by().values("statement").annotate(total=Sum("amount")).values("total")
+    return BillingStatement.objects.filter(status__in=LEDGER_STATUSES).annotate(
+        ledger_balance=ExpressionWrapper(balance + Coalesce(Subquery(entries, output_field=money), zero), output_field=money)
+    )
+
+
+def client_balances_as_of(as_of: date) -> Dict[int, Decimal]:
+    totals: Dict[int, Decimal] = defaultdict(Decimal)
+    statements = statement_balances_as_of(as_of)
+    clients = BillingStatement.objects.filter(id__in=statements).values_list("id", "client_id")
+    for statement_id, client_id in clients:
+        totals[client_id] += statements[statement_id]
+    return {client_id: balance for client_id, balance in totals.items() if balance}
+
+
+def applied_entries(start: Optional[date] = None, end: Optional[date] = None) -> QuerySet:
+    """Allocation and rollback entries dated within ``start``..``end``; allocations are negative."""
+
+    entries = LedgerEntry.objects.filter(kind__in=[LedgerEntry.Kind.ALLOCATION, LedgerEntry.Kind.REVERSAL])
+    if start:
+        entries = entries.filter(effective_date__gte=start)
+    if end:
+        entries = entries.filter(effective_date__lte=end)
+    return entries
+
+
+def applied_collections(start: Optional[date] = None, end: Optional[date] = None) -> QuerySet:
+    """Allocated payments net of rollbacks, grouped by effective date and method."""
+
+    return (
+        applied_entries(start, end)
+        .values("effective_date", "payment__method")
+        .annotate(total_amount=-Sum("amount"))
+        .order_by("effective_date", "payment__method")
+    )
+
+
+def write_checkpoint(as_of: date) -> int:
+    """Store every statement's non-zero balance at the end of ``as_of``; returns the row count."""
+
+    with transaction.atomic():
+        balances = statement_balances_as_of(as_of)
+        clients = dict(BillingStatement.objects.filter(id__in=balances).values_list("id", "client_id"))
+        LedgerCheckpoint.objects.filter(as_of=as_of).delete()
+        LedgerCheckpoint.objects.bulk_create(
+            LedgerCheckpoint(as_of=as_of, statement_id=sid, client_id=clients[sid], balance=balance)
+            for sid, balance in balances.items()
+        )
+    return len(balances)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from payments.models import Payment, PaymentAllocation
+from statements.models import BillingStatement
+from statements.signals import statements_changed
+from .services import LEDGER_STATUSES, sync_statement_ledger
+
+# What sync_statement_ledger reads from the statement; PDF, note and audit-column saves change none of it.
+LEDGER_FIELDS = frozenset({"client", "client_id", "status", "sub_total", "issue_date"})
+
+
+@receiver(post_save, sender=BillingStatement)
+def statement_saved(sender, instance: BillingStatement, update_fields=None, **kwargs):
+    if update_fields is not None and not update_fields & LEDGER_FIELDS:
+        return
+    # Drafts never move backwards into the ledger statuses, so they can be skipped cheaply.
+    if instance.status in LEDGER_STATUSES:
+        sync_statement_ledger([instance.pk])
+
+
+@receiver(statements_changed)
+def statements_bulk_changed(sender, statement_ids=(), created=False, **kwargs):
+    # New drafts have nothing to record. Anything else is synced even when no totals moved:
+    # an allocation re-created from another payment for the same amount leaves them unchanged.
+    if not created:
+        sync_statement_ledger(statement_ids)
+
+
+@receiver(post_save, sender=Payment)
+def payment_saved(sender, instance: Payment, created=False, update_fields=None, **kwargs):
+    # Allocation entries are dated on their payment's date.
+    if created or (update_fields is not None and "payment_date" not in update_fields):
+        return
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is not None and loaded.get("payment_date") == instance.payment_date:
+        return
+    sync_statement_ledger(PaymentAllocation.objects.filter(payment=instance).values_list("billing_statement_id", flat=True))
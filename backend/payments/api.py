@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from accounts.permissions import IsAdmin, IsAdminOrBiller, IsAdminOrReviewer
 from audit.utils import log_action
+from common.search import FullTextSearchFilter
 from common.utils import diff_model
+from statements.totals import deferred_totals, mark_totals_dirty
 from .models import Payment, PaymentAllocation, UnappliedCredit
 from .serializers import (
     PaymentAllocationInputSerializer,
@@ -21,10 +25,15 @@ from .serializers import (
 
 class PaymentViewSet(viewsets.ModelViewSet):
     serializer_class = PaymentSerializer
-    queryset = Payment.objects.select_related("client", "recorded_by", "verified_by").prefetch_related("allocations")
+    queryset = (
+        Payment.objects.select_related("client", "recorded_by", "verified_by")
+        .prefetch_related("allocations")
+        .with_allocation_totals()
+    )
     permission_classes = [IsAuthenticated]
     filterset_fields = ["client", "status", "method", "payment_date"]
-    search_fields = ["manual_invoice_no", "reference_no", "client__name"]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    search_related = ["client"]
     ordering_fields = ["payment_date", "amount_received", "created_at"]
 
     def get_permissions(self):
@@ -77,15 +86,19 @@ class PaymentViewSet(viewsets.ModelViewSet):
         payload = request.data.get("allocations", [])
         serializer = PaymentAllocationInputSerializer(data=payload, many=True)
         serializer.is_valid(raise_exception=True)
-        payment.allocations.all().delete()
-        for allocation in serializer.validated_data:
-            PaymentAllocation.objects.create(
-                payment=payment,
-                billing_statement=allocation["billing_statement"],
-                amount_applied=allocation["amount_applied"],
-                created_by=request.user,
-                updated_by=request.user,
-            )
+        with deferred_totals():
+            previous = payment.allocations.all()
+            mark_totals_dirty(*previous.values_list("billing_statement_id", flat=True))
+            previous.delete()
+            payment.invalidate_allocation_totals()
+            for allocation in serializer.validated_data:
+                PaymentAllocation.objects.create(
+                    payment=payment,
+                    billing_statement=allocation["billing_statement"],
+                    amount_applied=allocation["amount_applied"],
+                    created_by=request.user,
+                    updated_by=request.user,
+                )
         payment.refresh_from_db()
         payment.unapplied_credits.all().delete()
         remaining = payment.remaining_unallocated
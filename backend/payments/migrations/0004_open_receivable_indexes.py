@@ -0,0 +1,23 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so payments keep being recorded while the indexes build.
+    atomic = False
+
+    dependencies = [
+        ('payments', '0003_keyset_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(fields=['client', 'status', '-payment_date', '-created_at', '-id'], name='payment_client_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status__in', ['posted', 'verified'])), fields=['payment_date'], include=('method', 'amount_received'), name='payment_collected_date_idx'),
+        ),
+    ]
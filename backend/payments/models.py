@@ -2,11 +2,34 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
+from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 
 from common.models import TimeStampedUserModel
+from common.search import weighted_vector
 from statements.models import BillingStatement
+from statements.totals import deferred_totals, mark_totals_dirty
+
+
+class PaymentQuerySet(models.QuerySet):
+    def with_allocation_totals(self):
+        """Annotate ``allocated_total`` so listing payments needs no per-row aggregate."""
+
+        allocated = (
+            PaymentAllocation.objects.filter(payment=OuterRef("pk"))
+            .order_by()
+            .values("payment")
+            .annotate(total=Sum("amount_applied"))
+            .values("total")
+        )
+        money = DecimalField(max_digits=12, decimal_places=2)
+        return self.annotate(
+            allocated_total=Coalesce(Subquery(allocated, output_field=money), Value(Decimal("0.00")), output_field=money)
+        )
 
 
 class Payment(TimeStampedUserModel):
@@ -36,22 +59,67 @@ class Payment(TimeStampedUserModel):
     recorded_by = models.ForeignKey("accounts.User", related_name="payments_recorded", on_delete=models.PROTECT)
     verified_by = models.ForeignKey("accounts.User", related_name="payments_verified", on_delete=models.PROTECT, null=True, blank=True)
     verified_at = models.DateTimeField(null=True, blank=True)
+    search_vector = models.GeneratedField(
+        expression=weighted_vector(("manual_invoice_no", "A"), ("reference_no", "A"), ("notes", "C")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = PaymentQuerySet.as_manager()
+
+    ALLOCATION_ANNOTATIONS = ("allocated_total",)
 
     class Meta:
         ordering = ("-payment_date", "-created_at")
+        constraints = [
+            models.UniqueConstraint(fields=["client", "manual_invoice_no"], name="unique_manual_invoice_per_client"),
+        ]
+        indexes = [
+            # Keyset pagination over the default ordering.
+            models.Index(fields=["-payment_date", "-created_at", "-id"], name="payment_keyset_idx"),
+            models.Index(fields=["client", "status", "-payment_date", "-created_at", "-id"], name="payment_client_status_idx"),
+            # Collections register: posted and verified payments by date.
+            models.Index(
+                fields=["payment_date"],
+                include=["method", "amount_received"],
+                condition=Q(status__in=["posted", "verified"]),
+                name="payment_collected_date_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="payment_search_idx"),
+        ]
 
     def __str__(self):  # pragma: no cover
         return f"Payment {self.pk} — {self.client.name}"
 
     @property
     def allocated_amount(self) -> Decimal:
-        return self.allocations.aggregate(total=models.Sum("amount_applied"))["total"] or Decimal("0.00")
+        if "allocated_total" in self.__dict__:
+            return self.allocated_total
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("allocations")
+        if prefetched is not None:
+            return sum((allocation.amount_applied for allocation in prefetched), Decimal("0.00"))
+        return self.allocations.aggregate(total=Sum("amount_applied"))["total"] or Decimal("0.00")
 
     @property
+    def remaining_unallocated(self) -> Decimal:
+        return self.amount_received - self.allocated_amount
+
+    def invalidate_allocation_totals(self) -> None:
+        """Drop annotated or prefetched allocation totals after allocations change."""
+
+        for name in self.ALLOCATION_ANNOTATIONS:
+            self.__dict__.pop(name, None)
+        getattr(self, "_prefetched_objects_cache", {}).pop("allocations", None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        self.invalidate_allocation_totals()
+        super().refresh_from_db(*args, **kwargs)
+
     def delete(self, using=None, keep_parents=False):
         # Manually delete allocations so their hooks update statements
-        for allocation in list(self.allocations.all()):
-            allocation.delete()
+        with deferred_totals():
+            for allocation in list(self.allocations.all()):
+                allocation.delete()
         # Remove any related unapplied credits before deleting the payment
         self.unapplied_credits.all().delete()
         return super().delete(using=using, keep_parents=keep_parents)
@@ -81,8 +149,9 @@ class Payment(TimeStampedUserModel):
         self.notes = f"{self.notes}\nVoided: {reason}" if self.notes else f"Voided: {reason}"
         self.save(update_fields=["status", "notes", "updated_by", "updated_at"])
         # Rollback allocations
-        for allocation in self.allocations.all():
-            allocation.rollback(actor)
+        with deferred_totals():
+            for allocation in self.allocations.all():
+                allocation.rollback(actor)
 
 
 class PaymentAllocation(TimeStampedUserModel):
@@ -109,14 +178,19 @@ class PaymentAllocation(TimeStampedUserModel):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
-        self.billing_statement.recalculate_totals(save=True)
-        self.billing_statement.mark_settled_if_zero_balance(save=True)
+        self._invalidate_payment_totals()
+        mark_totals_dirty(self.billing_statement_id)
 
     def delete(self, *args, **kwargs):
-        statement = self.billing_statement
-        super().delete(*args, **kwargs)
-        statement.recalculate_totals(save=True)
-        statement.mark_settled_if_zero_balance(save=True)
+        statement_id = self.billing_statement_id
+        result = super().delete(*args, **kwargs)
+        self._invalidate_payment_totals()
+        mark_totals_dirty(statement_id)
+        return result
+
+    def _invalidate_payment_totals(self) -> None:
+        if self._meta.get_field("payment").is_cached(self):
+            self.payment.invalidate_allocation_totals()
 
     def rollback(self, actor):
         statement = self.billing_statement
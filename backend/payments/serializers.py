@@ -3,10 +3,10 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import List
 
-from django.db import transaction
 from rest_framework import serializers
 
 from statements.models import BillingStatement
+from statements.totals import deferred_totals, mark_totals_dirty
 from .models import Payment, PaymentAllocation, UnappliedCredit
 
 
@@ -85,24 +85,27 @@ class PaymentSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"manual_invoice_no": "Manual invoice already exists for this client."})
         return attrs
 
-    @transaction.atomic
     def create(self, validated_data):
         allocations: List[dict] = validated_data.pop("allocations", [])
-        payment: Payment = Payment.objects.create(**validated_data)
-        self._replace_allocations(payment, allocations)
-        self._create_unapplied_credit_if_needed(payment)
+        with deferred_totals():
+            payment: Payment = Payment.objects.create(**validated_data)
+            self._replace_allocations(payment, allocations)
+            self._create_unapplied_credit_if_needed(payment)
         return payment
 
-    @transaction.atomic
     def update(self, instance: Payment, validated_data):
         allocations = validated_data.pop("allocations", None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        if allocations is not None:
-            instance.allocations.all().delete()
-            self._replace_allocations(instance, allocations)
-        self._create_unapplied_credit_if_needed(instance, replace_existing=True)
+        with deferred_totals():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            if allocations is not None:
+                previous = instance.allocations.all()
+                mark_totals_dirty(*previous.values_list("billing_statement_id", flat=True))
+                previous.delete()
+                instance.invalidate_allocation_totals()
+                self._replace_allocations(instance, allocations)
+            self._create_unapplied_credit_if_needed(instance, replace_existing=True)
         return instance
 
     def _replace_allocations(self, payment: Payment, allocations_payload: List[dict]):
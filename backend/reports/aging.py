@@ -0,0 +1,168 @@
+"""Receivables aging, live or from ``AgingSnapshot`` rows.
+
+Computing aging live scans every open statement. Snapshots store the result per
+client and date: the nightly ``snapshot_receivables_aging`` command writes a
+full set, and changes to statements or allocations re-aggregate only the
+affected clients' rows for today, after the transaction commits. Past dates are
+never rewritten, so they keep the history. Past dates without a snapshot are
+answered from the AR ledger, which knows each statement's balance on that date.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.db import models, transaction
+from django.db.models import Case, Count, DecimalField, QuerySet, Sum, Value, When
+from django.utils import timezone
+
+from common.utils import on_commit_queued
+from ledger.services import ledger_balances, statement_balances_as_of
+from statements.models import BillingStatement
+from .cache import bump_report_version
+from .models import AgingSnapshot
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def aging_bucket(as_of: date) -> Case:
+    return Case(
+        When(due_date__gte=as_of, then=Value("0-30")),
+        When(due_date__lt=as_of, due_date__gte=as_of - timedelta(days=30), then=Value("0-30")),
+        When(due_date__lt=as_of - timedelta(days=30), due_date__gte=as_of - timedelta(days=60), then=Value("31-60")),
+        When(due_date__lt=as_of - timedelta(days=60), due_date__gte=as_of - timedelta(days=90), then=Value("61-90")),
+        default=Value("90+"),
+        output_field=models.CharField(),
+    )
+
+
+def bucket_for(due_date: Optional[date], as_of: date) -> str:
+    """Python counterpart of ``aging_bucket`` for balances computed outside the database."""
+
+    if due_date is None:
+        return "90+"
+    days = (as_of - due_date).days
+    if days <= 30:
+        return "0-30"
+    if days <= 60:
+        return "31-60"
+    return "61-90" if days <= 90 else "90+"
+
+
+def open_receivables() -> QuerySet:
+    # Served by the partial statement_open_* indexes; keep the two conditions in step.
+    return BillingStatement.objects.filter(balance__gt=0, status__in=BillingStatement.RECEIVABLE_STATUSES)
+
+
+def live_aging(as_of: date) -> Dict[str, Decimal]:
+    report = (
+        open_receivables()
+        .annotate(bucket=aging_bucket(as_of))
+        .values("bucket")
+        .annotate(total_balance=Sum("balance", output_field=DecimalField(max_digits=14, decimal_places=2)))
+        .order_by("bucket")
+    )
+    return {row["bucket"]: row["total_balance"] or 0 for row in report}
+
+
+def ledger_aging(as_of: date) -> Dict[str, Decimal]:
+    """Aging of the balances the AR ledger held at the end of ``as_of``."""
+
+    balances = {pk: balance for pk, balance in statement_balances_as_of(as_of).items() if balance > 0}
+    totals: Dict[str, Decimal] = {}
+    for statement_id, due_date in BillingStatement.objects.filter(id__in=balances).values_list("id", "due_date"):
+        bucket = bucket_for(due_date, as_of)
+        totals[bucket] = totals.get(bucket, Decimal("0.00")) + balances[statement_id]
+    return dict(sorted(totals.items()))
+
+
+def ledger_receivables(as_of: date) -> QuerySet:
+    """Statements with a positive AR ledger balance at the end of ``as_of``, annotated with ``bucket``.
+
+    The ledger counterpart of ``open_receivables()``, with ``ledger_balance`` in
+    place of ``balance``; computed in the database so exports can stream it.
+    """
+
+    return ledger_balances(as_of).filter(ledger_balance__gt=0).annotate(bucket=aging_bucket(as_of))
+
+
+def snapshot_aging(as_of: date) -> Optional[Dict[str, Decimal]]:
+    """Bucket totals from the snapshot for ``as_of``, or None when there is none."""
+
+    totals = AgingSnapshot.objects.filter(as_of=as_of).aggregate(
+        rows=Count("id"), **{bucket: Sum(field) for bucket, field in AgingSnapshot.BUCKET_FIELDS.items()}
+    )
+    if not totals.pop("rows"):
+        return None
+    return {bucket: amount for bucket, amount in totals.items() if amount}
+
+
+def refresh_aging_snapshot(as_of: date, client_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuild the ``as_of`` snapshot, for every client or only ``client_ids``.
+
+    Clients with nothing outstanding get no row. Returns the number of rows written.
+    """
+
+    receivables = open_receivables()
+    snapshots = AgingSnapshot.objects.filter(as_of=as_of)
+    if client_ids is not None:
+        client_ids = set(client_ids)
+        receivables = receivables.filter(client_id__in=client_ids)
+        snapshots = snapshots.filter(client_id__in=client_ids)
+
+    rows: Dict[int, AgingSnapshot] = {}
+    grouped = (
+        receivables.annotate(bucket=aging_bucket(as_of))
+        .values("client_id", "bucket")
+        .annotate(amount=Sum("balance"))
+        .order_by()
+    )
+    for row in grouped:
+        snapshot = rows.setdefault(row["client_id"], AgingSnapshot(as_of=as_of, client_id=row["client_id"]))
+        setattr(snapshot, AgingSnapshot.BUCKET_FIELDS[row["bucket"]], row["amount"])
+        snapshot.total += row["amount"]
+
+    with transaction.atomic():
+        snapshots.delete()
+        AgingSnapshot.objects.bulk_create(rows.values())
+        bump_report_version()
+    return len(rows)
+
+
+def mark_aging_dirty(client_ids: Iterable[Optional[int]]) -> None:
+    """Refresh today's snapshot rows for ``client_ids`` once the transaction commits.
+
+    Ids marked within one transaction are refreshed together. Nothing is written
+    until the nightly command has created today's snapshot.
+    """
+
+    client_ids = {pk for pk in client_ids if pk is not None}
+    if not client_ids:
+        return
+    pending = getattr(_local, "clients", None)
+    queued = pending is not None and on_commit_queued(_flush_dirty_clients)
+    if not queued:
+        # Ids left over from a rolled-back transaction must not be flushed with this one.
+        pending = _local.clients = set()
+    pending.update(client_ids)
+    if not queued:
+        transaction.on_commit(_flush_dirty_clients)
+
+
+def _flush_dirty_clients() -> None:
+    client_ids, _local.clients = getattr(_local, "clients", None), None
+    if not client_ids:
+        return
+    today = timezone.localdate()
+    # Runs after the write committed; a failure leaves the rows to the nightly snapshot instead of failing the request.
+    try:
+        if AgingSnapshot.objects.filter(as_of=today).exists():
+            refresh_aging_snapshot(today, client_ids)
+    except Exception:
+        logger.exception("Refreshing today's aging snapshot for %s failed", sorted(client_ids))
@@ -1,81 +1,311 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
-from django.db import models
-from django.db.models import Case, DecimalField, Sum, Value, When
+from django.db.models import F, Q, Sum
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from clients.models import Client
+from common.pagination import KeysetPagination
+from engagements.forecast import forecast_retainers
+from engagements.models import Engagement
+from engagements.serializers import RetainerForecastQuerySerializer
+from ledger.services import applied_collections, applied_entries, client_balances_as_of
+from payments.models import Payment, PaymentAllocation, UnappliedCredit
 from statements.models import BillingStatement
-from payments.models import Payment, UnappliedCredit
 from audit.models import AuditLog
-from audit.serializers import AuditLogSerializer
+from audit.serializers import AuditLogSerializer, AuditReportQuerySerializer
+from .aging import aging_bucket, ledger_aging, ledger_receivables, live_aging, open_receivables, snapshot_aging
+from .cache import cached_report, get_report_cache
+from .dashboard import dashboard_summary
+from .exports import EXPORT_CHUNK_SIZE, EXPORT_RENDERERS, export_response, wants_export
+from .models import AgingSnapshot
+
+
+DETAIL_LEVELS = ("client", "statement")
+
+
+def _detail_level(request):
+    """Export granularity: aggregated (None), one row per client, or one per underlying record."""
+
+    detail = request.query_params.get("detail") or None
+    if detail is not None and detail not in DETAIL_LEVELS:
+        raise ValidationError({"detail": f"Must be one of: {', '.join(DETAIL_LEVELS)}."})
+    return detail
 
 
 class AgingReportView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = EXPORT_RENDERERS
 
+    @cached_report("aging")
     def get(self, request):
         as_of_param = request.query_params.get("as_of")
-        as_of = datetime.strptime(as_of_param, "%Y-%m-%d").date() if as_of_param else date.today()
-        qs = BillingStatement.objects.filter(balance__gt=0, status__in=[BillingStatement.Status.ISSUED, BillingStatement.Status.PENDING_REVIEW])
-
-        aging_case = Case(
-            When(due_date__gte=as_of, then=Value("0-30")),
-            When(due_date__lt=as_of, due_date__gte=as_of - timedelta(days=30), then=Value("0-30")),
-            When(due_date__lt=as_of - timedelta(days=30), due_date__gte=as_of - timedelta(days=60), then=Value("31-60")),
-            When(due_date__lt=as_of - timedelta(days=60), due_date__gte=as_of - timedelta(days=90), then=Value("61-90")),
-            default=Value("90+"),
-            output_field=models.CharField(),
-        )
-        report = (
-            qs.annotate(bucket=aging_case)
-            .values("bucket")
-            .annotate(total_balance=Sum("balance", output_field=DecimalField(max_digits=14, decimal_places=2)))
-            .order_by("bucket")
-        )
-        data = {row["bucket"]: row["total_balance"] or 0 for row in report}
-        return Response({"as_of": as_of, "buckets": data})
+        as_of = datetime.strptime(as_of_param, "%Y-%m-%d").date() if as_of_param else timezone.localdate()
+        detail = _detail_level(request) if wants_export(request) else None
+        if detail:
+            return self.export_detail(request, as_of, detail)
+        buckets = snapshot_aging(as_of)
+        source = "snapshot"
+        if buckets is None and as_of < timezone.localdate():
+            buckets, source = ledger_aging(as_of), "ledger"
+        elif buckets is None:
+            buckets, source = live_aging(as_of), "live"
+        if wants_export(request):
+            return export_response(request, f"aging-{as_of}", ["bucket", "total_balance"], buckets.items())
+        return Response({"as_of": as_of, "buckets": buckets, "source": source})
+
+    def export_detail(self, request, as_of, detail):
+        if as_of < timezone.localdate():
+            # Past dates age the balances the AR ledger held then, like the summary's ledger fallback.
+            receivables, balance = ledger_receivables(as_of), "ledger_balance"
+        else:
+            # Detail rows age the current open balances, like the live report.
+            receivables, balance = open_receivables().annotate(bucket=aging_bucket(as_of)), "balance"
+        if detail == "client":
+            columns = ["client", *AgingSnapshot.BUCKET_FIELDS, "total"]
+            rows = (
+                receivables.values("client__name")
+                .annotate(
+                    **{field: Sum(balance, filter=Q(bucket=bucket)) for bucket, field in AgingSnapshot.BUCKET_FIELDS.items()},
+                    total=Sum(balance),
+                )
+                .order_by("client__name")
+                .values_list("client__name", *AgingSnapshot.BUCKET_FIELDS.values(), "total")
+            )
+        else:
+            columns = ["client", "statement", "period", "due_date", "bucket", "balance"]
+            rows = receivables.order_by("client__name", "due_date", "id").values_list(
+                "client__name", "number", "period", "due_date", "bucket", balance
+            )
+        return export_response(request, f"aging-{as_of}-{detail}", columns, rows.iterator(chunk_size=EXPORT_CHUNK_SIZE))
 
 
 class CollectionsRegisterView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = EXPORT_RENDERERS
 
+    @cached_report("collections")
     def get(self, request):
         start = request.query_params.get("start")
         end = request.query_params.get("end")
+        detail = _detail_level(request) if wants_export(request) else None
+        if request.query_params.get("basis") == "ledger" and detail:
+            return self.export_ledger_detail(request, start, end, detail)
+        if request.query_params.get("basis") == "ledger":
+            rows = applied_collections(start, end)
+            if wants_export(request):
+                return export_response(
+                    request,
+                    "collections-applied",
+                    ["payment_date", "method", "total_amount"],
+                    rows.values_list("effective_date", "payment__method", "total_amount").iterator(chunk_size=EXPORT_CHUNK_SIZE),
+                )
+            return Response(
+                {
+                    "rows": [
+                        {"payment_date": row["effective_date"], "method": row["payment__method"], "total_amount": row["total_amount"]}
+                        for row in rows
+                    ]
+                }
+            )
         qs = Payment.objects.filter(status__in=[Payment.Status.POSTED, Payment.Status.VERIFIED])
         if start:
             qs = qs.filter(payment_date__gte=start)
         if end:
             qs = qs.filter(payment_date__lte=end)
+        if detail == "statement":
+            allocations = (
+                PaymentAllocation.objects.filter(payment__in=qs)
+                .order_by("payment__payment_date", "payment_id", "id")
+                .values_list(
+                    "payment__payment_date",
+                    "payment__manual_invoice_no",
+                    "payment__client__name",
+                    "payment__method",
+                    "billing_statement__number",
+                    "billing_statement__period",
+                    "amount_applied",
+                )
+            )
+            columns = ["payment_date", "invoice", "client", "method", "statement", "period", "amount_applied"]
+            return export_response(request, "collections-statement", columns, allocations.iterator(chunk_size=EXPORT_CHUNK_SIZE))
+        if detail == "client":
+            rows = (
+                qs.values("payment_date", "client__name", "method")
+                .annotate(total_amount=Sum("amount_received"))
+                .order_by("payment_date", "client__name", "method")
+                .values_list("payment_date", "client__name", "method", "total_amount")
+            )
+            columns = ["payment_date", "client", "method", "total_amount"]
+            return export_response(request, "collections-client", columns, rows.iterator(chunk_size=EXPORT_CHUNK_SIZE))
         report = (
             qs.values("payment_date", "method")
             .annotate(total_amount=Sum("amount_received"))
             .order_by("payment_date", "method")
         )
+        if wants_export(request):
+            rows = report.values_list("payment_date", "method", "total_amount").iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            return export_response(request, "collections", ["payment_date", "method", "total_amount"], rows)
         return Response({"rows": list(report)})
 
+    def export_ledger_detail(self, request, start, end, detail):
+        # Applied collections per allocation or client; rollbacks appear as negative rows.
+        entries = applied_entries(start, end)
+        if detail == "statement":
+            rows = (
+                entries.annotate(amount_applied=-F("amount"))
+                .order_by("effective_date", "payment_id", "id")
+                .values_list(
+                    "effective_date",
+                    "payment__manual_invoice_no",
+                    "client__name",
+                    "payment__method",
+                    "statement__number",
+                    "statement__period",
+                    "amount_applied",
+                )
+            )
+            columns = ["payment_date", "invoice", "client", "method", "statement", "period", "amount_applied"]
+        else:
+            rows = (
+                entries.values("effective_date", "client__name", "payment__method")
+                .annotate(total_amount=-Sum("amount"))
+                .order_by("effective_date", "client__name", "payment__method")
+                .values_list("effective_date", "client__name", "payment__method", "total_amount")
+            )
+            columns = ["payment_date", "client", "method", "total_amount"]
+        return export_response(
+            request, f"collections-applied-{detail}", columns, rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
 
 class UnappliedCreditReportView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = EXPORT_RENDERERS
 
+    @cached_report("unapplied-credits")
     def get(self, request):
         qs = UnappliedCredit.objects.filter(status=UnappliedCredit.Status.OPEN)
+        detail = _detail_level(request) if wants_export(request) else None
+        if detail == "statement":
+            # Credits are not tied to a statement; their detail rows are the credits themselves.
+            credits = qs.order_by("client__name", "created_at", "id").values_list(
+                "client__name", "source_payment__manual_invoice_no", "source_payment__payment_date", "reason", "amount"
+            )
+            columns = ["client", "invoice", "payment_date", "reason", "amount"]
+            return export_response(request, "unapplied-credits-detail", columns, credits.iterator(chunk_size=EXPORT_CHUNK_SIZE))
         report = (
             qs.values("client__name")
             .annotate(total_amount=Sum("amount"))
             .order_by("client__name")
         )
+        if wants_export(request):
+            rows = report.values_list("client__name", "total_amount").iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            return export_response(request, "unapplied-credits", ["client", "total_amount"], rows)
         return Response({"rows": list(report)})
 
 
+class ClientBalanceReportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @cached_report("client-balances")
+    def get(self, request):
+        as_of_param = request.query_params.get("as_of")
+        as_of = datetime.strptime(as_of_param, "%Y-%m-%d").date() if as_of_param else timezone.localdate()
+        balances = client_balances_as_of(as_of)
+        names = dict(Client.objects.filter(id__in=balances).values_list("id", "name"))
+        rows = [
+            {"client_id": client_id, "client__name": names[client_id], "balance": balance}
+            for client_id, balance in balances.items()
+        ]
+        return Response({"as_of": as_of, "rows": sorted(rows, key=lambda row: row["client__name"])})
+
+
+# Entities whose history can be read at /api/reports/audit/<entity>/<id>/.
+AUDIT_ENTITIES = {
+    "statement": BillingStatement,
+    "payment": Payment,
+    "client": Client,
+    "engagement": Engagement,
+}
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
 class AuditLogView(APIView):
+    """Audit entries newest first, paged by ``(created_at, id)`` cursor."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = AuditReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        qs = AuditLog.objects.select_related("actor").order_by("-created_at", "-id")
+        if "start" in filters:
+            qs = qs.filter(created_at__gte=_start_of_day(filters["start"]))
+        if "end" in filters:
+            qs = qs.filter(created_at__lt=_start_of_day(filters["end"] + timedelta(days=1)))
+        for field in ("action", "entity_type"):
+            if field in filters:
+                qs = qs.filter(**{field: filters[field]})
+        if "actor" in filters:
+            qs = qs.filter(actor_id=filters["actor"])
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return paginator.get_paginated_response(AuditLogSerializer(page, many=True).data)
+
+
+class AuditEntityHistoryView(APIView):
+    """Every audit entry for one record, oldest first."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, entity, entity_id):
+        model = AUDIT_ENTITIES.get(entity)
+        if model is None:
+            raise Http404
+        entity_type = model._meta.label
+        entries = (
+            AuditLog.objects.select_related("actor")
+            .filter(entity_type=entity_type, entity_id=entity_id)
+            .order_by("created_at", "id")
+        )
+        return Response(
+            {"entity_type": entity_type, "entity_id": entity_id, "results": AuditLogSerializer(entries, many=True).data}
+        )
+
+
+class RetainerForecastView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @cached_report("retainer-forecast")
+    def get(self, request):
+        params = RetainerForecastQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start = params.validated_data.get("start") or date.today().strftime("%Y-%m")
+        return Response(forecast_retainers(start, params.validated_data["months"]))
+
+
+class DashboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @cached_report("dashboard")
+    def get(self, request):
+        return Response(dashboard_summary(timezone.localdate()))
+
+
+class ReportCacheStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        qs = AuditLog.objects.select_related("actor")[:500]
-        serializer = AuditLogSerializer(qs, many=True)
-        return Response(serializer.data)
+        return Response(get_report_cache().stats())
@@ -0,0 +1,176 @@
+"""Per-client receivables summary stored in ``ClientBalance``.
+
+Writes to statements, payments, credits and engagements mark their clients
+dirty, and after the transaction commits the affected rows are recomputed
+from that client's own records, which the partial open-receivable indexes
+serve directly. If that refresh fails, the rows are dropped and rebuilt when
+next read. Reads never aggregate across clients. A refresh locks the
+rows it rewrites, so a refresh running behind a later commit waits for the
+earlier one instead of overwriting it with older figures.
+
+Overdue buckets shift as days pass without any write. Rows aged on an earlier
+day are refreshed when read, and the nightly ``snapshot_receivables_aging``
+re-ages every client.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.db import models, transaction
+from django.db.models import Case, Count, Max, Sum, Value, When
+from django.utils import timezone
+
+from clients.models import Client
+from common.utils import on_commit_queued
+from engagements.models import Engagement
+from payments.models import Payment, UnappliedCredit
+from .aging import open_receivables
+from .models import ClientBalance
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+_SUMMARY_FIELDS = [
+    "as_of",
+    "open_ar",
+    *ClientBalance.OVERDUE_FIELDS.values(),
+    "unapplied_credit",
+    "last_payment_date",
+    "active_engagements",
+    "updated_at",
+]
+
+
+def overdue_bucket(as_of: date) -> Case:
+    """Days past due on ``as_of``; statements without a due date count as 90+, as in aging."""
+
+    return Case(
+        When(due_date__gte=as_of, then=Value("current")),
+        When(due_date__gte=as_of - timedelta(days=30), then=Value("1-30")),
+        When(due_date__gte=as_of - timedelta(days=60), then=Value("31-60")),
+        When(due_date__gte=as_of - timedelta(days=90), then=Value("61-90")),
+        default=Value("90+"),
+        output_field=models.CharField(),
+    )
+
+
+def refresh_client_balances(client_ids: Optional[Iterable[int]] = None, as_of: Optional[date] = None) -> int:
+    """Recompute ``ClientBalance`` for ``client_ids`` (every client when None). Returns the rows written."""
+
+    as_of = as_of or timezone.localdate()
+    clients = Client.objects.all()
+    if client_ids is not None:
+        clients = clients.filter(id__in=set(client_ids))
+    ids = list(clients.order_by("id").values_list("id", flat=True))
+    if not ids:
+        return 0
+
+    with transaction.atomic():
+        # Insert missing rows so they can be locked; a concurrent insert of the same row is a no-op.
+        ClientBalance.objects.bulk_create([ClientBalance(client_id=pk, as_of=as_of) for pk in ids], ignore_conflicts=True)
+        rows = {row.client_id: row for row in ClientBalance.objects.select_for_update().filter(client_id__in=ids).order_by("client_id")}
+        for row in rows.values():
+            row.as_of = as_of
+            row.open_ar = Decimal("0.00")
+            for field in ClientBalance.OVERDUE_FIELDS.values():
+                setattr(row, field, Decimal("0.00"))
+            row.unapplied_credit = Decimal("0.00")
+            row.last_payment_date = None
+            row.active_engagements = 0
+
+        buckets = (
+            open_receivables()
+            .filter(client_id__in=ids)
+            .annotate(bucket=overdue_bucket(as_of))
+            .values("client_id", "bucket")
+            .annotate(amount=Sum("balance"))
+            .order_by()
+        )
+        for row in buckets:
+            balance = rows[row["client_id"]]
+            setattr(balance, ClientBalance.OVERDUE_FIELDS[row["bucket"]], row["amount"])
+            balance.open_ar += row["amount"]
+
+        credits = (
+            UnappliedCredit.objects.filter(client_id__in=ids, status=UnappliedCredit.Status.OPEN)
+            .values("client_id")
+            .annotate(amount=Sum("amount"))
+            .order_by()
+        )
+        for row in credits:
+            rows[row["client_id"]].unapplied_credit = row["amount"]
+
+        payments = (
+            Payment.objects.filter(client_id__in=ids, status__in=[Payment.Status.POSTED, Payment.Status.VERIFIED])
+            .values("client_id")
+            .annotate(last=Max("payment_date"))
+            .order_by()
+        )
+        for row in payments:
+            rows[row["client_id"]].last_payment_date = row["last"]
+
+        engagements = (
+            Engagement.objects.filter(client_id__in=ids, status=Engagement.Status.ACTIVE)
+            .values("client_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in engagements:
+            rows[row["client_id"]].active_engagements = row["count"]
+
+        now = timezone.now()
+        for row in rows.values():
+            row.updated_at = now
+        ClientBalance.objects.bulk_update(rows.values(), _SUMMARY_FIELDS)
+    return len(rows)
+
+
+def client_balances(client_ids: Iterable[int]) -> Dict[int, ClientBalance]:
+    """Stored summaries for ``client_ids``, first refreshing any missing or aged on an earlier day."""
+
+    ids = set(client_ids)
+    today = timezone.localdate()
+    rows = {row.client_id: row for row in ClientBalance.objects.filter(client_id__in=ids, as_of=today)}
+    stale = ids - rows.keys()
+    if stale:
+        refresh_client_balances(stale, today)
+        rows.update((row.client_id, row) for row in ClientBalance.objects.filter(client_id__in=stale))
+    return rows
+
+
+def mark_balances_dirty(client_ids: Iterable[Optional[int]]) -> None:
+    """Refresh the summaries of ``client_ids`` once the transaction commits, together."""
+
+    client_ids = {pk for pk in client_ids if pk is not None}
+    if not client_ids:
+        return
+    pending = getattr(_local, "clients", None)
+    queued = pending is not None and on_commit_queued(_flush_dirty_clients)
+    if not queued:
+        # Ids left over from a rolled-back transaction must not be flushed with this one.
+        pending = _local.clients = set()
+    pending.update(client_ids)
+    if not queued:
+        transaction.on_commit(_flush_dirty_clients)
+
+
+def _flush_dirty_clients() -> None:
+    client_ids, _local.clients = getattr(_local, "clients", None), None
+    if not client_ids:
+        return
+    # The write this follows has already committed; a failure here must not turn it into an error response.
+    try:
+        refresh_client_balances(client_ids)
+    except Exception:
+        logger.exception("Refreshing client balances for %s failed; they are recomputed when next read", sorted(client_ids))
+        try:
+            # Rows that are missing are refreshed on read by client_balances.
+            ClientBalance.objects.filter(client_id__in=client_ids).delete()
+        except Exception:
+            logger.exception("Could not drop stale client balances for %s", sorted(client_ids))
@@ -0,0 +1,256 @@
+"""Versioned cache for report responses.
+
+Entries are keyed on the report name, its normalized query parameters, today's
+date and the current data version. The version is the Postgres sequence
+``reports_version_seq``: receivables writes that change a report advance it
+once their transaction commits (see ``reports.signals``), and entries for
+older versions are never read again. Nothing is written to a table, so
+concurrent writers do not queue behind one another on a shared row.
+
+Entries live in a per-process, size-bounded LRU store: in memory, or as files
+on a shared directory (``REPORT_CACHE_BACKEND``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.response import Response
+
+from common.utils import on_commit_queued
+from .exports import wants_export
+
+_local = threading.local()
+
+
+def bump_report_version() -> None:
+    """Invalidate every cached report once the current transaction commits.
+
+    Writes within one transaction share a single bump, and a rolled-back
+    transaction bumps nothing.
+    """
+
+    if getattr(_local, "bump", False) and on_commit_queued(_advance_version):
+        return
+    _local.bump = True
+    transaction.on_commit(_advance_version)
+
+
+def _advance_version() -> None:
+    if not getattr(_local, "bump", False):
+        return
+    _local.bump = False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval('reports_version_seq')")
+
+
+def current_report_version() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT last_value FROM reports_version_seq")
+        return cursor.fetchone()[0]
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class MemoryReportCache:
+    """Least-recently-used entries held in this process, at most ``max_entries``."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.metrics = CacheMetrics()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                self.metrics.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics.hits += 1
+            return self._entries[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self.metrics.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.metrics.as_dict(), "backend": self.backend, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class FileReportCache(MemoryReportCache):
+    """Pickled entries in ``directory``, shared by processes on the same host.
+
+    Reads touch the file's mtime, and the oldest files are evicted once there
+    are more than ``max_entries``.
+    """
+
+    backend = "file"
+
+    def __init__(self, max_entries: int, directory: str):
+        super().__init__(max_entries)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                value = pickle.load(handle)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.metrics.misses += 1
+            return None
+        with self._lock:
+            self.metrics.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as temp:
+            pickle.dump(value, temp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._path(key))
+        with self._lock:
+            self.metrics.stores += 1
+        self._evict()
+
+    def _files(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pickle")]
+
+    def _evict(self) -> None:
+        files = self._files()
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[: len(files) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self.metrics.evictions += 1
+
+    def clear(self) -> None:
+        for entry in self._files():
+            os.remove(entry.path)
+
+    def __len__(self) -> int:
+        return len(self._files())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = self.metrics.as_dict()
+        return {**metrics, "backend": self.backend, "entries": len(self), "max_entries": self.max_entries}
+
+
+class DisabledReportCache(MemoryReportCache):
+    backend = "none"
+
+    def __init__(self):
+        super().__init__(max_entries=0)
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Return the process-wide report cache, creating it from settings on first use."""
+
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = settings.REPORT_CACHE_BACKEND
+            if backend == "memory":
+                _cache = MemoryReportCache(settings.REPORT_CACHE_MAX_ENTRIES)
+            elif backend == "file":
+                _cache = FileReportCache(settings.REPORT_CACHE_MAX_ENTRIES, settings.REPORT_CACHE_DIR)
+            elif backend == "none":
+                _cache = DisabledReportCache()
+            else:
+                raise ValueError(f"Unknown REPORT_CACHE_BACKEND '{backend}'")
+        return _cache
+
+
+@receiver(setting_changed)
+def _reset_report_cache(setting, **kwargs):
+    global _cache
+    if setting.startswith("REPORT_CACHE_"):
+        with _cache_lock:
+            _cache = None
+
+
+def report_cache_key(name: str, request) -> str:
+    params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    raw = repr((name, params, timezone.localdate().isoformat(), current_report_version()))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cached_report(name: str):
+    """Serve a report view's successful JSON responses from the report cache.
+
+    Streaming exports bypass the cache.
+    """
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            if wants_export(request):
+                return get(self, request, *args, **kwargs)
+            cache = get_report_cache()
+            key = report_cache_key(name, request)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = get(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,78 @@
+"""Dashboard figures, computed in a fixed handful of queries.
+
+Recent rows are fetched as flat values (no nested items or allocations), and
+totals are grouped in the database, so the cost does not grow with the number
+of statements or payments returned by the list endpoints.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict
+
+from django.db.models import Count, F, Sum
+
+from payments.models import Payment
+from statements.models import BillingStatement
+
+RECENT_ROWS = 5
+
+# Same statuses as the collections register.
+COLLECTED_STATUSES = [Payment.Status.POSTED, Payment.Status.VERIFIED]
+
+
+def _recent_statements():
+    # Newest first along statement_created_keyset_idx, so only RECENT_ROWS index entries are read.
+    return list(
+        BillingStatement.objects.order_by("-created_at", "-id").values(
+            "id", "number", "period", "status", "client_id", "client__name", "due_date", "balance", "created_at"
+        )[:RECENT_ROWS]
+    )
+
+
+def _recent_payments():
+    # Same order as payment_keyset_idx, so the newest rows are read off the index rather than sorted.
+    return list(
+        Payment.objects.with_allocation_totals()
+        .annotate(unallocated_total=F("amount_received") - F("allocated_total"))
+        .order_by("-payment_date", "-created_at", "-id")
+        .values("id", "client_id", "client__name", "payment_date", "amount_received", "method", "status", "unallocated_total")[:RECENT_ROWS]
+    )
+
+
+def _statement_totals() -> Dict[str, Dict[str, Any]]:
+    rows = BillingStatement.objects.values("status").annotate(count=Count("id"), sub_total=Sum("sub_total"), balance=Sum("balance")).order_by()
+    totals = {status: {"count": 0, "sub_total": Decimal("0.00"), "balance": Decimal("0.00")} for status in BillingStatement.Status.values}
+    for row in rows:
+        totals[row.pop("status")] = row
+    return totals
+
+
+def _payment_totals() -> Dict[str, Dict[str, Any]]:
+    rows = Payment.objects.values("status").annotate(count=Count("id"), amount=Sum("amount_received")).order_by()
+    totals = {status: {"count": 0, "amount": Decimal("0.00")} for status in Payment.Status.values}
+    for row in rows:
+        totals[row.pop("status")] = row
+    return totals
+
+
+def dashboard_summary(today: date) -> Dict[str, Any]:
+    month_start = today.replace(day=1)
+    collections = Payment.objects.filter(
+        status__in=COLLECTED_STATUSES, payment_date__gte=month_start, payment_date__lte=today
+    ).aggregate(count=Count("id"), amount=Sum("amount_received"))
+    statements = _statement_totals()
+    return {
+        "as_of": today,
+        "recent_statements": _recent_statements(),
+        "recent_payments": _recent_payments(),
+        "statements_by_status": statements,
+        "payments_by_status": _payment_totals(),
+        "month_collections": {
+            "start": month_start,
+            "count": collections["count"],
+            "amount": collections["amount"] or Decimal("0.00"),
+        },
+        "pending_review": statements[BillingStatement.Status.PENDING_REVIEW]["count"],
+    }
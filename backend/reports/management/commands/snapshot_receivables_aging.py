@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports.aging import refresh_aging_snapshot
+from reports.balances import refresh_client_balances
+
+
+class Command(BaseCommand):
+    help = "Write today's receivables aging snapshot per client and re-age the client balance summaries; earlier snapshots are kept as history."
+
+    def handle(self, *args, **options):
+        as_of = timezone.localdate()
+        rows = refresh_aging_snapshot(as_of)
+        balances = refresh_client_balances(as_of=as_of)
+        self.stdout.write(self.style.SUCCESS(f"Aging snapshot for {as_of}: {rows} client(s); {balances} balance summaries re-aged"))
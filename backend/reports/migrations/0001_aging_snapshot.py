@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('as_of', models.DateField()),
+                ('bucket_0_30', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('bucket_31_60', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('bucket_61_90', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('bucket_90_plus', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aging_snapshots', to='clients.client')),
+            ],
+            options={
+                'ordering': ('-as_of', 'client_id'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='agingsnapshot',
+            constraint=models.UniqueConstraint(fields=('as_of', 'client'), name='unique_aging_snapshot_per_client'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_aging_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # Called once so last_value moves on the first bump.
+            sql="CREATE SEQUENCE IF NOT EXISTS reports_version_seq; SELECT nextval('reports_version_seq');",
+            reverse_sql="DROP SEQUENCE IF EXISTS reports_version_seq;",
+        ),
+    ]
@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('reports', '0002_report_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientBalance',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='clients.client')),
+                ('as_of', models.DateField()),
+                ('open_ar', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('current', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('overdue_1_30', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('overdue_31_60', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('overdue_61_90', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('overdue_90_plus', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('unapplied_credit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('last_payment_date', models.DateField(blank=True, null=True)),
+                ('active_engagements', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ('client_id',),
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import models
+
+from common.models import TimeStampedModel
+
+
+class AgingSnapshot(TimeStampedModel):
+    """Receivables aging for one client as of one date.
+
+    The nightly snapshot keeps history; today's rows are refreshed per client as
+    statements and allocations change.
+    """
+
+    BUCKET_FIELDS = {
+        "0-30": "bucket_0_30",
+        "31-60": "bucket_31_60",
+        "61-90": "bucket_61_90",
+        "90+": "bucket_90_plus",
+    }
+
+    as_of = models.DateField()
+    client = models.ForeignKey("clients.Client", on_delete=models.CASCADE, related_name="aging_snapshots")
+    bucket_0_30 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    bucket_31_60 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    bucket_61_90 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    bucket_90_plus = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        ordering = ("-as_of", "client_id")
+        constraints = [models.UniqueConstraint(fields=["as_of", "client"], name="unique_aging_snapshot_per_client")]
+
+    def __str__(self):  # pragma: no cover
+        return f"Aging {self.as_of} {self.client_id}"
+
+
+class ClientBalance(TimeStampedModel):
+    """One client's receivables summary, refreshed by the writes that change it.
+
+    Overdue buckets are aged against ``as_of``; rows from an earlier day are
+    re-aged when read or by the nightly snapshot. See ``reports.balances``.
+    """
+
+    OVERDUE_FIELDS = {
+        "current": "current",
+        "1-30": "overdue_1_30",
+        "31-60": "overdue_31_60",
+        "61-90": "overdue_61_90",
+        "90+": "overdue_90_plus",
+    }
+
+    client = models.OneToOneField("clients.Client", on_delete=models.CASCADE, primary_key=True, related_name="balance")
+    as_of = models.DateField()
+    open_ar = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    current = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    overdue_1_30 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    overdue_31_60 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    overdue_61_90 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    overdue_90_plus = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    unapplied_credit = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    last_payment_date = models.DateField(null=True, blank=True)
+    active_engagements = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("client_id",)
+
+    def __str__(self):  # pragma: no cover
+        return f"Balance {self.client_id} {self.open_ar}"
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation, UnappliedCredit
+from statements.models import BillingStatement
+from statements.signals import statements_changed
+from .aging import mark_aging_dirty
+from .balances import mark_balances_dirty
+from .cache import bump_report_version
+
+# Writes to these models change what some report returns.
+REPORTED_MODELS = (BillingStatement, Payment, PaymentAllocation, UnappliedCredit, Engagement, Client)
+
+# Columns the client summary and today's aging read; saves limited to other columns leave both as they were.
+SUMMARY_FIELDS = {
+    BillingStatement: frozenset({"client", "client_id", "status", "balance", "due_date"}),
+    Payment: frozenset({"client", "client_id", "status", "payment_date"}),
+    UnappliedCredit: frozenset({"client", "client_id", "status", "amount"}),
+    Engagement: frozenset({"client", "client_id", "status"}),
+}
+
+# Bookkeeping columns no report reads: PDF render state, free-text notes and who touched a row.
+UNREPORTED_FIELDS = frozenset({"pdf_path", "idempotency_hash", "notes", "updated_by", "updated_at"})
+
+
+@receiver(post_save, sender=BillingStatement)
+@receiver(post_delete, sender=BillingStatement)
+def statement_saved(sender, instance: BillingStatement, update_fields=None, **kwargs):
+    if update_fields is None or update_fields & SUMMARY_FIELDS[sender]:
+        mark_aging_dirty([instance.client_id])
+        mark_balances_dirty([instance.client_id])
+
+
+@receiver(statements_changed)
+def statements_bulk_changed(sender, client_ids, **kwargs):
+    mark_aging_dirty(client_ids)
+    mark_balances_dirty(client_ids)
+    bump_report_version()
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+@receiver(post_save, sender=UnappliedCredit)
+@receiver(post_delete, sender=UnappliedCredit)
+@receiver(post_save, sender=Engagement)
+@receiver(post_delete, sender=Engagement)
+def client_summary_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or update_fields & SUMMARY_FIELDS[sender]:
+        mark_balances_dirty([instance.client_id])
+
+
+def reported_model_changed(sender, update_fields=None, **kwargs):
+    if update_fields is None or not update_fields <= UNREPORTED_FIELDS:
+        bump_report_version()
+
+
+for model in REPORTED_MODELS:
+    post_save.connect(reported_model_changed, sender=model, dispatch_uid=f"report-version-save-{model._meta.label}")
+    post_delete.connect(reported_model_changed, sender=model, dispatch_uid=f"report-version-delete-{model._meta.label}")
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from rest_framework import serializers
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
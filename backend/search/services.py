@@ -0,0 +1,116 @@
+"""Ranked search across clients, engagements, statements and payments.
+
+Each entity is matched through its GIN-indexed ``search_vector`` and only its
+best ``limit`` rows are fetched, so a query costs a handful of index lookups
+however large the tables are. Clients also match misspelt names and aliases by
+trigram similarity when ``pg_trgm`` is installed.
+
+Results from different entities are merged by rank, so every score is mapped
+onto one scale: ``ts_rank`` and trigram similarity both go through
+``x / (x + 1)`` (``ts_rank`` normalization 32), which keeps them within 0..0.5.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from django.contrib.postgres.search import SearchRank, TrigramSimilarity
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Lower
+
+from clients.models import Client
+from common.search import ArrayText, prefix_query, trigram_available
+from engagements.models import Engagement
+from payments.models import Payment
+from statements.models import BillingStatement
+
+# ts_rank's rank / (rank + 1) scaling.
+RANK_NORMALIZATION = 32
+
+
+def _rank(query) -> SearchRank:
+    return SearchRank(F("search_vector"), query, normalization=RANK_NORMALIZATION)
+
+
+def _scaled(similarity):
+    return similarity / (similarity + 1)
+
+
+def _clients(text: str, query, limit: int) -> List[Dict[str, Any]]:
+    rank = _rank(query)
+    condition = Q(search_vector=query)
+    clients = Client.objects.all()
+    if trigram_available():
+        # Same expressions as the trigram indexes in clients/migrations/0002_search_vectors.py.
+        needle = text.strip().lower()
+        clients = clients.annotate(alias_text=Lower(ArrayText("aliases")))
+        condition |= Q(normalized_name__trigram_similar=needle) | Q(alias_text__trigram_similar=needle)
+        rank = Greatest(
+            rank, _scaled(TrigramSimilarity("normalized_name", needle)), _scaled(TrigramSimilarity("alias_text", needle))
+        )
+    rows = clients.filter(condition).annotate(rank=rank).order_by("-rank", "name").only("id", "name", "status")[:limit]
+    return [
+        {"type": "client", "id": row.id, "label": row.name, "detail": row.get_status_display(), "rank": row.rank}
+        for row in rows
+    ]
+
+
+def _engagements(query, limit: int) -> List[Dict[str, Any]]:
+    rows = (
+        Engagement.objects.filter(search_vector=query)
+        .annotate(rank=_rank(query))
+        .order_by("-rank", "title")
+        .values("id", "title", "client__name", "rank")[:limit]
+    )
+    return [
+        {"type": "engagement", "id": row["id"], "label": row["title"], "detail": row["client__name"], "rank": row["rank"]}
+        for row in rows
+    ]
+
+
+def _statements(query, limit: int) -> List[Dict[str, Any]]:
+    rows = (
+        BillingStatement.objects.filter(search_vector=query)
+        .annotate(rank=_rank(query))
+        .order_by("-rank", "-id")
+        .values("id", "number", "period", "status", "client__name", "rank")[:limit]
+    )
+    return [
+        {
+            "type": "statement",
+            "id": row["id"],
+            "label": row["number"] or f"Draft {row['period']}",
+            "detail": f"{row['client__name']} · {row['period']} · {row['status']}",
+            "rank": row["rank"],
+        }
+        for row in rows
+    ]
+
+
+def _payments(query, limit: int) -> List[Dict[str, Any]]:
+    rows = (
+        Payment.objects.filter(search_vector=query)
+        .annotate(rank=_rank(query))
+        .order_by("-rank", "-id")
+        .values("id", "manual_invoice_no", "payment_date", "amount_received", "client__name", "rank")[:limit]
+    )
+    return [
+        {
+            "type": "payment",
+            "id": row["id"],
+            "label": row["manual_invoice_no"],
+            "detail": f"{row['client__name']} · {row['payment_date']} · {row['amount_received']}",
+            "rank": row["rank"],
+        }
+        for row in rows
+    ]
+
+
+def search_all(text: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Best matches for ``text`` across entities, highest rank first (at most ``limit`` per entity)."""
+
+    query = prefix_query(text)
+    if query is None:
+        return []
+    results = _clients(text, query, limit) + _engagements(query, limit) + _statements(query, limit) + _payments(query, limit)
+    return sorted(results, key=lambda row: row["rank"], reverse=True)
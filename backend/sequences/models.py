@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from typing import List
 
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 
 from common.models import TimeStampedUserModel
 
@@ -27,33 +28,59 @@ class Sequence(TimeStampedUserModel):
     def __str__(self):  # pragma: no cover
         return f"{self.name} ({self.code})"
 
-    @transaction.atomic
+    def format_number(self, value: int, year: int) -> str:
+        return f"{self.prefix}{year}-{str(value).zfill(self.padding)}"
+
+    @classmethod
+    def _lock(cls, code: str, actor=None) -> "Sequence":
+        sequence = cls.objects.select_for_update().filter(code=code).first()
+        if sequence is not None:
+            return sequence
+        try:
+            with transaction.atomic():
+                cls.objects.create(code=code, name=f"{code} Sequence", created_by=actor, updated_by=actor)
+        except IntegrityError:
+            pass  # Another issuer created it first; lock theirs.
+        return cls.objects.select_for_update().get(code=code)
+
+    @classmethod
+    def allocate(cls, code: str, count: int = 1, actor=None) -> List[str]:
+        """Hand out ``count`` consecutive numbers from the ``code`` sequence.
+
+        The sequence row is locked with ``SELECT ... FOR UPDATE`` until the caller's
+        transaction ends, so concurrent issuers queue instead of racing, and the
+        increment commits or rolls back together with the caller's writes. Numbers
+        are therefore gapless and never reused as long as they are allocated inside
+        the transaction that stores them (as ``BillingStatement.issue``, the issue
+        endpoint and ``statements.services.issue_statements`` do). Allocating outside such a
+        transaction (e.g. the ``next_number`` preview endpoint) consumes the number.
+        """
+
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        with transaction.atomic():
+            sequence = cls._lock(code, actor)
+            today = timezone.localdate()
+            if sequence.reset_rule == cls.ResetRule.ANNUAL and sequence.last_reset_at and sequence.last_reset_at.year != today.year:
+                sequence.current_value = 0
+                sequence.last_reset_at = today
+            if not sequence.last_reset_at:
+                sequence.last_reset_at = today
+            first = sequence.current_value + 1
+            sequence.current_value += count
+            if actor:
+                sequence.updated_by = actor
+            sequence.save(update_fields=["current_value", "last_reset_at", "updated_by", "updated_at"])
+        return [sequence.format_number(value, today.year) for value in range(first, first + count)]
+
     def next(self) -> str:
-        today = datetime.utcnow().date()
-        if self.reset_rule == self.ResetRule.ANNUAL and self.last_reset_at and self.last_reset_at.year != today.year:
-            self.current_value = 0
-            self.last_reset_at = today
-        self.current_value += 1
-        if not self.last_reset_at:
-            self.last_reset_at = today
-        self.save(update_fields=["current_value", "last_reset_at", "updated_at"])
-        return f"{self.prefix}{today.year}-{str(self.current_value).zfill(self.padding)}"
+        number = self.allocate(self.code)[0]
+        self.refresh_from_db()
+        return number
 
     @classmethod
     def assign_next(cls, code: str, actor=None) -> str:
-        sequence, _ = cls.objects.get_or_create(
-            code=code,
-            defaults={
-                "name": f"{code} Sequence",
-                "created_by": actor,
-                "updated_by": actor,
-            },
-        )
-        if actor and not sequence.created_by:
-            sequence.created_by = actor
-        sequence.updated_by = actor
-        sequence.save(update_fields=["updated_by", "updated_at"])
-        return sequence.next()
+        return cls.allocate(code, actor=actor)[0]
 
 
 @dataclass
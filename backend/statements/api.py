@@ -1,23 +1,30 @@
 from __future__ import annotations
 
 from datetime import date
-from rest_framework import status, viewsets
+from django.db import transaction
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, status, viewsets
 from rest_framework import serializers
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from accounts.permissions import IsAdminOrReviewer
 from audit.utils import log_action
+from common.search import FullTextSearchFilter
 from common.utils import diff_model
-from .models import BillingItem, BillingStatement
+from .models import BillingItem, BillingStatement, PdfRenderJob
 from .serializers import (
     BillingItemSerializer,
     BillingStatementSerializer,
     IssueStatementSerializer,
+    PdfRenderJobSerializer,
     VoidStatementSerializer,
 )
-from .pdf import render_statement_pdf
+from .browser_pool import get_browser_pool
+from .jobs import enqueue_pdf_render, enqueue_stale_pdf_renders
+from .services import issue_statements
 
 
 class BatchIssueSerializer(serializers.Serializer):
@@ -31,12 +38,17 @@ class BatchIssueSerializer(serializers.Serializer):
         return attrs
 
 
+class RefreshPdfsSerializer(serializers.Serializer):
+    period = serializers.RegexField(r"^\d{4}-\d{2}$")
+
+
 class BillingStatementViewSet(viewsets.ModelViewSet):
     serializer_class = BillingStatementSerializer
     queryset = BillingStatement.objects.select_related("client", "engagement").prefetch_related("items")
     permission_classes = [IsAuthenticated]
     filterset_fields = ["client", "engagement", "status", "period"]
-    search_fields = ["number", "client__name", "engagement__title", "notes"]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    search_related = ["client", "engagement"]
     ordering_fields = ["issue_date", "due_date", "sub_total", "balance", "created_at"]
 
     def perform_create(self, serializer):
@@ -69,12 +81,14 @@ class BillingStatementViewSet(viewsets.ModelViewSet):
         issue_date = payload.get("issue_date", date.today())
         due_date = payload["due_date"]
         number = payload.get("number")
-        statement.issue(actor=request.user, issue_date=issue_date, due_date=due_date, number=number)
-        pdf_path = render_statement_pdf(statement)
-        statement.pdf_path = pdf_path
-        statement.save(update_fields=["pdf_path", "updated_at"])
-        log_action(actor=request.user, action="statement.issue", instance=statement, metadata={"pdf_path": pdf_path})
-        return Response(self.get_serializer(statement).data, status=status.HTTP_200_OK)
+        # The number, the render job and the audit entry commit together or not at all.
+        with transaction.atomic():
+            statement.issue(actor=request.user, issue_date=issue_date, due_date=due_date, number=number)
+            job = enqueue_pdf_render(statement, actor=request.user)
+            log_action(actor=request.user, action="statement.issue", instance=statement, metadata={"pdf_job": job.pk})
+        data = self.get_serializer(statement).data
+        data["pdf_job"] = PdfRenderJobSerializer(job).data
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAdminOrReviewer])
     def void(self, request, pk=None):
@@ -90,40 +104,47 @@ class BillingStatementViewSet(viewsets.ModelViewSet):
         serializer = BatchIssueSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
-        statements = BillingStatement.objects.select_related("client", "engagement").filter(id__in=data["statement_ids"])
-
-        issued: list[int] = []
-        skipped: list[int] = []
-        for statement in statements:
-            if statement.status not in {BillingStatement.Status.DRAFT, BillingStatement.Status.PENDING_REVIEW}:
-                skipped.append(statement.id)
-                continue
-            try:
-                statement.issue(actor=request.user, issue_date=data["issue_date"], due_date=data["due_date"])
-                pdf_path = render_statement_pdf(statement)
-                statement.pdf_path = pdf_path
-                statement.save(update_fields=["pdf_path", "updated_at"])
-                log_action(actor=request.user, action="statement.batch_issue", instance=statement, metadata={"batch": True, "pdf_path": pdf_path})
-                issued.append(statement.id)
-            except Exception:  # pragma: no cover - defensive safety
-                skipped.append(statement.id)
-
-        if issued:
-            BillingStatement.objects.filter(id__in=issued).update(status=BillingStatement.Status.ISSUED)
-        return Response({"issued": issued, "skipped": skipped}, status=status.HTTP_200_OK)
+        result = issue_statements(
+            data["statement_ids"],
+            issue_date=data["issue_date"],
+            due_date=data["due_date"],
+            actor=request.user,
+        )
+        return Response(result.as_dict(), status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def refresh_pdf(self, request, pk=None):
         statement = self.get_object()
         if statement.status != BillingStatement.Status.ISSUED:
             return Response({"detail": "Only issued statements have PDFs."}, status=status.HTTP_400_BAD_REQUEST)
-        pdf_path = render_statement_pdf(statement, force_refresh=True)
-        statement.pdf_path = pdf_path
-        statement.updated_by = request.user
-        statement.save(update_fields=["pdf_path", "updated_by", "updated_at"])
-        log_action(actor=request.user, action="statement.refresh_pdf", instance=statement, metadata={"pdf_path": pdf_path})
-        return Response({"pdf_path": pdf_path})
-
+        force = str(request.data.get("force", "")).lower() in {"1", "true", "yes"}
+        job = enqueue_pdf_render(statement, actor=request.user, force_refresh=force)
+        log_action(actor=request.user, action="statement.refresh_pdf", instance=statement, metadata={"pdf_job": job.pk, "force": force})
+        return Response({"pdf_path": statement.pdf_path, "pdf_job": PdfRenderJobSerializer(job).data}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAdminOrReviewer], url_path="refresh-pdfs")
+    def refresh_pdfs(self, request):
+        serializer = RefreshPdfsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        statements = (
+            BillingStatement.objects.select_related("client", "engagement")
+            .prefetch_related("items")
+            .filter(period=serializer.validated_data["period"], status__in=[BillingStatement.Status.ISSUED, BillingStatement.Status.SETTLED])
+        )
+        summary = enqueue_stale_pdf_renders(statements, actor=request.user)
+        return Response(summary, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], url_path="pdf-pool")
+    def pdf_pool(self, request):
+        return Response(get_browser_pool().stats())
+
+
+class PdfRenderJobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    serializer_class = PdfRenderJobSerializer
+    queryset = PdfRenderJob.objects.select_related("billing_statement").all()
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ["billing_statement", "status"]
+    ordering_fields = ["created_at", "finished_at"]
 
 
 class BillingItemViewSet(viewsets.ModelViewSet):
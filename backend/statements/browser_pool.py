@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PDF_OPTIONS: Dict[str, Any] = {
+    "format": "A4",
+    "print_background": True,
+    "margin": {"top": "15mm", "bottom": "15mm", "left": "12mm", "right": "12mm"},
+}
+
+
+@dataclass
+class PoolMetrics:
+    renders: int = 0
+    waits: int = 0
+    restarts: int = 0
+    recycles: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _RenderJob:
+    html: str
+    output_path: str
+    future: Future
+
+
+class PlaywrightDriver:
+    """Owns one Playwright driver process and launches Chromium from it."""
+
+    def __init__(self, launch_options: Dict[str, Any]):
+        from playwright.sync_api import sync_playwright  # Lazy import
+
+        self._launch_options = launch_options
+        self._playwright = sync_playwright().start()
+
+    def launch(self):
+        return self._playwright.chromium.launch(**self._launch_options)
+
+    def stop(self) -> None:
+        self._playwright.stop()
+
+
+class BrowserPool:
+    """Warm Chromium instances shared by every PDF render in this process.
+
+    Playwright's sync API binds a browser to the thread that launched it, so each
+    slot runs on its own thread and pulls render jobs from a shared queue. Every
+    render gets a fresh browser context; browsers are recycled after
+    ``max_renders`` pages and relaunched when they crash.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_renders: int = 200,
+        timeout_ms: int = 30000,
+        driver_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_renders = max(1, max_renders)
+        self.timeout_ms = timeout_ms
+        self._driver_factory = driver_factory or (lambda: PlaywrightDriver(settings.PLAYWRIGHT_LAUNCH_OPTIONS))
+        self._lock = threading.Lock()
+        self._jobs: "queue.Queue[Optional[_RenderJob]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._pid: Optional[int] = None
+        self.metrics = PoolMetrics()
+
+    def render(self, html: str, output_path: str) -> None:
+        """Render ``html`` to ``output_path`` on a pooled browser, blocking until done."""
+
+        self._ensure_started()
+        job = _RenderJob(html=html, output_path=output_path, future=Future())
+        with self._lock:
+            ahead = self._jobs.qsize()
+            if self._idle <= ahead:
+                self.metrics.waits += 1
+        # Twice the page timeout for this render (one retry after a crash), plus the same per round of
+        # queued renders ahead of it, so a slot stuck outside Playwright's timeouts cannot block forever.
+        deadline = time.monotonic() + 2 * self.timeout_ms / 1000 * (1 + ahead // self.size)
+        self._jobs.put(job)
+        while True:
+            try:
+                return job.future.result(timeout=max(0.0, min(1.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                if time.monotonic() >= deadline:
+                    # A slot that has not picked the job up yet will skip it.
+                    job.future.cancel()
+                    with self._lock:
+                        self.metrics.failures += 1
+                    raise TimeoutError(f"PDF render of {output_path} did not finish in time") from None
+                # Revive slots that died (e.g. driver start failure) while we were queued.
+                self._ensure_started()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            data = self.metrics.as_dict()
+            data.update(
+                size=self.size,
+                max_renders=self.max_renders,
+                alive=sum(1 for thread in self._threads if thread.is_alive()),
+                idle=self._idle,
+                queued=self._jobs.qsize(),
+            )
+        return data
+
+    def shutdown(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._pid = None
+        for _ in threads:
+            self._jobs.put(None)
+        for thread in threads:
+            thread.join(timeout=10)
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid() and all(thread.is_alive() for thread in self._threads):
+                return
+            if self._pid != os.getpid():
+                # Threads do not survive a fork; start from a clean slate in the child.
+                self._jobs = queue.Queue()
+                self._threads = []
+                self._idle = 0
+                self.metrics = PoolMetrics()
+                self._pid = os.getpid()
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.size:
+                thread = threading.Thread(
+                    target=self._run_slot,
+                    name=f"pdf-browser-{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run_slot(self) -> None:
+        try:
+            driver = self._driver_factory()
+        except Exception as exc:
+            logger.exception("Unable to start Playwright driver for PDF pool")
+            self._fail_pending(exc)
+            return
+        browser = None
+        renders = 0
+        try:
+            while True:
+                with self._lock:
+                    self._idle += 1
+                job = self._jobs.get()
+                with self._lock:
+                    self._idle -= 1
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    browser = self._render_with_retry(driver, self._ensure_browser(driver, browser), job)
+                except Exception as exc:
+                    with self._lock:
+                        self.metrics.failures += 1
+                    job.future.set_exception(exc)
+                    continue
+                renders += 1
+                with self._lock:
+                    self.metrics.renders += 1
+                job.future.set_result(None)
+                if renders >= self.max_renders:
+                    _close_quietly(browser)
+                    browser = None
+                    renders = 0
+                    with self._lock:
+                        self.metrics.recycles += 1
+        finally:
+            if browser is not None:
+                _close_quietly(browser)
+            try:
+                driver.stop()
+            except Exception:  # pragma: no cover - best effort shutdown
+                logger.warning("Playwright driver did not stop cleanly", exc_info=True)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self.metrics.failures += 1
+            job.future.set_exception(exc)
+
+    def _ensure_browser(self, driver, browser):
+        if browser is not None and _is_connected(browser):
+            return browser
+        if browser is not None:
+            with self._lock:
+                self.metrics.restarts += 1
+            logger.warning("Pooled Chromium disconnected; relaunching")
+        return driver.launch()
+
+    def _render_with_retry(self, driver, browser, job: _RenderJob):
+        try:
+            self._render_page(browser, job)
+            return browser
+        except Exception:
+            if _is_connected(browser):
+                raise
+        # The browser crashed mid-render: relaunch once and retry on a fresh instance.
+        with self._lock:
+            self.metrics.restarts += 1
+        logger.warning("Chromium crashed while rendering %s; retrying", job.output_path)
+        browser = driver.launch()
+        try:
+            self._render_page(browser, job)
+        except Exception:
+            _close_quietly(browser)
+            raise
+        return browser
+
+    def _render_page(self, browser, job: _RenderJob) -> None:
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            page.set_default_timeout(self.timeout_ms)
+            page.set_content(job.html, wait_until="networkidle")
+            page.pdf(path=job.output_path, **PDF_OPTIONS)
+        finally:
+            _close_quietly(context)
+
+
+def _is_connected(browser) -> bool:
+    try:
+        return browser.is_connected()
+    except Exception:  # pragma: no cover - defensive safety
+        return False
+
+
+def _close_quietly(resource) -> None:
+    try:
+        resource.close()
+    except Exception:  # pragma: no cover - best effort cleanup
+        pass
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it from settings on first use."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=settings.PDF_BROWSER_POOL_SIZE,
+                max_renders=settings.PDF_BROWSER_MAX_RENDERS,
+                timeout_ms=settings.PLAYWRIGHT_TIMEOUT_MS,
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from audit.utils import log_action
+from common.jobs import django_process_pool, lock_next_queued
+from .models import BillingStatement, PdfRenderJob
+from .pdf import pdf_is_current, render_statement_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_pdf_render(statement: BillingStatement, actor=None, force_refresh: bool = False) -> PdfRenderJob:
+    """Queue a PDF render for ``statement``, reusing a job that is still waiting."""
+
+    with transaction.atomic():
+        pending = (
+            PdfRenderJob.objects.select_for_update(skip_locked=True)
+            .filter(billing_statement=statement, status=PdfRenderJob.Status.QUEUED)
+            .first()
+        )
+        if pending:
+            if force_refresh and not pending.force_refresh:
+                pending.force_refresh = True
+                pending.save(update_fields=["force_refresh", "updated_at"])
+            return pending
+        return PdfRenderJob.objects.create(
+            billing_statement=statement,
+            force_refresh=force_refresh,
+            created_by=actor,
+            updated_by=actor,
+        )
+
+
+def enqueue_pdf_renders(statements: Iterable[BillingStatement], actor=None, force_refresh: bool = False) -> List[PdfRenderJob]:
+    return [enqueue_pdf_render(statement, actor=actor, force_refresh=force_refresh) for statement in statements]
+
+
+def enqueue_stale_pdf_renders(statements: Iterable[BillingStatement], actor=None) -> Dict[str, int]:
+    """Queue renders only for statements whose PDF no longer matches their inputs.
+
+    Pass a queryset with ``select_related("client", "engagement")`` and
+    ``prefetch_related("items")`` so fingerprinting stays query-free per statement.
+    """
+
+    queued = 0
+    current = 0
+    for statement in statements:
+        if pdf_is_current(statement):
+            current += 1
+            continue
+        enqueue_pdf_render(statement, actor=actor)
+        queued += 1
+    return {"queued": queued, "current": current}
+
+
+def claim_next_job(job_id: Optional[int] = None) -> Optional[PdfRenderJob]:
+    """Mark the oldest renderable job (or ``job_id``) running; jobs still backing off are left queued."""
+
+    with transaction.atomic():
+        ready = PdfRenderJob.objects.filter(
+            Q(run_after__isnull=True) | Q(run_after__lte=timezone.now()), status=PdfRenderJob.Status.QUEUED
+        )
+        job = lock_next_queued(ready, job_id)
+        if job is None:
+            return None
+        job.status = PdfRenderJob.Status.RUNNING
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "attempts", "started_at", "updated_at"])
+    return job
+
+
+def requeue_stale_jobs(older_than: Optional[timedelta] = None) -> int:
+    """Return jobs left `running` by a crashed worker to the queue; returns how many were requeued.
+
+    The crashed run already counted as an attempt when it was claimed, so these
+    jobs back off and fail at ``PDF_JOB_MAX_ATTEMPTS`` like renders that raised;
+    a statement that keeps killing its worker is not retried forever.
+    """
+
+    older_than = older_than or timedelta(seconds=settings.PDF_JOB_STALE_SECONDS)
+    now = timezone.now()
+    with transaction.atomic():
+        stale = list(
+            PdfRenderJob.objects.select_for_update(skip_locked=True).filter(
+                status=PdfRenderJob.Status.RUNNING, started_at__lt=now - older_than
+            )
+        )
+        for job in stale:
+            job.error = "Worker stopped before the render finished"
+            job.updated_at = now
+            if job.attempts < settings.PDF_JOB_MAX_ATTEMPTS:
+                job.status = PdfRenderJob.Status.QUEUED
+                job.run_after = now + retry_delay(job.attempts)
+            else:
+                logger.warning("PDF job %s for statement %s failed after %s attempts", job.pk, job.billing_statement_id, job.attempts)
+                job.status = PdfRenderJob.Status.FAILED
+                job.finished_at = now
+        PdfRenderJob.objects.bulk_update(stale, ["status", "error", "run_after", "finished_at", "updated_at"])
+    return sum(job.status == PdfRenderJob.Status.QUEUED for job in stale)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff before the next attempt: the base delay, doubled per failed attempt."""
+
+    return timedelta(seconds=settings.PDF_JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+
+def process_job(job: PdfRenderJob) -> PdfRenderJob:
+    """Render the job's statement and record the outcome on the job and statement."""
+
+    try:
+        statement = BillingStatement.objects.select_related("client", "engagement", "created_by", "updated_by").get(
+            pk=job.billing_statement_id
+        )
+        pdf_path = render_statement_pdf(statement, force_refresh=job.force_refresh)
+    except Exception as exc:
+        logger.exception("PDF render failed for statement %s (job %s)", job.billing_statement_id, job.pk)
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        if job.attempts < settings.PDF_JOB_MAX_ATTEMPTS:
+            job.status = PdfRenderJob.Status.QUEUED
+            job.run_after = job.finished_at + retry_delay(job.attempts)
+        else:
+            job.status = PdfRenderJob.Status.FAILED
+        job.save(update_fields=["status", "error", "finished_at", "run_after", "updated_at"])
+        return job
+
+    with transaction.atomic():
+        statement.pdf_path = pdf_path
+        statement.save(update_fields=["pdf_path", "updated_at"])
+        job.status = PdfRenderJob.Status.SUCCEEDED
+        job.pdf_path = pdf_path
+        job.error = ""
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "pdf_path", "error", "finished_at", "updated_at"])
+        log_action(
+            actor=job.created_by,
+            action="statement.pdf_rendered",
+            instance=statement,
+            metadata={"pdf_path": pdf_path, "pdf_job": job.pk},
+        )
+    return job
+
+
+def drain_queue(max_jobs: Optional[int] = None) -> int:
+    """Process queued jobs until the queue is empty (or ``max_jobs`` is reached)."""
+
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        process_job(job)
+        processed += 1
+    return processed
+
+
+def _run_claimed_job(job_id: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    job = claim_next_job(job_id)
+    if job is None:
+        # Another worker already picked it up; its status endpoint reports the outcome.
+        return {"job_id": job_id, "status": "claimed_elsewhere", "pdf_path": "", "error": "", "render_ms": 0.0}
+    job = process_job(job)
+    return {
+        "job_id": job_id,
+        "status": job.status,
+        "pdf_path": job.pdf_path,
+        "error": job.error,
+        "render_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def render_jobs_in_parallel(job_ids: List[int], workers: int) -> Dict[int, Dict[str, Any]]:
+    """Fan queued jobs out to a process pool; each process renders on its own browser pool."""
+
+    if not job_ids:
+        return {}
+    with django_process_pool(workers) as executor:
+        return {result["job_id"]: result for result in executor.map(_run_claimed_job, job_ids)}
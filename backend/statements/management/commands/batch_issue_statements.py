@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from statements.models import BillingStatement
+from statements.services import issue_statements
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD") from exc
+
+
+class Command(BaseCommand):
+    help = "Issue draft/pending statements in one batch and render their PDFs across worker processes."
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--period", type=str, help="Issue every draft or pending statement of this YYYY-MM period")
+        target.add_argument("--ids", type=int, nargs="+", help="Statement ids to issue")
+        parser.add_argument("--issue-date", type=str, help="Issue date (YYYY-MM-DD), defaults to today")
+        parser.add_argument("--due-date", type=str, help="Due date (YYYY-MM-DD), defaults to issue date + 15 days")
+        parser.add_argument("--workers", type=int, default=0, help="Render PDFs across N processes (0 = leave them queued)")
+        parser.add_argument("--user", type=str, dest="username", help="Username executing the batch (for audit)")
+
+    def handle(self, *args, **options):
+        username = options.get("username")
+        if not username:
+            raise CommandError("--user is required to attribute audit trail")
+        try:
+            actor = User.objects.get(username=username)
+        except User.DoesNotExist as exc:
+            raise CommandError(f"User '{username}' not found") from exc
+
+        issue_date = _parse_date(options["issue_date"]) if options.get("issue_date") else date.today()
+        due_date = _parse_date(options["due_date"]) if options.get("due_date") else issue_date + timedelta(days=15)
+        if due_date < issue_date:
+            raise CommandError("Due date cannot be earlier than issue date")
+
+        if options.get("ids"):
+            statement_ids = options["ids"]
+        else:
+            statement_ids = list(
+                BillingStatement.objects.filter(
+                    period=options["period"], status__in=BillingStatement.ISSUABLE_STATUSES
+                ).values_list("id", flat=True)
+            )
+
+        result = issue_statements(
+            statement_ids,
+            issue_date=issue_date,
+            due_date=due_date,
+            actor=actor,
+            render_workers=options["workers"],
+        )
+        for outcome in result.outcomes:
+            if outcome.status != "issued" or outcome.detail:
+                self.stdout.write(f"{outcome.statement_id}: {outcome.status} {outcome.detail}".rstrip())
+        summary = {key: len(value) for key, value in result.as_dict().items() if key in {"issued", "skipped", "failed"}}
+        self.stdout.write(self.style.SUCCESS(f"Batch issue completed: {summary} timings={result.timings}"))
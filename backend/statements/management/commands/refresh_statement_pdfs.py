@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from statements.jobs import enqueue_pdf_renders, enqueue_stale_pdf_renders
+from statements.models import BillingStatement
+
+
+class Command(BaseCommand):
+    help = "Queue PDF renders for issued statements of a period whose content changed since the last render."
+
+    def add_arguments(self, parser):
+        parser.add_argument("period", type=str, help="Billing period in YYYY-MM format")
+        parser.add_argument("--force", action="store_true", help="Re-render every PDF even if it is current")
+        parser.add_argument("--user", type=str, dest="username", help="Username requesting the refresh (for audit)")
+
+    def handle(self, *args, **options):
+        actor = None
+        if options.get("username"):
+            try:
+                actor = User.objects.get(username=options["username"])
+            except User.DoesNotExist as exc:
+                raise CommandError(f"User '{options['username']}' not found") from exc
+        statements = (
+            BillingStatement.objects.select_related("client", "engagement")
+            .prefetch_related("items")
+            .filter(period=options["period"], status__in=[BillingStatement.Status.ISSUED, BillingStatement.Status.SETTLED])
+        )
+        if options["force"]:
+            jobs = enqueue_pdf_renders(statements, actor=actor, force_refresh=True)
+            summary = {"queued": len(jobs), "current": 0}
+        else:
+            summary = enqueue_stale_pdf_renders(statements, actor=actor)
+        self.stdout.write(self.style.SUCCESS(f"PDF refresh for {options['period']}: {summary}"))
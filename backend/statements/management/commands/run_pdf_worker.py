@@ -0,0 +1,81 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from statements.jobs import claim_next_job, process_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Drain the statement PDF render queue with N concurrent workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.PDF_WORKER_CONCURRENCY,
+            help="Number of jobs rendered at once (bounded in practice by PDF_BROWSER_POOL_SIZE)",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty")
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1")
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+
+        stop = threading.Event()
+        counts = {"processed": 0, "failed": 0}
+        lock = threading.Lock()
+        workers = [
+            threading.Thread(
+                target=self._work,
+                args=(stop, options["once"], options["poll_interval"], counts, lock),
+                name=f"pdf-worker-{index}",
+                daemon=True,
+            )
+            for index in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        # Jobs orphaned by another worker process crashing are requeued while this one runs.
+        requeue_every = max(settings.PDF_JOB_STALE_SECONDS / 2, 1.0)
+        next_requeue = time.monotonic() + requeue_every
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=1.0)
+                    if time.monotonic() >= next_requeue:
+                        requeued = requeue_stale_jobs()
+                        if requeued:
+                            self.stdout.write(f"Requeued {requeued} stale job(s)")
+                        next_requeue = time.monotonic() + requeue_every
+        except KeyboardInterrupt:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        finally:
+            connections.close_all()
+        self.stdout.write(self.style.SUCCESS(f"PDF worker stopped: {counts}"))
+
+    def _work(self, stop, once, poll_interval, counts, lock):
+        try:
+            while not stop.is_set():
+                job = claim_next_job()
+                if job is None:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+                    continue
+                job = process_job(job)
+                with lock:
+                    counts["processed"] += 1
+                    if job.status == job.Status.FAILED:
+                        counts["failed"] += 1
+        finally:
+            connections.close_all()
@@ -32,7 +32,7 @@ class Migration(migrations.Migration):
                 ('sub_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
                 ('paid_to_date', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
                 ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
-                ('idempotency_hash', models.CharField(blank=True, max_length=255)),
+                ('idempotency_hash', models.CharField(blank=True, help_text="Fingerprint of the last rendered PDF's inputs (see statements.pdf)", max_length=255)),
                 ('client', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='billing_statements', to='clients.client')),
                 ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='statements_billingstatement_created', to=settings.AUTH_USER_MODEL)),
                 ('engagement', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='billing_statements', to='engagements.engagement')),
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statements', '0002_pdfrenderjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='billingstatement',
+            name='number',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name='billingstatement',
+            constraint=models.UniqueConstraint(condition=models.Q(('number', ''), _negated=True), fields=('number',), name='unique_statement_number'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statements', '0003_unique_issued_number'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='billingstatement',
+            index=models.Index(fields=['-issue_date', '-created_at', '-id'], name='statement_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billingstatement',
+            index=models.Index(fields=['-created_at', '-id'], name='statement_created_keyset_idx'),
+        ),
+    ]
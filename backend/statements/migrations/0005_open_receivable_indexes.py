@@ -0,0 +1,31 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Built concurrently so issuing and payments keep writing while the indexes build.
+    atomic = False
+
+    dependencies = [
+        ('statements', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='billingstatement',
+            index=models.Index(condition=models.Q(('balance__gt', 0), ('status__in', ['issued', 'pending_review'])), fields=['due_date'], include=('client', 'balance'), name='statement_open_due_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='billingstatement',
+            index=models.Index(condition=models.Q(('balance__gt', 0), ('status__in', ['issued', 'pending_review'])), fields=['client', 'due_date'], include=('balance',), name='statement_open_client_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='billingstatement',
+            index=models.Index(fields=['client', 'status', '-issue_date', '-created_at', '-id'], name='statement_client_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='billingstatement',
+            index=models.Index(fields=['period', 'status'], name='statement_period_status_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagements', '0003_search_vectors'),
+        ('statements', '0005_open_receivable_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billingstatement',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector(models.Func('number', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector(models.Func('period', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector(models.Func('notes', models.Value('-+'), models.Value('  '), function='translate', output_field=models.TextField()), config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='billingstatement',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='statement_search_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statements', '0006_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdfrenderjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, help_text='Retry backoff: not claimed before this time', null=True),
+        ),
+    ]
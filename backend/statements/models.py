@@ -3,10 +3,13 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Optional
 
-from django.db import models
-from django.db.models import Sum
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import Q, Sum
 
 from common.models import TimeStampedUserModel
+from common.search import weighted_vector
 
 
 class BillingStatement(TimeStampedUserModel):
@@ -17,7 +20,7 @@ class BillingStatement(TimeStampedUserModel):
         VOID = "void", "Void"
         SETTLED = "settled", "Settled"
 
-    number = models.CharField(max_length=50, unique=True, blank=True)
+    number = models.CharField(max_length=50, blank=True)
     client = models.ForeignKey("clients.Client", on_delete=models.PROTECT, related_name="billing_statements")
     engagement = models.ForeignKey("engagements.Engagement", on_delete=models.PROTECT, related_name="billing_statements")
     period = models.CharField(max_length=7, help_text="YYYY-MM")
@@ -30,11 +33,49 @@ class BillingStatement(TimeStampedUserModel):
     sub_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
     paid_to_date = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
-    idempotency_hash = models.CharField(max_length=255, blank=True)
+    idempotency_hash = models.CharField(
+        max_length=255, blank=True, help_text="Fingerprint of the last rendered PDF's inputs (see statements.pdf)"
+    )
+    search_vector = models.GeneratedField(
+        expression=weighted_vector(("number", "A"), ("period", "B"), ("notes", "C")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    ISSUABLE_STATUSES = {Status.DRAFT, Status.PENDING_REVIEW}
+    # Statuses whose balance is owed; aging, client balances and the AR ledger all count these.
+    RECEIVABLE_STATUSES = (Status.ISSUED, Status.PENDING_REVIEW)
 
     class Meta:
         unique_together = ("client", "engagement", "period")
         ordering = ("-issue_date", "-created_at")
+        constraints = [
+            # Drafts share a blank number until issued.
+            models.UniqueConstraint(fields=["number"], condition=~Q(number=""), name="unique_statement_number"),
+        ]
+        indexes = [
+            # Keyset pagination over the default ordering.
+            models.Index(fields=["-issue_date", "-created_at", "-id"], name="statement_keyset_idx"),
+            models.Index(fields=["-created_at", "-id"], name="statement_created_keyset_idx"),
+            # Open receivables (aging, snapshots); partial, so settled history stays out of them.
+            # The condition must match reports.aging.open_receivables (RECEIVABLE_STATUSES) for the planner to use them.
+            models.Index(
+                fields=["due_date"],
+                include=["client", "balance"],
+                condition=Q(balance__gt=0, status__in=["issued", "pending_review"]),
+                name="statement_open_due_idx",
+            ),
+            models.Index(
+                fields=["client", "due_date"],
+                include=["balance"],
+                condition=Q(balance__gt=0, status__in=["issued", "pending_review"]),
+                name="statement_open_client_idx",
+            ),
+            # List filters, in keyset order.
+            models.Index(fields=["client", "status", "-issue_date", "-created_at", "-id"], name="statement_client_status_idx"),
+            models.Index(fields=["period", "status"], name="statement_period_status_idx"),
+            GinIndex(fields=["search_vector"], name="statement_search_idx"),
+        ]
 
     def __str__(self):  # pragma: no cover
         return self.number or f"Draft {self.client.name} {self.period}"
@@ -46,38 +87,63 @@ class BillingStatement(TimeStampedUserModel):
         result = PaymentAllocation.objects.filter(billing_statement=self).aggregate(total=Sum("amount_applied"))
         return result["total"] or Decimal("0.00")
 
+    TOTAL_FIELDS = ["sub_total", "paid_to_date", "balance", "status", "updated_at"]
+    # Maintained by set-based writes (totals, PDF renders) that log no audit entry; see audit.utils.snapshot_at.
+    UNAUDITED_FIELDS = [*TOTAL_FIELDS, "pdf_path", "idempotency_hash"]
+
     def recalculate_totals(self, save: bool = False):
+        if save:
+            from .totals import recalculate_statement_totals
+
+            recalculate_statement_totals([self.pk])
+            self.refresh_from_db(fields=self.TOTAL_FIELDS)
+            return self.balance
         subtotal = self.items.aggregate(total=Sum("line_total"))["total"] or Decimal("0.00")
         allocated = self.total_allocated
         self.sub_total = subtotal
         self.paid_to_date = allocated
         self.balance = subtotal - allocated
-        if save:
-            self.save(update_fields=["sub_total", "paid_to_date", "balance", "updated_at"])
         return self.balance
 
     def mark_settled_if_zero_balance(self, save: bool = True):
-        self.recalculate_totals(save=False)
-        if self.balance <= Decimal("0.00"):
-            self.status = self.Status.SETTLED
-        elif self.status == self.Status.SETTLED:
-            self.status = self.Status.ISSUED
         if save:
-            self.save(update_fields=["status", "sub_total", "paid_to_date", "balance", "updated_at"])
+            self.recalculate_totals(save=True)
+            return
+        self.recalculate_totals(save=False)
+        if self.status not in (self.Status.ISSUED, self.Status.SETTLED):
+            return
+        self.status = self.Status.SETTLED if self.balance <= Decimal("0.00") else self.Status.ISSUED
 
-    def issue(self, actor, issue_date, due_date, number: Optional[str] = None):
-        if self.status not in {self.Status.DRAFT, self.Status.PENDING_REVIEW}:
-            raise ValueError("Only draft or pending statements can be issued")
-        if not number:
-            from sequences.models import Sequence
+    ISSUE_FIELDS = ["number", "issue_date", "due_date", "status", "updated_by", "updated_at"]
+
+    def apply_issue(self, actor, issue_date, due_date, number: str):
+        """Move the statement to issued in memory; callers persist ``ISSUE_FIELDS``."""
 
-            number = Sequence.assign_next("SOA", actor=actor)
+        if self.status not in self.ISSUABLE_STATUSES:
+            raise ValueError("Only draft or pending statements can be issued")
         self.number = number
         self.issue_date = issue_date
         self.due_date = due_date
         self.status = self.Status.ISSUED
         self.updated_by = actor
-        self.save(update_fields=["number", "issue_date", "due_date", "status", "updated_by", "updated_at"])
+
+    def issue(self, actor, issue_date, due_date, number: Optional[str] = None):
+        """Issue under a row lock, allocating the SOA number in the same transaction.
+
+        Concurrent issues of one statement queue on the lock and the later one
+        sees it already issued; a failed save rolls the number back.
+        """
+
+        with transaction.atomic():
+            self.status = type(self).objects.select_for_update().values_list("status", flat=True).get(pk=self.pk)
+            if self.status not in self.ISSUABLE_STATUSES:
+                raise ValueError("Only draft or pending statements can be issued")
+            if not number:
+                from sequences.models import Sequence
+
+                number = Sequence.assign_next("SOA", actor=actor)
+            self.apply_issue(actor, issue_date, due_date, number)
+            self.save(update_fields=self.ISSUE_FIELDS)
 
     def void(self, actor, reason: str):
         if self.status == self.Status.VOID:
@@ -96,13 +162,56 @@ class BillingItem(TimeStampedUserModel):
     unit_price = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
     line_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
 
+    EDITABLE_FIELDS = ["description", "qty", "unit", "unit_price"]
+
     class Meta:
         ordering = ("created_at",)
 
-    def save(self, *args, **kwargs):
+    def calculate_line_total(self) -> Decimal:
         self.line_total = (self.qty or Decimal("0.00")) * (self.unit_price or Decimal("0.00"))
+        return self.line_total
+
+    def save(self, *args, **kwargs):
+        self.calculate_line_total()
         super().save(*args, **kwargs)
-        self.billing_statement.recalculate_totals(save=True)
+        from .totals import mark_totals_dirty
+
+        mark_totals_dirty(self.billing_statement_id)
+
+    def delete(self, *args, **kwargs):
+        statement_id = self.billing_statement_id
+        result = super().delete(*args, **kwargs)
+        from .totals import mark_totals_dirty
+
+        mark_totals_dirty(statement_id)
+        return result
 
     def __str__(self):  # pragma: no cover
         return f"{self.description} — {self.line_total}"
+
+
+class PdfRenderJob(TimeStampedUserModel):
+    """A queued statement PDF render, drained by the `run_pdf_worker` command."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    billing_statement = models.ForeignKey(BillingStatement, on_delete=models.CASCADE, related_name="pdf_jobs")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    force_refresh = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    pdf_path = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    run_after = models.DateTimeField(null=True, blank=True, help_text="Retry backoff: not claimed before this time")
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [models.Index(fields=["status", "created_at"], name="pdf_job_queue_idx")]
+
+    def __str__(self):  # pragma: no cover
+        return f"PDF job {self.pk} ({self.status})"
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.template.loader import get_template, render_to_string
 
+from .browser_pool import get_browser_pool
 from .models import BillingStatement
 
 
@@ -17,17 +21,80 @@ def _relative_to_media(path: Path) -> str:
         return path.name
 
 
-def render_statement_pdf(statement: BillingStatement, force_refresh: bool = False) -> str:
-    """Render an SOA to PDF via Playwright and return its media-relative path."""
+SOA_TEMPLATE = "statements/soa.html"
+
+
+@lru_cache(maxsize=1)
+def _template_version() -> str:
+    source = get_template(SOA_TEMPLATE).template.source
+    digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+    return f"{settings.SOA_TEMPLATE_VERSION}:{digest}"
+
+
+def compute_render_fingerprint(statement: BillingStatement) -> str:
+    """Hash every input the SOA template renders.
+
+    The footer's generation timestamp and author are deliberately left out so that
+    saving a statement without changing its content does not invalidate the PDF.
+    """
+
+    client = statement.client
+    engagement = statement.engagement
+    payload = {
+        "template": _template_version(),
+        "site_name": settings.SITE_NAME,
+        "statement": [
+            statement.number,
+            statement.period,
+            statement.issue_date,
+            statement.due_date,
+            statement.currency,
+            statement.notes,
+            statement.sub_total,
+            statement.paid_to_date,
+            statement.balance,
+        ],
+        "items": [
+            [item.description, item.qty, item.unit, item.unit_price, item.line_total]
+            for item in statement.items.all()
+        ],
+        "client": [
+            client.name,
+            client.billing_address,
+            client.tin,
+            client.branding_header_note,
+            client.branding_logo.name if client.branding_logo else "",
+        ],
+        "engagement": [engagement.title, engagement.type, engagement.status],
+    }
+    raw = json.dumps(payload, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
 
+
+def _output_path(statement: BillingStatement) -> Path:
     media_root = Path(settings.MEDIA_ROOT)
     base_dir = Path(settings.PLAYWRIGHT_STORAGE_PATH) if settings.PLAYWRIGHT_STORAGE_PATH else media_root / "pdf"
-    output_dir = base_dir / "statements"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return base_dir / "statements" / f"{statement.number or f'draft-{statement.pk}'}.pdf"
+
+
+def pdf_is_current(statement: BillingStatement, fingerprint: str | None = None) -> bool:
+    """True when the statement's PDF exists and was rendered from its current inputs."""
+
+    fingerprint = fingerprint or compute_render_fingerprint(statement)
+    return statement.idempotency_hash == fingerprint and _output_path(statement).exists()
+
 
-    filename = f"{statement.number or f'draft-{statement.pk}'}.pdf"
-    output_path = output_dir / filename
-    if output_path.exists() and not force_refresh:
+def render_statement_pdf(statement: BillingStatement, force_refresh: bool = False) -> str:
+    """Render an SOA to PDF on the warm browser pool and return its media-relative path.
+
+    Rendering is skipped when the existing PDF's fingerprint (stored in
+    ``idempotency_hash``) matches the statement's current render inputs.
+    """
+
+    output_path = _output_path(statement)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fingerprint = compute_render_fingerprint(statement)
+    if not force_refresh and pdf_is_current(statement, fingerprint):
         return _relative_to_media(output_path)
 
     context: Dict[str, Any] = {
@@ -38,20 +105,10 @@ def render_statement_pdf(statement: BillingStatement, force_refresh: bool = Fals
         "generated_by": statement.updated_by or statement.created_by,
         "site_name": settings.SITE_NAME,
     }
-    html = render_to_string("statements/soa.html", context)
-
-    from playwright.sync_api import sync_playwright  # Lazy import
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(**settings.PLAYWRIGHT_LAUNCH_OPTIONS)
-        page = browser.new_page()
-        page.set_content(html, wait_until="networkidle")
-        page.pdf(
-            path=str(output_path),
-            format="A4",
-            print_background=True,
-            margin={"top": "15mm", "bottom": "15mm", "left": "12mm", "right": "12mm"},
-        )
-        browser.close()
+    html = render_to_string(SOA_TEMPLATE, context)
+
+    get_browser_pool().render(html, str(output_path))
+    statement.idempotency_hash = fingerprint
+    BillingStatement.objects.filter(pk=statement.pk).update(idempotency_hash=fingerprint)
 
     return _relative_to_media(output_path)
@@ -4,10 +4,11 @@ from datetime import date
 from typing import List
 
 from django.conf import settings
-from django.db import transaction
 from rest_framework import serializers
 
-from .models import BillingItem, BillingStatement
+from .models import BillingItem, BillingStatement, PdfRenderJob
+from .services import create_statement_items, sync_statement_items
+from .totals import deferred_totals
 
 
 class BillingItemSerializer(serializers.ModelSerializer):
@@ -27,8 +28,14 @@ class BillingItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "billing_statement", "line_total", "created_at", "updated_at"]
 
 
+class StatementItemSerializer(BillingItemSerializer):
+    """Nested line item; send ``id`` to keep an existing item on update."""
+
+    id = serializers.IntegerField(required=False)
+
+
 class BillingStatementSerializer(serializers.ModelSerializer):
-    items = BillingItemSerializer(many=True, required=False)
+    items = StatementItemSerializer(many=True, required=False)
     client_name = serializers.CharField(source="client.name", read_only=True)
     engagement_title = serializers.CharField(source="engagement.title", read_only=True)
     status_display = serializers.CharField(source="get_status_display", read_only=True)
@@ -81,31 +88,55 @@ class BillingStatementSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(settings.MEDIA_URL + obj.pdf_path)
         return settings.MEDIA_URL + obj.pdf_path
 
-    @transaction.atomic
     def create(self, validated_data):
         items_data: List[dict] = validated_data.pop("items", [])
-        statement = BillingStatement.objects.create(**validated_data)
-        for item in items_data:
-            BillingItem.objects.create(billing_statement=statement, **item)
-        statement.recalculate_totals(save=True)
+        with deferred_totals():
+            statement = BillingStatement.objects.create(**validated_data)
+            create_statement_items(statement, items_data, actor=validated_data.get("created_by"))
+        statement.refresh_from_db(fields=BillingStatement.TOTAL_FIELDS)
         return statement
 
-    @transaction.atomic
     def update(self, instance: BillingStatement, validated_data):
         if instance.status == BillingStatement.Status.ISSUED and self.partial is False:
             raise serializers.ValidationError("Issued statements cannot be edited; void and reissue instead.")
         items_data = validated_data.pop("items", None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        if items_data is not None:
-            instance.items.all().delete()
-            for item in items_data:
-                BillingItem.objects.create(billing_statement=instance, **item)
-        instance.recalculate_totals(save=True)
+        with deferred_totals():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            if items_data is not None:
+                try:
+                    sync_statement_items(instance, items_data, actor=validated_data.get("updated_by"))
+                except ValueError as exc:
+                    raise serializers.ValidationError({"items": str(exc)})
+        instance.refresh_from_db(fields=BillingStatement.TOTAL_FIELDS)
         return instance
 
 
+class PdfRenderJobSerializer(serializers.ModelSerializer):
+    billing_statement_number = serializers.CharField(source="billing_statement.number", read_only=True)
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+
+    class Meta:
+        model = PdfRenderJob
+        fields = [
+            "id",
+            "billing_statement",
+            "billing_statement_number",
+            "status",
+            "status_display",
+            "force_refresh",
+            "attempts",
+            "pdf_path",
+            "error",
+            "started_at",
+            "finished_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class IssueStatementSerializer(serializers.Serializer):
     issue_date = serializers.DateField(default=date.today)
     due_date = serializers.DateField()
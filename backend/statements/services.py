@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence as SequenceType
+
+from django.utils import timezone
+
+from accounts.models import User
+from audit.utils import buffered_audit, log_action
+from .jobs import render_jobs_in_parallel
+from .models import BillingItem, BillingStatement, PdfRenderJob
+from .signals import statements_changed
+from .totals import mark_totals_dirty
+
+
+@dataclass
+class IssueOutcome:
+    statement_id: int
+    status: str
+    number: str = ""
+    detail: str = ""
+    pdf_job: Optional[int] = None
+    pdf_path: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        # Only PDFs rendered during the call are timed; queued ones have nothing to report.
+        if not self.timings:
+            del data["timings"]
+        return data
+
+
+@dataclass
+class BatchIssueResult:
+    outcomes: List[IssueOutcome]
+    timings: Dict[str, float]
+
+    def ids_with_status(self, status: str) -> List[int]:
+        return [outcome.statement_id for outcome in self.outcomes if outcome.status == status]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "issued": self.ids_with_status("issued"),
+            "skipped": self.ids_with_status("skipped"),
+            "failed": self.ids_with_status("failed"),
+            "results": [outcome.as_dict() for outcome in self.outcomes],
+            "timings": self.timings,
+        }
+
+
+class _Stopwatch:
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self.timings[f"{name}_ms"] = round((now - self._started) * 1000, 1)
+        self._started = now
+
+
+def _build_item(statement: BillingStatement, data: Dict[str, Any], actor: Optional[User]) -> BillingItem:
+    item = BillingItem(billing_statement=statement, created_by=actor, updated_by=actor, **data)
+    item.calculate_line_total()
+    return item
+
+
+def create_statement_items(statement: BillingStatement, items_data: List[Dict[str, Any]], actor: Optional[User] = None) -> List[BillingItem]:
+    """Insert line items in one query and mark the statement's totals dirty."""
+
+    if not items_data:
+        return []
+    items = BillingItem.objects.bulk_create([_build_item(statement, data, actor) for data in items_data])
+    mark_totals_dirty(statement.pk)
+    return items
+
+
+def sync_statement_items(statement: BillingStatement, items_data: List[Dict[str, Any]], actor: Optional[User] = None) -> Dict[str, int]:
+    """Make the statement's line items match ``items_data``.
+
+    Entries with an ``id`` update that item (only if a field changed), entries without
+    one are created, and existing items left out of the payload are deleted.
+    """
+
+    existing = {item.pk: item for item in statement.items.all()}
+    to_create: List[BillingItem] = []
+    to_update: List[BillingItem] = []
+    kept = set()
+    now = timezone.now()
+    for data in items_data:
+        data = dict(data)
+        item_id = data.pop("id", None)
+        if item_id is None:
+            to_create.append(_build_item(statement, data, actor))
+            continue
+        item = existing.get(item_id)
+        if item is None:
+            raise ValueError(f"Item {item_id} does not belong to this statement")
+        kept.add(item_id)
+        if all(getattr(item, name) == value for name, value in data.items()):
+            continue
+        for name, value in data.items():
+            setattr(item, name, value)
+        item.calculate_line_total()
+        item.updated_by = actor
+        item.updated_at = now
+        to_update.append(item)
+
+    removed = [pk for pk in existing if pk not in kept]
+    if removed:
+        BillingItem.objects.filter(pk__in=removed).delete()
+    if to_update:
+        BillingItem.objects.bulk_update(to_update, BillingItem.EDITABLE_FIELDS + ["line_total", "updated_by", "updated_at"])
+    if to_create:
+        BillingItem.objects.bulk_create(to_create)
+    if removed or to_update or to_create:
+        mark_totals_dirty(statement.pk)
+    return {"created": len(to_create), "updated": len(to_update), "deleted": len(removed)}
+
+
+def reserve_statement_numbers(count: int, actor: User) -> List[str]:
+    """Reserve ``count`` SOA numbers inside the caller's transaction."""
+
+    from sequences.models import Sequence
+
+    if count == 0:
+        return []
+    return Sequence.allocate("SOA", count, actor=actor)
+
+
+def issue_statements(
+    statement_ids: SequenceType[int],
+    *,
+    issue_date: date,
+    due_date: date,
+    actor: User,
+    render_workers: int = 0,
+) -> BatchIssueResult:
+    """Issue many statements at once.
+
+    Numbers for the whole batch are reserved up front, and every state transition is
+    committed in one transaction together with its PDF render job, so a failure
+    leaves no statement half-issued or unqueued. The jobs are left to the
+    background worker, or rendered right away across ``render_workers`` processes
+    when given.
+    """
+
+    watch = _Stopwatch()
+    outcomes: Dict[int, IssueOutcome] = {}
+    requested = list(dict.fromkeys(statement_ids))
+
+    try:
+        with buffered_audit():
+            statements = list(
+                BillingStatement.objects.select_for_update(of=("self",))
+                .select_related("client", "engagement")
+                .filter(id__in=requested)
+                .order_by("id")
+            )
+            watch.lap("lock")
+            found = {statement.id for statement in statements}
+            for statement_id in requested:
+                if statement_id not in found:
+                    outcomes[statement_id] = IssueOutcome(statement_id, "failed", detail="Statement not found")
+            eligible = []
+            for statement in statements:
+                if statement.status in BillingStatement.ISSUABLE_STATUSES:
+                    eligible.append(statement)
+                else:
+                    outcomes[statement.id] = IssueOutcome(
+                        statement.id,
+                        "skipped",
+                        number=statement.number,
+                        detail=f"Statement is {statement.get_status_display().lower()}",
+                    )
+
+            numbers = reserve_statement_numbers(len(eligible), actor)
+            watch.lap("reserve")
+
+            now = timezone.now()
+            for statement, number in zip(eligible, numbers):
+                statement.apply_issue(actor, issue_date, due_date, number)
+                statement.updated_at = now
+            BillingStatement.objects.bulk_update(eligible, BillingStatement.ISSUE_FIELDS)
+            # Queued in the same transaction, as single issues do, so no statement is issued without a render job.
+            jobs = PdfRenderJob.objects.bulk_create(
+                PdfRenderJob(billing_statement=statement, created_by=actor, updated_by=actor) for statement in eligible
+            )
+            statements_changed.send(
+                sender=BillingStatement,
+                statement_ids=[statement.id for statement in eligible],
+                client_ids={statement.client_id for statement in eligible},
+            )
+            for statement, job in zip(eligible, jobs):
+                log_action(actor=actor, action="statement.batch_issue", instance=statement, metadata={"batch": True})
+                outcomes[statement.id] = IssueOutcome(statement.id, "issued", number=statement.number, pdf_job=job.pk)
+            watch.lap("transition")
+    except Exception as exc:
+        for statement_id in requested:
+            if outcomes.get(statement_id) is None or outcomes[statement_id].status == "issued":
+                outcomes[statement_id] = IssueOutcome(statement_id, "failed", detail=f"Batch rolled back: {exc}")
+        return BatchIssueResult([outcomes[statement_id] for statement_id in requested], watch.timings)
+
+    if render_workers and jobs:
+        results = render_jobs_in_parallel([job.pk for job in jobs], render_workers)
+        for outcome in (outcomes[statement.id] for statement in eligible):
+            result = results[outcome.pdf_job]
+            outcome.pdf_path = result["pdf_path"]
+            outcome.timings["render_ms"] = result["render_ms"]
+            if result["error"]:
+                outcome.detail = f"PDF render failed: {result['error']}"
+        watch.lap("render")
+
+    return BatchIssueResult([outcomes[statement_id] for statement_id in requested], watch.timings)
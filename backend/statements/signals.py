@@ -1,14 +1,8 @@
 from __future__ import annotations
 
-import hashlib
+from django.dispatch import Signal
 
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
-
-from .models import BillingStatement
-
-
-@receiver(pre_save, sender=BillingStatement)
-def set_idempotency_hash(sender, instance: BillingStatement, **kwargs):
-    raw = f"{instance.client_id}:{instance.engagement_id}:{instance.period}:{instance.sub_total}"
-    instance.idempotency_hash = hashlib.sha256(raw.encode()).hexdigest()
+# Sent by bulk paths that bypass model signals (set-based totals, batch issuing, retainer drafts)
+# with ``statement_ids`` they touched and ``client_ids`` whose balances changed. Newly generated
+# drafts are announced with ``created=True``.
+statements_changed = Signal()
@@ -0,0 +1,129 @@
+"""Set-based recalculation of statement totals.
+
+Line items and payment allocations mark their statement dirty instead of
+recalculating it row by row. Outside ``deferred_totals()`` the statement is
+recalculated straight away; inside it, dirty ids are collected and recalculated
+with a single UPDATE just before the block's transaction commits.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Set
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import BillingItem, BillingStatement
+from .signals import statements_changed
+
+_local = threading.local()
+
+_RECALCULATE_SQL = """
+WITH item_totals AS (
+    SELECT billing_statement_id AS id, SUM(line_total) AS total
+    FROM {items}
+    WHERE billing_statement_id = ANY(%(ids)s)
+    GROUP BY billing_statement_id
+),
+allocation_totals AS (
+    SELECT billing_statement_id AS id, SUM(amount_applied) AS total
+    FROM {allocations}
+    WHERE billing_statement_id = ANY(%(ids)s)
+    GROUP BY billing_statement_id
+),
+totals AS (
+    SELECT
+        s.id,
+        COALESCE(i.total, 0) AS sub_total,
+        COALESCE(a.total, 0) AS paid_to_date,
+        COALESCE(i.total, 0) - COALESCE(a.total, 0) AS balance,
+        CASE
+            WHEN s.status NOT IN (%(issued)s, %(settled)s) THEN s.status
+            WHEN COALESCE(i.total, 0) - COALESCE(a.total, 0) <= 0 THEN %(settled)s
+            ELSE %(issued)s
+        END AS status
+    FROM {statements} s
+    LEFT JOIN item_totals i ON i.id = s.id
+    LEFT JOIN allocation_totals a ON a.id = s.id
+    WHERE s.id = ANY(%(ids)s)
+)
+UPDATE {statements} s
+SET sub_total = t.sub_total,
+    paid_to_date = t.paid_to_date,
+    balance = t.balance,
+    status = t.status,
+    updated_at = %(now)s
+FROM totals t
+WHERE s.id = t.id
+  AND (s.sub_total, s.paid_to_date, s.balance, s.status)
+      IS DISTINCT FROM (t.sub_total, t.paid_to_date, t.balance, t.status)
+RETURNING s.id, s.client_id
+"""
+
+
+def recalculate_statement_totals(statement_ids: Iterable[int]) -> List[int]:
+    """Recompute totals and settled status for ``statement_ids`` in one UPDATE.
+
+    Issued statements with nothing left to pay become settled, and settled ones
+    that owe money again go back to issued; other statuses are left alone. Rows
+    whose values are already correct are not touched. Returns the ids updated.
+    """
+
+    from payments.models import PaymentAllocation  # Lazy import to avoid circular
+
+    ids = sorted({int(pk) for pk in statement_ids if pk is not None})
+    if not ids:
+        return []
+    sql = _RECALCULATE_SQL.format(
+        statements=BillingStatement._meta.db_table,
+        items=BillingItem._meta.db_table,
+        allocations=PaymentAllocation._meta.db_table,
+    )
+    params = {
+        "ids": ids,
+        "issued": BillingStatement.Status.ISSUED,
+        "settled": BillingStatement.Status.SETTLED,
+        "now": timezone.now(),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    statements_changed.send(sender=BillingStatement, statement_ids=ids, client_ids={row[1] for row in rows})
+    return [row[0] for row in rows]
+
+
+def _pending() -> Optional[Set[int]]:
+    return getattr(_local, "pending", None)
+
+
+def mark_totals_dirty(*statement_ids: Optional[int]) -> None:
+    """Flag statements whose items or allocations changed."""
+
+    pending = _pending()
+    if pending is None:
+        recalculate_statement_totals(statement_ids)
+    else:
+        pending.update(pk for pk in statement_ids if pk is not None)
+
+
+@contextmanager
+def deferred_totals() -> Iterator[None]:
+    """Run the block in a transaction and recalculate dirty statements once at the end.
+
+    Nested blocks join the outermost one, which does the single flush.
+    """
+
+    if _pending() is not None:
+        with transaction.atomic():
+            yield
+        return
+
+    _local.pending = set()
+    try:
+        with transaction.atomic():
+            yield
+            recalculate_statement_totals(_local.pending)
+    finally:
+        _local.pending = None
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation
+from reports.models import AgingSnapshot
+from statements.models import BillingItem, BillingStatement
+
+
+# Test transactions never commit, so the report version does not advance between tests.
+@override_settings(REPORT_CACHE_BACKEND="none")
+class AgingSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Run the summary refreshes the setup writes queue, so each test starts with none pending.
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.user = User.objects.create_user(username="aging", password="password123", role=User.Roles.BILLER)
+            cls.today = timezone.localdate()
+            cls.customers = []
+            for name, overdue_days in (("Initech", 10), ("Hooli", 45)):
+                customer = Client.objects.create(name=name, status=Client.Status.ACTIVE)
+                engagement = Engagement.objects.create(
+                    client=customer, type=Engagement.Types.SPECIAL, title="Audit", start_date=cls.today
+                )
+                statement = BillingStatement.objects.create(
+                    client=customer,
+                    engagement=engagement,
+                    period="2025-01",
+                    status=BillingStatement.Status.ISSUED,
+                    due_date=cls.today - timedelta(days=overdue_days),
+                    created_by=cls.user,
+                    updated_by=cls.user,
+                )
+                BillingItem.objects.create(billing_statement=statement, description="Fees", unit_price=Decimal("800.00"))
+                cls.customers.append((customer, statement))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def aging(self, as_of=None):
+        url = "/api/reports/aging/" + (f"?as_of={as_of}" if as_of else "")
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_nightly_snapshot_is_served_instead_of_live_scan(self):
+        live = self.aging()
+        self.assertEqual(live["source"], "live")
+
+        call_command("snapshot_receivables_aging", stdout=StringIO())
+        self.assertEqual(AgingSnapshot.objects.filter(as_of=self.today).count(), 2)
+        snapshot = self.aging()
+        self.assertEqual(snapshot["source"], "snapshot")
+        self.assertEqual(snapshot["buckets"], live["buckets"])
+        self.assertEqual(snapshot["buckets"], {"0-30": Decimal("800.00"), "31-60": Decimal("800.00")})
+
+        tomorrow = self.aging(self.today + timedelta(days=1))
+        self.assertEqual(tomorrow["source"], "live")
+
+    def test_allocation_refreshes_only_todays_rows_for_that_client(self):
+        yesterday = self.today - timedelta(days=1)
+        call_command("snapshot_receivables_aging", stdout=StringIO())
+        AgingSnapshot.objects.update(as_of=yesterday)
+        call_command("snapshot_receivables_aging", stdout=StringIO())
+
+        customer, statement = self.customers[1]
+        payment = Payment.objects.create(
+            client=customer,
+            payment_date=self.today,
+            amount_received=Decimal("300.00"),
+            method=Payment.Method.CASH,
+            manual_invoice_no="INV-200",
+            recorded_by=self.user,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            PaymentAllocation.objects.create(payment=payment, billing_statement=statement, amount_applied=Decimal("300.00"))
+
+        current = AgingSnapshot.objects.get(as_of=self.today, client=customer)
+        self.assertEqual((current.bucket_31_60, current.total), (Decimal("500.00"), Decimal("500.00")))
+        self.assertEqual(AgingSnapshot.objects.get(as_of=yesterday, client=customer).total, Decimal("800.00"))
+        self.assertEqual(self.aging()["buckets"], {"0-30": Decimal("800.00"), "31-60": Decimal("500.00")})
@@ -0,0 +1,188 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from ledger.models import LedgerCheckpoint, LedgerEntry
+from ledger.services import statement_balances_as_of, write_checkpoint
+from payments.models import Payment, PaymentAllocation
+from reports.aging import ledger_aging, live_aging
+from statements.models import BillingItem, BillingStatement
+from statements.totals import deferred_totals
+
+
+@override_settings(REPORT_CACHE_BACKEND="none")
+class ARLedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ledger", password="password123", role=User.Roles.BILLER)
+        self.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        engagement = Engagement.objects.create(
+            client=self.customer, type=Engagement.Types.SPECIAL, title="Audit", start_date=date(2025, 1, 1)
+        )
+        self.statement = BillingStatement.objects.create(
+            client=self.customer, engagement=engagement, period="2025-01", created_by=self.user, updated_by=self.user
+        )
+        BillingItem.objects.create(billing_statement=self.statement, description="Fees", unit_price=Decimal("1000.00"))
+        self.statement.refresh_from_db()
+        self.statement.issue(self.user, issue_date=date(2025, 1, 10), due_date=date(2025, 1, 25), number="SOA-2025-0001")
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def pay(self, amount, paid_on, invoice):
+        payment = Payment.objects.create(
+            client=self.customer,
+            payment_date=paid_on,
+            amount_received=Decimal(amount),
+            method=Payment.Method.CASH,
+            manual_invoice_no=invoice,
+            recorded_by=self.user,
+        )
+        PaymentAllocation.objects.create(payment=payment, billing_statement=self.statement, amount_applied=Decimal(amount))
+        return payment
+
+    def balance(self, as_of):
+        return statement_balances_as_of(as_of).get(self.statement.pk, Decimal("0.00"))
+
+    def test_aging_as_of_a_past_date_ignores_later_payments(self):
+        self.pay("400.00", date(2025, 3, 5), "INV-1")
+
+        february = self.api.get("/api/reports/aging/?as_of=2025-02-28").data
+        self.assertEqual(february["source"], "ledger")
+        self.assertEqual(february["buckets"], {"31-60": Decimal("1000.00")})
+        march = self.api.get("/api/reports/aging/?as_of=2025-03-31").data
+        self.assertEqual(march["buckets"], {"61-90": Decimal("600.00")})
+
+        balances = self.api.get("/api/reports/client-balances/?as_of=2025-02-28").data["rows"]
+        self.assertEqual(balances, [{"client_id": self.customer.pk, "client__name": "Initech", "balance": Decimal("1000.00")}])
+        collections = self.api.get("/api/reports/collections/?basis=ledger&start=2025-03-01").data["rows"]
+        self.assertEqual(collections, [{"payment_date": date(2025, 3, 5), "method": "cash", "total_amount": Decimal("400.00")}])
+
+    def csv_rows(self, url):
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, 200)
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_detail_exports_for_a_past_date_read_the_ledger(self):
+        payment = self.pay("400.00", date(2025, 3, 5), "INV-1")
+        payment.void(self.user, reason="Bounced")
+
+        statements = self.csv_rows("/api/reports/aging/?format=csv&detail=statement&as_of=2025-03-31")
+        self.assertEqual(statements[1], ["Initech", "SOA-2025-0001", "2025-01", "2025-01-25", "61-90", "600.00"])
+        clients = self.csv_rows("/api/reports/aging/?format=csv&detail=client&as_of=2025-02-28")
+        self.assertEqual(clients[1], ["Initech", "", "1000.00", "", "", "1000.00"])
+        # Balances computed in the query start from the latest checkpoint, as statement_balances_as_of does.
+        write_checkpoint(date(2025, 3, 10))
+        statements = self.csv_rows("/api/reports/aging/?format=csv&detail=statement&as_of=2025-03-31")
+        self.assertEqual(statements[1][-1], "600.00")
+
+        collections = self.csv_rows("/api/reports/collections/?format=csv&basis=ledger&detail=statement")
+        self.assertEqual([(row[0], row[6]) for row in collections[1:]], [("2025-03-05", "400.00"), (str(timezone.localdate()), "-400.00")])
+        clients = self.csv_rows("/api/reports/collections/?format=csv&basis=ledger&detail=client&end=2025-03-31")
+        self.assertEqual(clients[1:], [["2025-03-05", "Initech", "cash", "400.00"]])
+
+    def test_rollback_is_appended_not_rewritten(self):
+        payment = self.pay("400.00", date(2025, 3, 5), "INV-1")
+        payment.void(self.user, reason="Bounced")
+
+        kinds = list(LedgerEntry.objects.filter(statement=self.statement).values_list("kind", "amount", "effective_date"))
+        today = timezone.localdate()
+        self.assertEqual(
+            kinds,
+            [
+                (LedgerEntry.Kind.ISSUE, Decimal("1000.00"), date(2025, 1, 10)),
+                (LedgerEntry.Kind.ALLOCATION, Decimal("-400.00"), date(2025, 3, 5)),
+                (LedgerEntry.Kind.REVERSAL, Decimal("400.00"), today),
+            ],
+        )
+        self.assertEqual(self.balance(date(2025, 3, 31)), Decimal("600.00"))
+        self.assertEqual(self.balance(today), Decimal("1000.00"))
+        with self.assertRaises(ValueError):
+            LedgerEntry.objects.first().delete()
+
+    def test_allocation_moved_to_another_payment_is_recorded(self):
+        first = self.pay("400.00", date(2025, 3, 5), "INV-1")
+        second = Payment.objects.create(
+            client=self.customer,
+            payment_date=date(2025, 4, 2),
+            amount_received=Decimal("400.00"),
+            method=Payment.Method.CASH,
+            manual_invoice_no="INV-2",
+            recorded_by=self.user,
+        )
+        # Totals come out unchanged, so only the ledger notices the swap.
+        with deferred_totals():
+            first.allocations.get().delete()
+            moved = PaymentAllocation.objects.create(payment=second, billing_statement=self.statement, amount_applied=Decimal("400.00"))
+
+        today = timezone.localdate()
+        entries = LedgerEntry.objects.filter(statement=self.statement).exclude(kind=LedgerEntry.Kind.ISSUE)
+        self.assertCountEqual(
+            entries.values_list("kind", "amount", "effective_date", "payment_id"),
+            [
+                (LedgerEntry.Kind.ALLOCATION, Decimal("-400.00"), date(2025, 3, 5), first.pk),
+                (LedgerEntry.Kind.REVERSAL, Decimal("400.00"), today, first.pk),
+                (LedgerEntry.Kind.ALLOCATION, Decimal("-400.00"), date(2025, 4, 2), second.pk),
+            ],
+        )
+        self.assertEqual(entries.filter(allocation_id=moved.pk).count(), 1)
+        self.assertEqual(self.balance(date(2025, 3, 31)), Decimal("600.00"))
+
+    def test_editing_the_payment_date_moves_its_allocations(self):
+        payment = self.pay("400.00", date(2025, 3, 5), "INV-1")
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.payment_date = date(2025, 4, 2)
+        payment.save()
+
+        self.assertEqual(self.balance(date(2025, 3, 31)), Decimal("1000.00"))
+        self.assertEqual(self.balance(date(2025, 4, 30)), Decimal("600.00"))
+        collections = self.api.get("/api/reports/collections/?basis=ledger&start=2025-03-01").data["rows"]
+        self.assertEqual(
+            [(row["payment_date"], row["total_amount"]) for row in collections],
+            [(date(2025, 3, 5), Decimal("0.00")), (date(2025, 4, 2), Decimal("400.00"))],
+        )
+
+    def test_void_after_payment_leaves_nothing_outstanding(self):
+        self.pay("400.00", date(2025, 3, 5), "INV-1")
+        self.statement.refresh_from_db()
+        self.statement.void(self.user, reason="Billed in error")
+
+        today = timezone.localdate()
+        void = LedgerEntry.objects.get(statement=self.statement, kind=LedgerEntry.Kind.VOID)
+        self.assertEqual((void.amount, void.effective_date), (Decimal("-600.00"), today))
+        self.assertEqual(self.balance(today), Decimal("0.00"))
+        self.assertEqual(self.balance(date(2025, 3, 31)), Decimal("600.00"))
+        self.assertNotIn(self.statement.pk, statement_balances_as_of(today))
+
+    def test_pending_review_balances_match_live_aging(self):
+        pending = BillingStatement.objects.create(
+            client=self.customer, engagement=self.statement.engagement, period="2025-02", status=BillingStatement.Status.PENDING_REVIEW
+        )
+        BillingItem.objects.create(billing_statement=pending, description="Fees", unit_price=Decimal("250.00"))
+        today = timezone.localdate()
+        self.assertEqual(statement_balances_as_of(today)[pending.pk], Decimal("250.00"))
+        self.assertEqual(ledger_aging(today), live_aging(today))
+
+    def test_backdated_entries_are_carried_into_checkpoints(self):
+        self.pay("400.00", date(2025, 3, 5), "INV-1")
+        call_command("checkpoint_ar_ledger", "--as-of", "2025-03-31", stdout=StringIO())
+        self.assertEqual(LedgerCheckpoint.objects.get(as_of=date(2025, 3, 31)).balance, Decimal("600.00"))
+
+        self.pay("100.00", date(2025, 2, 15), "INV-2")
+        self.assertEqual(LedgerCheckpoint.objects.get(as_of=date(2025, 3, 31)).balance, Decimal("500.00"))
+        self.assertEqual(self.balance(date(2025, 4, 30)), Decimal("500.00"))
+        self.assertEqual(self.balance(date(2025, 2, 20)), Decimal("900.00"))
+
+    def test_backfill_records_statements_issued_before_the_ledger(self):
+        LedgerEntry.objects.all()._raw_delete(LedgerEntry.objects.db)
+        call_command("checkpoint_ar_ledger", "--backfill", "--as-of", "2025-01-31", stdout=StringIO())
+        self.assertEqual(self.balance(date(2025, 1, 31)), Decimal("1000.00"))
+        self.assertEqual(LedgerCheckpoint.objects.get(as_of=date(2025, 1, 31)).balance, Decimal("1000.00"))
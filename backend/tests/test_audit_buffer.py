@@ -0,0 +1,91 @@
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from audit.models import AuditLog, AuditSpoolFile
+from audit.spool import claim, claimed_files, ingest_file
+from audit.utils import buffered_audit, log_action
+from clients.models import Client
+
+
+class AuditBufferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="buffer", password="password123", role=User.Roles.ADMIN)
+        cls.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+
+    def log(self, action):
+        log_action(actor=self.user, action=action, instance=self.customer, metadata={"step": action})
+
+    def test_buffered_entries_are_inserted_together(self):
+        with CaptureQueriesContext(connection) as queries:
+            with buffered_audit():
+                for action in ("client.one", "client.two", "client.three"):
+                    self.log(action)
+                self.assertFalse(AuditLog.objects.exists())
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "audit_auditlog"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(list(AuditLog.objects.order_by("id").values_list("action", flat=True)), ["client.one", "client.two", "client.three"])
+
+    def test_rolled_back_block_writes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with buffered_audit():
+                self.log("client.one")
+                with buffered_audit():
+                    self.log("client.two")
+                raise RuntimeError("boom")
+        self.assertFalse(AuditLog.objects.exists())
+        self.log("client.after")
+        self.assertEqual(AuditLog.objects.get().action, "client.after")
+
+    def test_spooled_entries_are_ingested_with_their_original_time(self):
+        logged_at = timezone.make_aware(datetime(2025, 3, 1, 9, 0))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "audit.spool")
+            with override_settings(AUDIT_LOG_SINK="spool", AUDIT_SPOOL_PATH=path):
+                with self.captureOnCommitCallbacks(execute=True), mock.patch("audit.utils.timezone.now", return_value=logged_at):
+                    with buffered_audit():
+                        self.log("client.one")
+                        self.log("client.two")
+                with self.captureOnCommitCallbacks(execute=True):
+                    with self.assertRaises(RuntimeError), buffered_audit():
+                        self.log("client.rolled_back")
+                        raise RuntimeError("boom")
+            self.assertFalse(AuditLog.objects.exists())
+            with open(path) as handle:
+                self.assertEqual(len(handle.readlines()), 2)
+
+            call_command("ingest_audit_spool", "--path", path, stdout=StringIO())
+            self.assertFalse(os.path.exists(path))
+        entries = list(AuditLog.objects.order_by("id"))
+        self.assertEqual([entry.action for entry in entries], ["client.one", "client.two"])
+        self.assertEqual((entries[0].actor, entries[0].metadata), (self.user, {"step": "client.one"}))
+        self.assertEqual([entry.created_at for entry in entries], [logged_at, logged_at])
+
+    def test_spool_file_left_behind_after_ingest_is_not_loaded_twice(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "audit.spool")
+            with override_settings(AUDIT_LOG_SINK="spool", AUDIT_SPOOL_PATH=path):
+                with self.captureOnCommitCallbacks(execute=True), buffered_audit():
+                    self.log("client.one")
+            claimed = claim(path)
+            with open(claimed) as handle:
+                contents = handle.read()
+            self.assertEqual(ingest_file(claimed), 1)
+
+            # A crash after the commit but before the delete leaves the claimed file in place.
+            with open(claimed, "w") as handle:
+                handle.write(contents)
+            call_command("ingest_audit_spool", "--path", path, stdout=StringIO())
+            self.assertEqual(claimed_files(path), [])
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(AuditSpoolFile.objects.get().entries, 1)
@@ -0,0 +1,98 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+from audit.models import AuditLog
+from audit.utils import log_action, snapshot_at
+from clients.models import Client
+from common.utils import diff_model
+from engagements.models import Engagement
+from statements.models import BillingItem, BillingStatement
+
+
+class CompactAuditDiffTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="differ", password="password123", role=User.Roles.ADMIN)
+        self.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE, created_by=self.user)
+        log_action(actor=self.user, action="client.create", instance=self.customer)
+
+    def entry(self, action):
+        return AuditLog.objects.get(action=action)
+
+    def test_only_changed_fields_are_stored(self):
+        created = self.entry("client.create")
+        self.assertFalse(created.compact)
+        self.assertEqual(created.after["name"], "Initech")
+
+        customer = Client.objects.get(pk=self.customer.pk)
+        customer.status = Client.Status.INACTIVE
+        customer.save()
+        log_action(actor=self.user, action="client.deactivate", instance=customer)
+        customer.name = "Initech Ltd"
+        log_action(actor=self.user, action="client.rename", instance=customer)
+
+        deactivate = self.entry("client.deactivate")
+        self.assertTrue(deactivate.compact)
+        self.assertEqual((deactivate.before, deactivate.after), ({"status": "active"}, {"status": "inactive"}))
+        # The second entry diffs against what the first one recorded, not the original load.
+        self.assertEqual(self.entry("client.rename").after, {"name": "Initech Ltd"})
+
+    def test_explicit_before_is_reduced_to_the_changes(self):
+        before = diff_model(self.customer)
+        self.customer.name = "Initrode"
+        log_action(actor=self.user, action="client.update", instance=self.customer, before=before)
+        update = self.entry("client.update")
+        self.assertEqual((update.before, update.after), ({"name": "Initech"}, {"name": "Initrode"}))
+
+    def test_snapshot_is_rebuilt_from_compact_entries(self):
+        customer = Client.objects.get(pk=self.customer.pk)
+        customer.status = Client.Status.INACTIVE
+        log_action(actor=self.user, action="client.deactivate", instance=customer)
+        first = self.entry("client.create")
+        AuditLog.objects.filter(pk=first.pk).update(created_at=timezone.make_aware(datetime(2024, 1, 1)))
+
+        # updated_by is also written by paths that log nothing, so snapshots leave it out.
+        created = {name: value for name, value in first.after.items() if name != "updated_by"}
+        now = snapshot_at("clients.Client", self.customer.pk)
+        self.assertEqual(now, {**created, "status": "inactive"})
+        self.assertEqual(snapshot_at("clients.Client", self.customer.pk, at=timezone.make_aware(datetime(2024, 6, 1))), created)
+        self.assertIsNone(snapshot_at("clients.Client", self.customer.pk, at=timezone.make_aware(datetime(2000, 1, 1))))
+
+    def test_values_equal_once_stored_are_not_changes(self):
+        engagement = Engagement.objects.create(
+            client=self.customer, type=Engagement.Types.RETAINER, title="Bookkeeping", base_fee="5000.00", start_date=date(2025, 1, 1)
+        )
+        engagement = Engagement.objects.get(pk=engagement.pk)
+        engagement.base_fee = "5000"
+        engagement.billing_day = 15
+        log_action(actor=self.user, action="engagement.update", instance=engagement)
+        self.assertEqual(self.entry("engagement.update").after, {"billing_day": 15})
+
+    def test_snapshot_leaves_out_fields_written_without_an_entry(self):
+        engagement = Engagement.objects.create(
+            client=self.customer, type=Engagement.Types.SPECIAL, title="Audit", start_date=date(2025, 1, 1)
+        )
+        statement = BillingStatement.objects.create(client=self.customer, engagement=engagement, period="2025-01")
+        log_action(actor=self.user, action="statement.create", instance=statement)
+        BillingItem.objects.create(billing_statement=statement, description="Fees", unit_price=Decimal("800.00"))
+
+        snapshot = snapshot_at("statements.BillingStatement", statement.pk)
+        self.assertEqual(snapshot["period"], "2025-01")
+        self.assertFalse(set(BillingStatement.UNAUDITED_FIELDS) & snapshot.keys())
+
+    def test_loaded_values_skip_generated_and_automatic_columns(self):
+        loaded = Client.objects.get(pk=self.customer.pk)._loaded_values
+        self.assertIn("name", loaded)
+        self.assertFalse({"search_vector", "created_at", "updated_at"} & loaded.keys())
+
+    @override_settings(AUDIT_DIFF_MODE="full")
+    def test_full_mode_keeps_whole_snapshots(self):
+        customer = Client.objects.get(pk=self.customer.pk)
+        customer.status = Client.Status.INACTIVE
+        log_action(actor=self.user, action="client.deactivate", instance=customer)
+        entry = self.entry("client.deactivate")
+        self.assertFalse(entry.compact)
+        self.assertEqual(entry.after["name"], "Initech")
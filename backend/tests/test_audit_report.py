@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from audit.models import AuditLog
+
+
+class AuditReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="auditor", password="password123", role=User.Roles.ADMIN)
+        start = timezone.make_aware(datetime(2025, 3, 1, 9, 0))
+        for index in range(6):
+            entry = AuditLog.objects.create(
+                actor=cls.user,
+                action="update" if index % 2 else "issue",
+                entity_type="statements.BillingStatement" if index < 4 else "payments.Payment",
+                entity_id="7" if index < 4 else "3",
+            )
+            # Two entries per day; created_at is auto_now_add, so date them afterwards.
+            AuditLog.objects.filter(pk=entry.pk).update(created_at=start + timedelta(days=index // 2, hours=index % 2))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_cursor_pages_walk_every_entry_newest_first(self):
+        url = "/api/reports/audit/?page_size=4"
+        seen = []
+        while url:
+            page = self.api.get(url).data
+            seen.extend(row["id"] for row in page["results"])
+            url = page["next"]
+        self.assertEqual(seen, list(AuditLog.objects.order_by("-created_at", "-id").values_list("id", flat=True)))
+
+    def test_date_range_and_field_filters(self):
+        rows = self.api.get("/api/reports/audit/?start=2025-03-02&end=2025-03-02").data["results"]
+        self.assertEqual([row["created_at"][:10] for row in rows], ["2025-03-02", "2025-03-02"])
+        rows = self.api.get("/api/reports/audit/?action=issue&entity_type=statements.BillingStatement").data["results"]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(self.api.get("/api/reports/audit/?start=2025-03-05&end=2025-03-01").status_code, 400)
+
+    def test_entity_history_is_chronological(self):
+        history = self.api.get("/api/reports/audit/statement/7/").data
+        self.assertEqual(history["entity_type"], "statements.BillingStatement")
+        self.assertEqual([row["action"] for row in history["results"]], ["issue", "update", "issue", "update"])
+        self.assertEqual(len(self.api.get("/api/reports/audit/payment/3/").data["results"]), 2)
+        self.assertEqual(self.api.get("/api/reports/audit/widget/3/").status_code, 404)
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from audit.models import AuditLog
+from clients.models import Client
+from engagements.models import Engagement
+from statements.models import BillingStatement, PdfRenderJob
+from statements.services import issue_statements
+
+
+class BatchIssueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reviewer", password="password123", role=User.Roles.REVIEWER)
+        client = Client.objects.create(name="Hooli", status=Client.Status.ACTIVE)
+        self.statements = []
+        for index in range(3):
+            engagement = Engagement.objects.create(
+                client=client,
+                type=Engagement.Types.RETAINER,
+                title=f"Retainer {index}",
+                start_date=timezone.now().date(),
+                base_fee=Decimal("1000.00"),
+            )
+            self.statements.append(
+                BillingStatement.objects.create(client=client, engagement=engagement, period="2025-09")
+            )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_batch_issue_reports_per_statement_results(self):
+        already_issued = self.statements[2]
+        already_issued.issue(actor=self.user, issue_date=date(2025, 9, 1), due_date=date(2025, 9, 15))
+
+        response = self.api.post(
+            "/api/billing-statements/batch-issue/",
+            {
+                "statement_ids": [stmt.pk for stmt in self.statements] + [999999],
+                "issue_date": "2025-09-30",
+                "due_date": "2025-10-15",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["issued"], [self.statements[0].pk, self.statements[1].pk])
+        self.assertEqual(response.data["skipped"], [already_issued.pk])
+        self.assertEqual(response.data["failed"], [999999])
+        results = {row["statement_id"]: row for row in response.data["results"]}
+        self.assertEqual(results[already_issued.pk]["detail"], "Statement is issued")
+        self.assertNotIn("timings", results[self.statements[0].pk])
+
+        numbers = set(
+            BillingStatement.objects.filter(pk__in=response.data["issued"]).values_list("number", flat=True)
+        )
+        self.assertEqual(len(numbers), 2)
+        self.assertNotIn("", numbers)
+        self.assertEqual(PdfRenderJob.objects.filter(billing_statement_id__in=response.data["issued"]).count(), 2)
+        self.assertEqual(AuditLog.objects.filter(action="statement.batch_issue").count(), 2)
+
+    def test_statements_stay_unissued_when_their_render_jobs_cannot_be_queued(self):
+        with mock.patch.object(PdfRenderJob.objects, "bulk_create", side_effect=RuntimeError("queue down")):
+            result = issue_statements(
+                [stmt.pk for stmt in self.statements], issue_date=date(2025, 9, 30), due_date=date(2025, 10, 15), actor=self.user
+            )
+        self.assertEqual(result.ids_with_status("failed"), [stmt.pk for stmt in self.statements])
+        self.assertFalse(BillingStatement.objects.exclude(status=BillingStatement.Status.DRAFT).exists())
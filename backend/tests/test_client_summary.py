@@ -0,0 +1,126 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation, UnappliedCredit
+from reports.balances import mark_balances_dirty
+from reports.models import ClientBalance
+from statements.models import BillingItem, BillingStatement
+
+
+class ClientSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.user = User.objects.create_user(username="summary", password="password123", role=User.Roles.BILLER)
+            cls.today = timezone.localdate()
+            cls.initech = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+            cls.hooli = Client.objects.create(name="Hooli", status=Client.Status.INACTIVE)
+            engagement = Engagement.objects.create(
+                client=cls.initech, type=Engagement.Types.SPECIAL, title="Audit", status=Engagement.Status.ACTIVE, start_date=cls.today
+            )
+            cls.statements = []
+            for period, overdue_days in (("2025-01", 45), ("2025-02", -5)):
+                statement = BillingStatement.objects.create(
+                    client=cls.initech,
+                    engagement=engagement,
+                    period=period,
+                    status=BillingStatement.Status.ISSUED,
+                    due_date=cls.today - timedelta(days=overdue_days),
+                )
+                BillingItem.objects.create(billing_statement=statement, description="Fees", unit_price=Decimal("800.00"))
+                cls.statements.append(statement)
+            cls.payment = Payment.objects.create(
+                client=cls.initech,
+                payment_date=cls.today - timedelta(days=3),
+                amount_received=Decimal("500.00"),
+                method=Payment.Method.CASH,
+                manual_invoice_no="OR-1",
+                status=Payment.Status.POSTED,
+                recorded_by=cls.user,
+            )
+            UnappliedCredit.objects.create(client=cls.initech, source_payment=cls.payment, amount=Decimal("200.00"))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def summary(self, client):
+        response = self.api.get(f"/api/clients/{client.pk}/summary/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_summary_figures(self):
+        summary = self.summary(self.initech)
+        self.assertEqual(summary["open_ar"], "1600.00")
+        self.assertEqual(summary["overdue"], {"current": "800.00", "1-30": "0.00", "31-60": "800.00", "61-90": "0.00", "90+": "0.00"})
+        self.assertEqual(summary["unapplied_credit"], "200.00")
+        self.assertEqual(summary["last_payment_date"], (self.today - timedelta(days=3)).isoformat())
+        self.assertEqual(summary["active_engagements"], 1)
+        self.assertEqual(self.summary(self.hooli)["open_ar"], "0.00")
+
+    def test_writes_refresh_the_stored_row(self):
+        self.summary(self.initech)
+        with self.captureOnCommitCallbacks(execute=True):
+            PaymentAllocation.objects.create(payment=self.payment, billing_statement=self.statements[0], amount_applied=Decimal("300.00"))
+        balance = ClientBalance.objects.get(client=self.initech)
+        self.assertEqual((balance.open_ar, balance.overdue_31_60), (Decimal("1300.00"), Decimal("500.00")))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            engagement = Engagement.objects.get(client=self.initech)
+            engagement.status = Engagement.Status.SUSPENDED
+            engagement.save()
+        self.assertEqual(ClientBalance.objects.get(client=self.initech).active_engagements, 0)
+
+        # Reads come from the stored row, not from statements or payments.
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.summary(self.initech)["open_ar"], "1300.00")
+        self.assertFalse([query for query in queries if "statements_billingstatement" in query["sql"]])
+
+    def test_saves_of_unrelated_fields_skip_the_refresh(self):
+        statement = BillingStatement.objects.get(pk=self.statements[0].pk)
+        statement.pdf_path = "statements/2025-01.pdf"
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            statement.save(update_fields=["pdf_path", "updated_at"])
+        self.assertEqual(callbacks, [])
+
+    def test_failed_refresh_after_commit_is_repaired_on_read(self):
+        self.summary(self.initech)
+        with mock.patch("reports.balances.refresh_client_balances", side_effect=RuntimeError("db hiccup")):
+            with self.assertLogs("reports.balances", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+                PaymentAllocation.objects.create(payment=self.payment, billing_statement=self.statements[0], amount_applied=Decimal("300.00"))
+        self.assertFalse(ClientBalance.objects.filter(client=self.initech).exists())
+        self.assertEqual(self.summary(self.initech)["open_ar"], "1300.00")
+
+    def test_rows_aged_on_an_earlier_day_are_refreshed(self):
+        self.summary(self.initech)
+        ClientBalance.objects.filter(client=self.initech).update(as_of=self.today - timedelta(days=20), overdue_31_60=0)
+        self.assertEqual(self.summary(self.initech)["overdue"]["31-60"], "800.00")
+
+    def test_bulk_summaries_follow_list_filters(self):
+        rows = self.api.get("/api/clients/summary/", {"status": "active"}).data["results"]
+        self.assertEqual([(row["name"], row["open_ar"]) for row in rows], [("Initech", "1600.00")])
+        rows = self.api.get("/api/clients/summary/", {"ordering": "name"}).data["results"]
+        self.assertEqual([row["name"] for row in rows], ["Hooli", "Initech"])
+
+
+class DirtyClientRollbackTests(TransactionTestCase):
+    def test_rolled_back_marks_are_not_flushed_with_the_next_transaction(self):
+        initech = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        hooli = Client.objects.create(name="Hooli", status=Client.Status.ACTIVE)
+        with mock.patch("reports.balances.refresh_client_balances") as refresh:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                mark_balances_dirty([initech.pk])
+                raise RuntimeError("boom")
+            with transaction.atomic():
+                mark_balances_dirty([hooli.pk])
+        refresh.assert_called_once_with({hooli.pk})
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements import services
+from engagements.jobs import claim_next_cycle_job, drain_cycle_queue, process_cycle_job, requeue_stale_cycle_jobs
+from engagements.models import Engagement, RetainerCycleJob
+from statements.models import BillingStatement
+
+
+class RetainerCycleJobTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reviewer", password="password123", role=User.Roles.REVIEWER)
+        customer = Client.objects.create(name="Acme Corp", status=Client.Status.ACTIVE)
+        self.engagements = [
+            Engagement.objects.create(
+                client=customer,
+                type=Engagement.Types.RETAINER,
+                title=f"Retainer {n}",
+                status=Engagement.Status.ACTIVE,
+                start_date=timezone.now().date(),
+                base_fee="1000.00",
+            )
+            for n in range(5)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_run_cycle_queues_job_and_worker_reports_progress(self):
+        response = self.api.post("/api/engagements/run-cycle/", {"period": "2025-09"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["id"]
+        self.assertEqual(response.data["status"], RetainerCycleJob.Status.QUEUED)
+        self.assertFalse(BillingStatement.objects.exists())
+
+        again = self.api.post("/api/engagements/run-cycle/", {"period": "2025-09"}, format="json")
+        self.assertEqual(again.data["id"], job_id)
+
+        with self.settings(RETAINER_CYCLE_CHUNK_SIZE=2):
+            self.assertEqual(drain_cycle_queue(), 1)
+
+        status_response = self.api.get(f"/api/engagements/cycle-jobs/{job_id}/")
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.data["status"], RetainerCycleJob.Status.SUCCEEDED)
+        self.assertEqual(
+            {key: status_response.data[key] for key in ("total", "processed", "created", "skipped", "failed")},
+            {"total": 5, "processed": 5, "created": 5, "skipped": 0, "failed": 0},
+        )
+
+    def test_invalid_period_is_rejected(self):
+        response = self.api.post("/api/engagements/run-cycle/", {"period": "2025-13"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_stale_job_resumes_after_last_committed_chunk(self):
+        job = RetainerCycleJob.objects.create(
+            period="2025-09",
+            status=RetainerCycleJob.Status.RUNNING,
+            last_engagement_id=self.engagements[1].id,
+            processed=2,
+            created=2,
+            total=5,
+            attempts=1,
+            created_by=self.user,
+        )
+        RetainerCycleJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_cycle_jobs(), 1)
+
+        job = process_cycle_job(claim_next_cycle_job())
+        self.assertEqual(job.status, RetainerCycleJob.Status.SUCCEEDED)
+        self.assertEqual((job.processed, job.created, job.attempts), (5, 5, 2))
+        created_for = set(BillingStatement.objects.values_list("engagement_id", flat=True))
+        self.assertEqual(created_for, {engagement.id for engagement in self.engagements[2:]})
+
+    def test_failing_engagement_is_isolated_and_counted(self):
+        broken = self.engagements[2].id
+        real = services.generate_retainer_chunk
+
+        def generate(engagements, *args):
+            if any(engagement.id == broken for engagement in engagements):
+                raise RuntimeError("bad engagement")
+            return real(engagements, *args)
+
+        job = RetainerCycleJob.objects.create(period="2025-09", created_by=self.user)
+        with mock.patch("engagements.services.generate_retainer_chunk", side_effect=generate):
+            job = process_cycle_job(claim_next_cycle_job(job.pk))
+        self.assertEqual(job.status, RetainerCycleJob.Status.SUCCEEDED)
+        self.assertEqual((job.created, job.failed), (4, 1))
+        self.assertFalse(BillingStatement.objects.filter(engagement_id=broken).exists())
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment
+from reports.cache import MemoryReportCache
+from statements.models import BillingItem, BillingStatement
+
+
+class DashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.user = User.objects.create_user(username="dash", password="password123", role=User.Roles.BILLER)
+            cls.today = timezone.localdate()
+            cls.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+            engagement = Engagement.objects.create(
+                client=cls.customer, type=Engagement.Types.SPECIAL, title="Audit", status=Engagement.Status.ACTIVE, start_date=cls.today
+            )
+            for month, status in enumerate(["issued", "issued", "pending_review", "draft", "issued", "issued", "issued"], start=1):
+                statement = BillingStatement.objects.create(
+                    client=cls.customer, engagement=engagement, period=f"2025-{month:02d}", status=status, due_date=cls.today
+                )
+                BillingItem.objects.create(billing_statement=statement, description="Fees", unit_price=Decimal("100.00"))
+            for days_ago, status in ((0, "posted"), (1, "verified"), (2, "draft"), (40, "posted")):
+                Payment.objects.create(
+                    client=cls.customer,
+                    payment_date=cls.today - timedelta(days=days_ago),
+                    amount_received=Decimal("250.00"),
+                    method=Payment.Method.CASH,
+                    status=status,
+                    manual_invoice_no=f"OR-{days_ago}",
+                    recorded_by=cls.user,
+                )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        self.cache = MemoryReportCache(max_entries=8)
+        patcher = mock.patch("reports.cache._cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dashboard_figures(self):
+        data = self.api.get("/api/dashboard/").data
+        self.assertEqual(len(data["recent_statements"]), 5)
+        self.assertEqual([row["payment_date"] for row in data["recent_payments"]][0], self.today)
+        self.assertEqual(data["recent_payments"][0]["unallocated_total"], Decimal("250.00"))
+        self.assertEqual(data["statements_by_status"]["issued"], {"count": 5, "sub_total": Decimal("500.00"), "balance": Decimal("500.00")})
+        self.assertEqual(data["statements_by_status"]["void"]["count"], 0)
+        self.assertEqual(data["payments_by_status"]["draft"]["count"], 1)
+        self.assertEqual(data["pending_review"], 1)
+        month_payments = [days for days in (0, 1) if (self.today - timedelta(days=days)).month == self.today.month]
+        self.assertEqual(data["month_collections"]["count"], len(month_payments))
+        self.assertEqual(data["month_collections"]["amount"], Decimal("250.00") * len(month_payments))
+
+    def test_served_from_cache_until_a_write(self):
+        # Version lookup, then recent statements, recent payments, two status groupings and collections.
+        with self.assertNumQueries(6):
+            first = self.api.get("/api/dashboard/").data
+        with self.assertNumQueries(1):
+            self.assertEqual(self.api.get("/api/dashboard/").data, first)
+        with self.captureOnCommitCallbacks(execute=True):
+            BillingStatement.objects.filter(status="draft").get().delete()
+        self.assertEqual(self.api.get("/api/dashboard/").data["statements_by_status"]["draft"]["count"], 0)
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from statements.models import BillingStatement
+
+
+@override_settings(API_PAGE_SIZE=4)
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="pager", password="password123", role=User.Roles.BILLER)
+        customer = Client.objects.create(name="Umbrella", status=Client.Status.ACTIVE)
+        engagement = Engagement.objects.create(
+            client=customer,
+            type=Engagement.Types.SPECIAL,
+            title="Audit",
+            start_date=timezone.now().date(),
+        )
+        # Drafts (NULL issue_date) and repeated issue dates exercise the tie-breakers.
+        for month in range(1, 11):
+            BillingStatement.objects.create(
+                client=customer,
+                engagement=engagement,
+                period=f"2025-{month:02d}",
+                issue_date=None if month % 4 == 0 else date(2025, 1, 1) + timedelta(days=month // 3),
+                sub_total=Decimal(month),
+                created_by=cls.user,
+                updated_by=cls.user,
+            )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def walk(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.api.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            ids.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        return ids, pages
+
+    def test_cursor_pages_follow_default_ordering_without_gaps(self):
+        expected = list(BillingStatement.objects.order_by("-issue_date", "-created_at", "-id").values_list("id", flat=True))
+        ids, pages = self.walk("/api/billing-statements/")
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page["results"]) for page in pages], [4, 4, 2])
+        self.assertIsNone(pages[0]["previous"])
+
+    def test_previous_link_returns_the_earlier_page(self):
+        first = self.api.get("/api/billing-statements/?ordering=sub_total").data
+        second = self.api.get(first["next"]).data
+        back = self.api.get(second["previous"]).data
+        self.assertEqual([row["id"] for row in back["results"]], [row["id"] for row in first["results"]])
+        self.assertEqual([Decimal(row["sub_total"]) for row in first["results"]], [Decimal(n) for n in range(1, 5)])
+
+    def test_limit_offset_keeps_bare_list_response(self):
+        response = self.api.get("/api/billing-statements/?ordering=-sub_total&limit=3&offset=1")
+        self.assertIsInstance(response.data, list)
+        self.assertEqual([Decimal(row["sub_total"]) for row in response.data], [Decimal(9), Decimal(8), Decimal(7)])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.api.get("/api/billing-statements/?cursor=garbage").status_code, 404)
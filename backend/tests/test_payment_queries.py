@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation
+from statements.models import BillingStatement
+
+
+class PaymentListQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="cashier", password="password123", role=User.Roles.BILLER)
+        cls.customer = Client.objects.create(name="Hooli", status=Client.Status.ACTIVE)
+        engagement = Engagement.objects.create(
+            client=cls.customer,
+            type=Engagement.Types.SPECIAL,
+            title="Advisory",
+            start_date=timezone.now().date(),
+        )
+        cls.statement = BillingStatement.objects.create(
+            client=cls.customer,
+            engagement=engagement,
+            period="2025-09",
+            status=BillingStatement.Status.ISSUED,
+            created_by=cls.user,
+            updated_by=cls.user,
+        )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def add_payments(self, count):
+        for _ in range(count):
+            number = Payment.objects.count() + 1
+            payment = Payment.objects.create(
+                client=self.customer,
+                payment_date=timezone.now().date(),
+                amount_received=Decimal("1000.00"),
+                method=Payment.Method.CASH,
+                manual_invoice_no=f"INV-{number}",
+                recorded_by=self.user,
+                created_by=self.user,
+                updated_by=self.user,
+            )
+            PaymentAllocation.objects.bulk_create(
+                [PaymentAllocation(payment=payment, billing_statement=self.statement, amount_applied=Decimal("400.00"))]
+            )
+
+    def test_list_query_count_is_constant(self):
+        self.add_payments(2)
+        with CaptureQueriesContext(connection) as small:
+            self.api.get("/api/payments/")
+        self.add_payments(10)
+        with CaptureQueriesContext(connection) as large:
+            response = self.api.get("/api/payments/")
+        self.assertEqual(len(response.data["results"]), 12)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 2)
+        self.assertEqual({row["remaining_unallocated"] for row in response.data["results"]}, {"600.00"})
+
+    def test_editing_amount_uses_fresh_remaining(self):
+        self.add_payments(1)
+        payment = Payment.objects.get()
+        response = self.api.patch(f"/api/payments/{payment.pk}/", {"amount_received": "1500.00"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["remaining_unallocated"], "1100.00")
+        self.assertEqual(payment.unapplied_credits.get().amount, Decimal("1100.00"))
@@ -0,0 +1,152 @@
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from statements.jobs import claim_next_job, drain_queue, enqueue_pdf_render, process_job, requeue_stale_jobs
+from statements.models import BillingItem, BillingStatement, PdfRenderJob
+from statements.pdf import render_statement_pdf
+
+
+class PdfRenderQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reviewer", password="password123", role=User.Roles.REVIEWER)
+        self.client_obj = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        self.engagement = Engagement.objects.create(
+            client=self.client_obj,
+            type=Engagement.Types.SPECIAL,
+            title="Audit",
+            start_date=timezone.now().date(),
+        )
+        self.statement = BillingStatement.objects.create(
+            client=self.client_obj,
+            engagement=self.engagement,
+            period="2025-09",
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_issue_returns_job_and_pdf_path_set_only_after_render(self):
+        response = self.api.post(
+            f"/api/billing-statements/{self.statement.pk}/issue/",
+            {"issue_date": "2025-09-01", "due_date": "2025-09-15", "number": "SOA-TEST-1"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["pdf_job"]["id"]
+        self.statement.refresh_from_db()
+        self.assertEqual(self.statement.pdf_path, "")
+
+        with mock.patch("statements.jobs.render_statement_pdf", return_value="pdf/statements/SOA-TEST-1.pdf"):
+            self.assertEqual(drain_queue(), 1)
+
+        self.statement.refresh_from_db()
+        self.assertEqual(self.statement.pdf_path, "pdf/statements/SOA-TEST-1.pdf")
+        status_response = self.api.get(f"/api/pdf-jobs/{job_id}/")
+        self.assertEqual(status_response.data["status"], PdfRenderJob.Status.SUCCEEDED)
+
+    def test_enqueue_reuses_waiting_job(self):
+        first = enqueue_pdf_render(self.statement, actor=self.user)
+        second = enqueue_pdf_render(self.statement, actor=self.user, force_refresh=True)
+        self.assertEqual(first.pk, second.pk)
+        self.assertTrue(second.force_refresh)
+
+    def test_failed_render_is_retried_then_marked_failed(self):
+        enqueue_pdf_render(self.statement, actor=self.user)
+        with mock.patch("statements.jobs.render_statement_pdf", side_effect=RuntimeError("chromium down")), self.settings(PDF_JOB_MAX_ATTEMPTS=2, PDF_JOB_RETRY_BACKOFF_SECONDS=0):
+            drain_queue()
+        job = PdfRenderJob.objects.get()
+        self.assertEqual(job.status, PdfRenderJob.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNone(claim_next_job())
+
+    def test_failed_render_waits_for_its_backoff(self):
+        enqueue_pdf_render(self.statement, actor=self.user)
+        with mock.patch("statements.jobs.render_statement_pdf", side_effect=RuntimeError("chromium down")), self.settings(PDF_JOB_RETRY_BACKOFF_SECONDS=30):
+            self.assertEqual(drain_queue(), 1)
+            job = PdfRenderJob.objects.get()
+            self.assertEqual((job.status, job.run_after - job.finished_at), (PdfRenderJob.Status.QUEUED, timedelta(seconds=30)))
+            self.assertIsNone(claim_next_job())
+            PdfRenderJob.objects.update(run_after=timezone.now())
+            process_job(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual((job.attempts, job.run_after - job.finished_at), (2, timedelta(seconds=60)))
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = claim_next_job(enqueue_pdf_render(self.statement, actor=self.user).pk)
+        self.assertEqual(requeue_stale_jobs(), 0)
+        PdfRenderJob.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        with self.settings(PDF_JOB_RETRY_BACKOFF_SECONDS=30):
+            self.assertEqual(requeue_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (PdfRenderJob.Status.QUEUED, 1))
+        self.assertIsNone(claim_next_job())
+        PdfRenderJob.objects.update(run_after=timezone.now())
+        self.assertEqual(claim_next_job().pk, job.pk)
+
+    def test_jobs_that_keep_crashing_their_worker_fail(self):
+        enqueue_pdf_render(self.statement, actor=self.user)
+        with self.settings(PDF_JOB_MAX_ATTEMPTS=2, PDF_JOB_RETRY_BACKOFF_SECONDS=0):
+            for requeued in (1, 0):
+                claim_next_job()
+                PdfRenderJob.objects.update(started_at=timezone.now() - timedelta(hours=1))
+                self.assertEqual(requeue_stale_jobs(), requeued)
+        job = PdfRenderJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (PdfRenderJob.Status.FAILED, 2))
+        self.assertIsNone(claim_next_job())
+
+    def test_job_whose_statement_cannot_be_loaded_is_not_left_running(self):
+        job = claim_next_job(enqueue_pdf_render(self.statement, actor=self.user).pk)
+        with mock.patch.object(BillingStatement.objects, "select_related", side_effect=BillingStatement.DoesNotExist("gone")):
+            process_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (PdfRenderJob.Status.QUEUED, "gone"))
+
+
+class PdfFingerprintCacheTests(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        storage = self.settings(PLAYWRIGHT_STORAGE_PATH=tmpdir.name)
+        storage.enable()
+        self.addCleanup(storage.disable)
+        pool_patch = mock.patch("statements.pdf.get_browser_pool")
+        self.pool = pool_patch.start().return_value
+        self.pool.render.side_effect = lambda html, path: Path(path).write_text(html)
+        self.addCleanup(pool_patch.stop)
+
+        client = Client.objects.create(name="Umbrella", status=Client.Status.ACTIVE)
+        engagement = Engagement.objects.create(
+            client=client, type=Engagement.Types.SPECIAL, title="Tax", start_date=timezone.now().date()
+        )
+        self.statement = BillingStatement.objects.create(
+            client=client, engagement=engagement, period="2025-09", number="SOA-2025-0001"
+        )
+        self.item = BillingItem.objects.create(
+            billing_statement=self.statement, description="Filing", qty=1, unit_price=Decimal("1500.00")
+        )
+
+    def fresh(self):
+        return BillingStatement.objects.select_related("client", "engagement").get(pk=self.statement.pk)
+
+    def test_unchanged_statement_skips_chromium(self):
+        render_statement_pdf(self.fresh())
+        render_statement_pdf(self.fresh())
+        self.assertEqual(self.pool.render.call_count, 1)
+
+    def test_item_edit_invalidates_pdf(self):
+        render_statement_pdf(self.fresh())
+        self.item.unit_price = Decimal("2000.00")
+        self.item.save()
+        render_statement_pdf(self.fresh())
+        self.assertEqual(self.pool.render.call_count, 2)
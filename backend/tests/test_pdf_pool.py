@@ -0,0 +1,117 @@
+import tempfile
+import threading
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from statements.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_content(self, html, wait_until=None):
+        if self.browser.crash_next:
+            self.browser.crash_next = False
+            self.browser.connected = False
+            raise RuntimeError("Target closed")
+
+    def pdf(self, path, **options):
+        Path(path).write_text("pdf")
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def new_page(self):
+        return FakePage(self.browser)
+
+    def close(self):
+        self.browser.contexts_closed += 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.crash_next = False
+        self.contexts_closed = 0
+
+    def new_context(self):
+        return FakeContext(self)
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.launched = []
+
+    def launch(self):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    def stop(self):
+        pass
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.output = Path(tmpdir.name) / "statement.pdf"
+
+    def make_pool(self, **kwargs):
+        pool = BrowserPool(size=1, driver_factory=lambda: self.driver, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_browser_is_reused_with_fresh_context_per_render(self):
+        pool = self.make_pool(max_renders=10)
+        for _ in range(3):
+            pool.render("<p>SOA</p>", str(self.output))
+        self.assertEqual(len(self.driver.launched), 1)
+        self.assertEqual(self.driver.launched[0].contexts_closed, 3)
+        self.assertEqual(pool.stats()["renders"], 3)
+
+    def test_browser_recycled_after_max_renders(self):
+        pool = self.make_pool(max_renders=2)
+        for _ in range(5):
+            pool.render("<p>SOA</p>", str(self.output))
+        self.assertEqual(len(self.driver.launched), 3)
+        self.assertEqual(pool.stats()["recycles"], 2)
+
+    def test_crashed_browser_is_relaunched_and_render_retried(self):
+        pool = self.make_pool(max_renders=10)
+        pool.render("<p>warm</p>", str(self.output))
+        self.driver.launched[0].crash_next = True
+        pool.render("<p>SOA</p>", str(self.output))
+        stats = pool.stats()
+        self.assertEqual(len(self.driver.launched), 2)
+        self.assertEqual(stats["restarts"], 1)
+        self.assertEqual(stats["renders"], 2)
+        self.assertEqual(stats["failures"], 0)
+
+    def test_render_gives_up_when_a_slot_hangs(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        launch = self.driver.launch
+        self.driver.launch = lambda: release.wait() and launch()
+        pool = self.make_pool(timeout_ms=50)
+        with self.assertRaises(TimeoutError):
+            pool.render("<p>SOA</p>", str(self.output))
+        # The queued render behind it is skipped once its caller has given up.
+        with self.assertRaises(TimeoutError):
+            pool.render("<p>SOA</p>", str(self.output))
+        release.set()
+        self.assertEqual(pool.stats()["failures"], 2)
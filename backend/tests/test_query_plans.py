@@ -0,0 +1,124 @@
+import json
+from datetime import date
+
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment
+from reports.aging import aging_bucket, open_receivables
+from reports.dashboard import RECENT_ROWS
+from statements.models import BillingStatement
+
+CLIENTS = 400
+MONTHS = 60
+PAYMENTS_PER_CLIENT = 100
+
+
+# Rows are inserted month by month, so the open statements (latest months) sit together at the end.
+_SEED_STATEMENTS_SQL = """
+INSERT INTO {statements} (
+    created_at, updated_at, number, client_id, engagement_id, period, due_date, currency, notes, status,
+    pdf_path, sub_total, paid_to_date, balance, idempotency_hash
+)
+SELECT now(), now(), 'SOA-' || e.id || '-' || m, e.client_id, e.id,
+       to_char(DATE '1970-01-01' + m * INTERVAL '1 month', 'YYYY-MM'), DATE '1970-01-01' + m * 30, 'PHP', '',
+       CASE WHEN m >= %(open_from)s THEN 'issued' ELSE 'settled' END, '', 1000,
+       CASE WHEN m >= %(open_from)s THEN 0 ELSE 1000 END, CASE WHEN m >= %(open_from)s THEN 1000 ELSE 0 END, ''
+FROM generate_series(0, %(months)s - 1) AS m CROSS JOIN {engagements} e
+ORDER BY m, e.id
+"""
+
+_SEED_PAYMENTS_SQL = """
+INSERT INTO {payments} (
+    created_at, updated_at, client_id, payment_date, amount_received, currency, method, manual_invoice_no,
+    reference_no, notes, status, recorded_by_id
+)
+SELECT now(), now(), c.id, DATE '2000-01-01' + i, 100, 'PHP', 'cash', 'INV-' || i, '', '',
+       CASE WHEN i %% 10 = 0 THEN 'void' ELSE 'posted' END, %(user)s
+FROM generate_series(0, %(payments)s - 1) AS i CROSS JOIN {clients} c
+ORDER BY i, c.id
+"""
+
+
+def plan_nodes(queryset):
+    """Every node of the queryset's EXPLAIN plan, depth first."""
+
+    stack = [json.loads(queryset.explain(format="json"))[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.get("Plans", []))
+
+
+class QueryPlanTests(TestCase):
+    """Key querysets must be answered from an index on a realistically sized table.
+
+    Most statements are settled history; only the latest few periods are open.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="planner", password="password123", role=User.Roles.BILLER)
+        clients = Client.objects.bulk_create(Client(name=f"Client {index}", status=Client.Status.ACTIVE) for index in range(CLIENTS))
+        Engagement.objects.bulk_create(
+            Engagement(client=client, type=Engagement.Types.RETAINER, title="Retainer", start_date=date(1970, 1, 1))
+            for client in clients
+        )
+        # Seeded in SQL: tens of thousands of ORM inserts would dominate the suite's run time.
+        params = {"months": MONTHS, "open_from": MONTHS - 6, "payments": PAYMENTS_PER_CLIENT, "user": user.pk}
+        with connection.cursor() as cursor:
+            cursor.execute(_SEED_STATEMENTS_SQL.format(statements=BillingStatement._meta.db_table, engagements=Engagement._meta.db_table), params)
+            cursor.execute(_SEED_PAYMENTS_SQL.format(payments=Payment._meta.db_table, clients=Client._meta.db_table), params)
+            cursor.execute(f"ANALYZE {BillingStatement._meta.db_table}, {Payment._meta.db_table}")
+        cls.client_id = clients[7].pk
+
+    def assertIndexScan(self, queryset, model, index_name):
+        nodes = list(plan_nodes(queryset))
+        table = model._meta.db_table
+        seq_scans = [node for node in nodes if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table]
+        self.assertFalse(seq_scans, f"Sequential scan on {table}:\n{queryset.explain()}")
+        self.assertIn(index_name, {node.get("Index Name") for node in nodes})
+
+    def test_open_receivables_use_the_partial_indexes(self):
+        aging = (
+            open_receivables()
+            .annotate(bucket=aging_bucket(date(1975, 1, 1)))
+            .values("bucket")
+            .annotate(total=Sum("balance"))
+            .order_by("bucket")
+        )
+        self.assertIndexScan(aging, BillingStatement, "statement_open_due_idx")
+        per_client = open_receivables().filter(client_id__in=[self.client_id]).values("client_id").annotate(total=Sum("balance"))
+        self.assertIndexScan(per_client, BillingStatement, "statement_open_client_idx")
+
+    def test_statement_list_filters_use_composite_indexes(self):
+        by_client = BillingStatement.objects.filter(client_id=self.client_id, status=BillingStatement.Status.ISSUED)
+        self.assertIndexScan(by_client.order_by("-issue_date", "-created_at", "-id")[:50], BillingStatement, "statement_client_status_idx")
+        by_period = BillingStatement.objects.filter(period="1972-06", status=BillingStatement.Status.SETTLED)
+        self.assertIndexScan(by_period, BillingStatement, "statement_period_status_idx")
+
+    def test_dashboard_recent_statements_walk_the_created_index(self):
+        recent = BillingStatement.objects.order_by("-created_at", "-id").values("id", "client__name")[:RECENT_ROWS]
+        self.assertIndexScan(recent, BillingStatement, "statement_created_keyset_idx")
+
+    def test_dashboard_recent_payments_walk_the_keyset_index(self):
+        recent = Payment.objects.order_by("-payment_date", "-created_at", "-id").values("id", "client__name")[:RECENT_ROWS]
+        self.assertIndexScan(recent, Payment, "payment_keyset_idx")
+
+    def test_payment_filters_use_composite_indexes(self):
+        by_client = Payment.objects.filter(client_id=self.client_id, status=Payment.Status.POSTED)
+        self.assertIndexScan(by_client.order_by("-payment_date", "-created_at", "-id")[:50], Payment, "payment_client_status_idx")
+        collections = (
+            Payment.objects.filter(
+                status__in=[Payment.Status.POSTED, Payment.Status.VERIFIED],
+                payment_date__gte=date(2000, 2, 1),
+                payment_date__lte=date(2000, 2, 29),
+            )
+            .values("payment_date", "method")
+            .annotate(total_amount=Sum("amount_received"))
+        )
+        self.assertIndexScan(collections, Payment, "payment_collected_date_idx")
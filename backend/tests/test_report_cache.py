@@ -0,0 +1,123 @@
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment
+from reports.cache import FileReportCache, MemoryReportCache, _advance_version, current_report_version
+from statements.models import BillingStatement
+
+
+class ReportCacheTests(TestCase):
+    def setUp(self):
+        # The version bump these writes queue runs now, so each test starts with none pending.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username="cache", password="password123", role=User.Roles.BILLER)
+            self.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        self.cache = MemoryReportCache(max_entries=8)
+        patcher = mock.patch("reports.cache._cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record_payment(self, amount, invoice):
+        Payment.objects.create(
+            client=self.customer,
+            payment_date=timezone.localdate(),
+            amount_received=Decimal(amount),
+            method=Payment.Method.CASH,
+            status=Payment.Status.POSTED,
+            manual_invoice_no=invoice,
+            recorded_by=self.user,
+        )
+
+    def test_repeat_requests_hit_until_a_write_bumps_the_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record_payment("100.00", "INV-1")
+        first = self.api.get("/api/reports/collections/?start=2000-01-01&end=2999-12-31").data
+        again = self.api.get("/api/reports/collections/?end=2999-12-31&start=2000-01-01").data
+        self.assertEqual(again, first)
+        self.assertEqual((self.cache.metrics.misses, self.cache.metrics.hits), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record_payment("50.00", "INV-2")
+        fresh = self.api.get("/api/reports/collections/?start=2000-01-01&end=2999-12-31").data
+        self.assertEqual(fresh["rows"][0]["total_amount"], Decimal("150.00"))
+        self.assertEqual(self.cache.metrics.misses, 2)
+
+        stats = self.api.get("/api/reports/cache/").data
+        self.assertEqual((stats["backend"], stats["hits"], stats["entries"]), ("memory", 1, 2))
+
+    def test_bookkeeping_saves_keep_the_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            statement = BillingStatement.objects.create(
+                client=self.customer,
+                engagement=Engagement.objects.create(
+                    client=self.customer, type=Engagement.Types.SPECIAL, title="Audit", start_date=timezone.localdate()
+                ),
+                period="2025-01",
+            )
+        version = current_report_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            statement.pdf_path = "statements/2025-01.pdf"
+            statement.save(update_fields=["pdf_path", "updated_at"])
+        self.assertEqual(current_report_version(), version)
+        with self.captureOnCommitCallbacks(execute=True):
+            statement.due_date = timezone.localdate()
+            statement.save(update_fields=["due_date", "updated_at"])
+            statement.save(update_fields=["status", "updated_at"])
+        self.assertEqual(current_report_version(), version + 1)
+
+    def test_rolled_back_writes_keep_the_version(self):
+        version = current_report_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.record_payment("75.00", "INV-3")
+                raise RuntimeError
+        self.assertEqual(current_report_version(), version)
+
+    def test_writes_in_one_transaction_queue_a_single_bump(self):
+        version = current_report_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.record_payment("75.00", "INV-3")
+            self.record_payment("25.00", "INV-4")
+        self.assertEqual([callback for callback in callbacks if callback is _advance_version], [_advance_version])
+        self.assertEqual(current_report_version(), version + 1)
+
+    def test_exports_bypass_the_cache(self):
+        response = self.api.get("/api/reports/collections/?format=csv")
+        b"".join(response.streaming_content)
+        self.assertEqual(self.cache.metrics.as_dict(), {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+
+
+class ReportCacheBackendTests(SimpleTestCase):
+    def test_memory_backend_evicts_least_recently_used(self):
+        cache = MemoryReportCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c"), len(cache)), (1, 3, 2))
+        self.assertEqual(cache.metrics.evictions, 1)
+
+    def test_file_backend_evicts_oldest_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileReportCache(max_entries=2, directory=directory)
+            cache.set("a", {"rows": [1]})
+            cache.set("b", {"rows": [2]})
+            os.utime(cache._path("a"), (0, 200))
+            os.utime(cache._path("b"), (0, 100))
+            cache.set("c", {"rows": [3]})
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual((cache.get("a"), cache.get("c"), len(cache)), ({"rows": [1]}, {"rows": [3]}, 2))
+            self.assertEqual(cache.stats()["evictions"], 1)
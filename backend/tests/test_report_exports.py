@@ -0,0 +1,95 @@
+import csv
+import io
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation
+from statements.models import BillingItem, BillingStatement
+
+SHEET_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+@override_settings(REPORT_CACHE_BACKEND="none")
+class ReportExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="exports", password="password123", role=User.Roles.BILLER)
+        today = timezone.localdate()
+        cls.statements = []
+        for name, overdue_days in (("Hooli", 45), ("Initech", 10)):
+            customer = Client.objects.create(name=name, status=Client.Status.ACTIVE)
+            engagement = Engagement.objects.create(client=customer, type=Engagement.Types.SPECIAL, title="Audit", start_date=today)
+            statement = BillingStatement.objects.create(
+                client=customer,
+                engagement=engagement,
+                period="2025-01",
+                number=f"SOA-{name}",
+                status=BillingStatement.Status.ISSUED,
+                due_date=today - timedelta(days=overdue_days),
+                created_by=cls.user,
+                updated_by=cls.user,
+            )
+            BillingItem.objects.create(billing_statement=statement, description="Fees", unit_price=Decimal("800.00"))
+            cls.statements.append(statement)
+        payment = Payment.objects.create(
+            client=cls.statements[1].client,
+            payment_date=today,
+            amount_received=Decimal("300.00"),
+            method=Payment.Method.CASH,
+            status=Payment.Status.POSTED,
+            manual_invoice_no="INV-1",
+            recorded_by=cls.user,
+        )
+        PaymentAllocation.objects.create(payment=payment, billing_statement=cls.statements[1], amount_applied=Decimal("300.00"))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def csv_rows(self, url):
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_collections_csv_with_statement_detail(self):
+        rows = self.csv_rows("/api/reports/collections/?format=csv&detail=statement")
+        self.assertEqual(rows[0], ["payment_date", "invoice", "client", "method", "statement", "period", "amount_applied"])
+        self.assertEqual(rows[1][1:], ["INV-1", "Initech", "cash", "SOA-Initech", "2025-01", "300.00"])
+
+    def test_aging_csv_per_client_and_per_statement(self):
+        clients = self.csv_rows("/api/reports/aging/?format=csv&detail=client")
+        self.assertEqual(clients[0], ["client", "0-30", "31-60", "61-90", "90+", "total"])
+        self.assertEqual(clients[1:], [["Hooli", "", "800.00", "", "", "800.00"], ["Initech", "500.00", "", "", "", "500.00"]])
+
+        statements = self.csv_rows("/api/reports/aging/?format=csv&detail=statement")
+        self.assertEqual([row[1] for row in statements[1:]], ["SOA-Hooli", "SOA-Initech"])
+
+        buckets = self.csv_rows("/api/reports/aging/?format=csv")
+        self.assertEqual(buckets, [["bucket", "total_balance"], ["0-30", "500.00"], ["31-60", "800.00"]])
+
+    def test_xlsx_is_a_readable_workbook(self):
+        response = self.api.get("/api/reports/unapplied-credits/?format=xlsx")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="unapplied-credits.xlsx"', response["Content-Disposition"])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIn("xl/workbook.xml", archive.namelist())
+        sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+        header = ["".join(cell.itertext()) for cell in sheet.find("x:sheetData/x:row", SHEET_NS)]
+        self.assertEqual(header, ["client", "total_amount"])
+
+    def test_json_is_unchanged_and_bad_detail_is_rejected(self):
+        response = self.api.get("/api/reports/collections/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.data["rows"][0]["total_amount"], Decimal("300.00"))
+        self.assertEqual(self.api.get("/api/reports/aging/?format=csv&detail=everything").status_code, 400)
@@ -1,10 +1,17 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.db import connection
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from accounts.models import User
 from clients.models import Client
 from engagements.models import Engagement
-from engagements.services import run_retainer_cycle
+from engagements.services import retainer_engagements, run_retainer_catch_up, run_retainer_cycle
 from statements.models import BillingStatement
 
 
@@ -32,3 +39,84 @@ class RetainerCycleTests(TestCase):
         summary_second = run_retainer_cycle(period=period, actor=self.user)
         self.assertEqual(summary_second["created"], 0)
         self.assertEqual(summary_second["skipped_existing"], 1)
+
+    def test_cycle_runs_in_chunks_with_constant_queries_per_chunk(self):
+        for n in range(7):
+            Engagement.objects.create(
+                client=self.engagement.client,
+                type=Engagement.Types.RETAINER,
+                title=f"Retainer {n}",
+                status=Engagement.Status.ACTIVE,
+                start_date=timezone.now().date(),
+                base_fee="500.00",
+            )
+        run_retainer_cycle(period="2025-09", actor=self.user, chunk_size=3)
+        progress = []
+        with CaptureQueriesContext(connection) as ctx:
+            summary = run_retainer_cycle(
+                period="2025-10",
+                actor=self.user,
+                chunk_size=3,
+                on_chunk=lambda last_id, chunk: progress.append(chunk.created),
+            )
+        self.assertEqual(summary, {"created": 8, "skipped_existing": 0, "failed": 0})
+        self.assertEqual(progress, [3, 3, 2])
+        # Per chunk: engagements, existing drafts, statements, items, engagement marker (+ savepoint).
+        self.assertLessEqual(len(ctx.captured_queries), 3 * 7 + 1)
+        statement = BillingStatement.objects.get(engagement__title="Retainer 0", period="2025-10")
+        self.assertEqual(statement.balance, Decimal("500.00"))
+        self.assertEqual(statement.items.get().line_total, Decimal("500.00"))
+
+        run_retainer_cycle(period="2025-08", actor=self.user)
+        self.engagement.refresh_from_db()
+        self.assertEqual(self.engagement.last_generated_period, "2025-10")
+
+
+class RetainerCatchUpTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="runner", password="password123", role=User.Roles.ADMIN)
+        self.engagements = []
+        for n in range(4):
+            customer = Client.objects.create(name=f"Client {n}", status=Client.Status.ACTIVE)
+            self.engagements.append(
+                Engagement.objects.create(
+                    client=customer,
+                    type=Engagement.Types.RETAINER,
+                    title="Monthly Retainer",
+                    status=Engagement.Status.ACTIVE,
+                    start_date=date(2025, 1, 1),
+                    base_fee="1000.00",
+                )
+            )
+
+    def test_range_generates_only_periods_after_marker(self):
+        Engagement.objects.filter(pk=self.engagements[0].pk).update(last_generated_period="2025-02")
+        results = run_retainer_catch_up("2025-01", "2025-03", actor=self.user)
+        self.assertEqual([results[p]["created"] for p in ("2025-01", "2025-02", "2025-03")], [3, 3, 4])
+        self.assertEqual(
+            list(BillingStatement.objects.filter(engagement=self.engagements[0]).values_list("period", flat=True)),
+            ["2025-03"],
+        )
+        self.assertEqual(set(Engagement.objects.values_list("last_generated_period", flat=True)), {"2025-03"})
+
+    def test_range_keeps_to_engagement_dates(self):
+        Engagement.objects.filter(pk=self.engagements[0].pk).update(start_date=date(2025, 5, 20))
+        Engagement.objects.filter(pk=self.engagements[1].pk).update(end_date=date(2025, 3, 1))
+        run_retainer_catch_up("2025-01", "2025-06", actor=self.user)
+
+        def periods(engagement):
+            return list(BillingStatement.objects.filter(engagement=engagement).order_by("period").values_list("period", flat=True))
+
+        self.assertEqual(periods(self.engagements[0]), ["2025-05", "2025-06"])
+        self.assertEqual(periods(self.engagements[1]), ["2025-01", "2025-02", "2025-03"])
+        self.assertEqual(len(periods(self.engagements[2])), 6)
+
+    def test_sharded_workers_split_clients_without_duplicates(self):
+        call_command("run_retainer_cycle", "--from", "2025-01", "--to", "2025-02", "--workers", "2", "--user", "runner", stdout=StringIO())
+        self.assertEqual(BillingStatement.objects.count(), 8)
+        self.assertEqual(
+            BillingStatement.objects.values("engagement", "period").distinct().count(),
+            8,
+        )
+        shard_sizes = [retainer_engagements(shard=(index, 2)).count() for index in range(2)]
+        self.assertEqual(sum(shard_sizes), 4)
@@ -0,0 +1,84 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.forecast import forecast_retainers
+from engagements.models import Engagement
+from engagements.services import run_retainer_catch_up, run_retainer_cycle
+from statements.models import BillingStatement
+
+
+@override_settings(REPORT_CACHE_BACKEND="none")
+class RetainerForecastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="planner", password="password123", role=User.Roles.ADMIN)
+        cls.acme = Client.objects.create(name="Acme Corp", status=Client.Status.ACTIVE)
+        cls.globex = Client.objects.create(name="Globex", status=Client.Status.ACTIVE)
+
+        def retainer(customer, fee, start, end=None, tags=(), status=Engagement.Status.ACTIVE):
+            return Engagement.objects.create(
+                client=customer,
+                type=Engagement.Types.RETAINER,
+                title=f"Retainer {fee}",
+                status=status,
+                start_date=start,
+                end_date=end,
+                base_fee=fee,
+                tags=list(tags),
+            )
+
+        cls.ongoing = retainer(cls.acme, "1000.00", date(2024, 1, 15), tags=["tax", "payroll"])
+        cls.ending = retainer(cls.acme, "200.00", date(2024, 1, 1), end=date(2025, 2, 10), tags=["tax"])
+        cls.starting = retainer(cls.globex, "500.00", date(2025, 3, 1))
+        retainer(cls.globex, "9999.00", date(2024, 1, 1), status=Engagement.Status.SUSPENDED)
+
+    def test_projection_follows_dates_status_and_existing_drafts(self):
+        run_retainer_cycle("2025-01", actor=self.user)
+        forecast = forecast_retainers("2025-01", 4)
+
+        self.assertEqual(
+            [(row["period"], row["statements"], row["revenue"]) for row in forecast["periods"]],
+            [("2025-01", 0, "0.00"), ("2025-02", 2, "1200.00"), ("2025-03", 2, "1500.00"), ("2025-04", 2, "1500.00")],
+        )
+        self.assertEqual((forecast["statements"], forecast["revenue"]), (6, "4200.00"))
+        self.assertEqual(
+            [(row["client_name"], row["statements"], row["revenue"]) for row in forecast["by_client"]],
+            [("Acme Corp", 4, "3200.00"), ("Globex", 2, "1000.00")],
+        )
+        self.assertEqual(
+            {row["tag"]: (row["revenue"], row["monthly_revenue"]) for row in forecast["by_tag"]},
+            {
+                "tax": ("3200.00", ["0.00", "1200.00", "1000.00", "1000.00"]),
+                "payroll": ("3000.00", ["0.00", "1000.00", "1000.00", "1000.00"]),
+            },
+        )
+
+    def test_dry_run_matches_cycle_and_writes_nothing(self):
+        out = StringIO()
+        call_command("run_retainer_cycle", "2025-01", "--dry-run", stdout=out)
+        self.assertIn("3 draft(s) totalling 1700.00", out.getvalue())
+        self.assertFalse(BillingStatement.objects.exists())
+        self.assertEqual(run_retainer_cycle("2025-01", actor=self.user)["created"], 3)
+
+    def test_range_dry_run_skips_periods_behind_the_marker(self):
+        Engagement.objects.filter(pk=self.ongoing.pk).update(last_generated_period="2025-02")
+        out = StringIO()
+        call_command("run_retainer_cycle", "--from", "2025-01", "--to", "2025-03", "--dry-run", stdout=out)
+        self.assertIn("4 draft(s) totalling 1900.00", out.getvalue())
+        results = run_retainer_catch_up("2025-01", "2025-03", actor=self.user)
+        self.assertEqual(sum(summary["created"] for summary in results.values()), 4)
+
+    def test_forecast_endpoint(self):
+        api = APIClient()
+        api.force_authenticate(self.user)
+        response = api.get("/api/reports/retainer-forecast/?months=12&start=2025-01")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["periods"]), 12)
+        self.assertEqual(response.data["periods"][-1]["period"], "2025-12")
+        self.assertEqual(api.get("/api/reports/retainer-forecast/?months=0").status_code, 400)
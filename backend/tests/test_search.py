@@ -0,0 +1,106 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from common.search import trigram_available
+from engagements.models import Engagement
+from payments.models import Payment
+from statements.models import BillingStatement
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="searcher", password="password123", role=User.Roles.ADMIN)
+        cls.initech = Client.objects.create(name="Initech Holdings", aliases=["INTC"], group="Initech Group", status=Client.Status.ACTIVE)
+        cls.globex = Client.objects.create(name="Globex", status=Client.Status.ACTIVE)
+        cls.engagement = Engagement.objects.create(
+            client=cls.globex,
+            type=Engagement.Types.SPECIAL,
+            title="Initial public offering support",
+            status=Engagement.Status.ACTIVE,
+            start_date=date(2025, 1, 1),
+        )
+        bookkeeping = Engagement.objects.create(
+            client=cls.initech,
+            type=Engagement.Types.RETAINER,
+            title="Monthly bookkeeping",
+            status=Engagement.Status.ACTIVE,
+            start_date=date(2025, 1, 1),
+        )
+        cls.statement = BillingStatement.objects.create(
+            client=cls.initech,
+            engagement=bookkeeping,
+            number="SOA-2025-0001",
+            period="2025-08",
+            status=BillingStatement.Status.ISSUED,
+            currency="PHP",
+            notes="Retainer for August",
+        )
+        cls.payment = Payment.objects.create(
+            client=cls.globex,
+            payment_date=date(2025, 9, 1),
+            amount_received=Decimal("1500.00"),
+            currency="PHP",
+            method=Payment.Method.CASH,
+            manual_invoice_no="OR-7781",
+            recorded_by=cls.user,
+        )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def results(self, query):
+        return [(row["type"], row["id"]) for row in self.api.get("/api/search/", {"q": query}).data["results"]]
+
+    def test_word_prefixes_match_across_entities(self):
+        results = self.results("init")
+        self.assertEqual(set(results), {("client", self.initech.id), ("engagement", self.engagement.id)})
+        self.assertEqual(self.results("initech hold"), [("client", self.initech.id)])
+        self.assertEqual(self.results("!!"), [])
+
+    def test_codes_match_as_typed(self):
+        self.assertEqual(self.results("SOA-2025"), [("statement", self.statement.id)])
+        self.assertEqual(self.results("or-7781"), [("payment", self.payment.id)])
+        self.assertEqual(self.results("SOA-2026"), [])
+
+    def test_title_matches_rank_above_notes(self):
+        audit = Engagement.objects.create(
+            client=self.initech,
+            type=Engagement.Types.SPECIAL,
+            title="Audit",
+            status=Engagement.Status.ACTIVE,
+            start_date=date(2025, 1, 1),
+        )
+        BillingStatement.objects.filter(pk=self.statement.pk).update(notes="Audit fieldwork")
+        self.assertEqual(self.results("audit"), [("engagement", audit.id), ("statement", self.statement.id)])
+
+    def test_ranks_share_one_scale_across_entities(self):
+        rows = self.api.get("/api/search/", {"q": "init"}).data["results"]
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(0 < row["rank"] <= 0.5 for row in rows))
+        if trigram_available():
+            # An exact name match scores like a perfect full-text match, not above every other entity.
+            client = self.api.get("/api/search/", {"q": "globex"}).data["results"][0]
+            self.assertLessEqual(client["rank"], 0.5)
+
+    def test_list_search_matches_related_client(self):
+        rows = self.api.get("/api/billing-statements/", {"search": "initech"}).data["results"]
+        self.assertEqual([row["id"] for row in rows], [self.statement.id])
+        rows = self.api.get("/api/payments/", {"search": "globex"}).data["results"]
+        self.assertEqual([row["id"] for row in rows], [self.payment.id])
+        rows = self.api.get("/api/clients/", {"search": "intc"}).data["results"]
+        self.assertEqual([row["id"] for row in rows], [self.initech.id])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.api.get("/api/search/").status_code, 400)
+
+    def test_misspelt_client_names_match_by_trigram(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        self.assertIn(("client", self.globex.id), self.results("globexx"))
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from statements.models import BillingItem, BillingStatement
+
+
+class StatementItemWriteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="biller", password="password123", role=User.Roles.BILLER)
+        self.client_obj = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        self.engagement = Engagement.objects.create(
+            client=self.client_obj,
+            type=Engagement.Types.SPECIAL,
+            title="Audit",
+            start_date=timezone.now().date(),
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def create_statement(self, lines):
+        payload = {
+            "client": self.client_obj.pk,
+            "engagement": self.engagement.pk,
+            "period": "2025-09",
+            "items": [{"description": f"Line {n}", "qty": "2.00", "unit_price": "10.00"} for n in range(lines)],
+        }
+        return self.api.post("/api/billing-statements/", payload, format="json")
+
+    def test_create_cost_does_not_grow_with_line_count(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.create_statement(2).status_code, 201)
+        BillingStatement.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            response = self.create_statement(40)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(Decimal(response.data["sub_total"]), Decimal("800.00"))
+        self.assertEqual(len(response.data["items"]), 40)
+
+    def test_update_diffs_items_by_id(self):
+        response = self.create_statement(3)
+        statement_id = response.data["id"]
+        first, second, third = response.data["items"]
+        untouched = BillingItem.objects.get(pk=first["id"]).updated_at
+
+        response = self.api.patch(
+            f"/api/billing-statements/{statement_id}/",
+            {
+                "items": [
+                    {"id": first["id"], "description": first["description"], "qty": "2.00", "unit_price": "10.00"},
+                    {"id": second["id"], "description": "Changed", "qty": "3.00", "unit_price": "10.00"},
+                    {"description": "New", "qty": "1.00", "unit_price": "5.00"},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BillingItem.objects.get(pk=first["id"]).updated_at, untouched)
+        self.assertEqual(BillingItem.objects.get(pk=second["id"]).line_total, Decimal("30.00"))
+        self.assertFalse(BillingItem.objects.filter(pk=third["id"]).exists())
+        self.assertEqual(Decimal(response.data["sub_total"]), Decimal("55.00"))
+
+    def test_update_rejects_foreign_item_id(self):
+        response = self.create_statement(1)
+        other = BillingStatement.objects.create(
+            client=self.client_obj, engagement=self.engagement, period="2025-10", created_by=self.user, updated_by=self.user
+        )
+        foreign = BillingItem.objects.create(billing_statement=other, description="Other", unit_price=Decimal("1.00"))
+        response = self.api.patch(
+            f"/api/billing-statements/{response.data['id']}/",
+            {"items": [{"id": foreign.pk, "description": "Hijack", "qty": "1.00", "unit_price": "1.00"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.description, "Other")
@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+from payments.models import Payment, PaymentAllocation
+from statements.models import BillingItem, BillingStatement
+from statements.totals import deferred_totals, mark_totals_dirty, recalculate_statement_totals
+
+
+class StatementTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="totals", password="password123", role=User.Roles.BILLER)
+        cls.customer = Client.objects.create(name="Initech", status=Client.Status.ACTIVE)
+        cls.engagement = Engagement.objects.create(
+            client=cls.customer,
+            type=Engagement.Types.SPECIAL,
+            title="Audit",
+            status=Engagement.Status.ACTIVE,
+            start_date=timezone.now().date(),
+        )
+
+    def make_statement(self, period, status=BillingStatement.Status.ISSUED):
+        return BillingStatement.objects.create(
+            client=self.customer,
+            engagement=self.engagement,
+            period=period,
+            status=status,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def add_item(self, statement, amount):
+        return BillingItem.objects.create(
+            billing_statement=statement,
+            description="Services",
+            unit_price=Decimal(amount),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def test_bulk_recalculation_sets_totals_and_settled_status(self):
+        paid = self.make_statement("2025-01")
+        owing = self.make_statement("2025-02")
+        draft = self.make_statement("2025-03", status=BillingStatement.Status.DRAFT)
+        with deferred_totals():
+            for statement in (paid, owing, draft):
+                self.add_item(statement, "1000.00")
+            payment = Payment.objects.create(
+                client=self.customer,
+                payment_date=timezone.now().date(),
+                amount_received=Decimal("1000.00"),
+                method=Payment.Method.CASH,
+                manual_invoice_no="INV-100",
+                recorded_by=self.user,
+                created_by=self.user,
+                updated_by=self.user,
+            )
+            PaymentAllocation.objects.bulk_create(
+                [PaymentAllocation(payment=payment, billing_statement=paid, amount_applied=Decimal("1000.00"))]
+            )
+            mark_totals_dirty(paid.pk)
+            self.add_item(owing, "250.00")
+
+        for statement in (paid, owing, draft):
+            statement.refresh_from_db()
+        self.assertEqual((paid.sub_total, paid.paid_to_date, paid.balance), (Decimal("1000.00"), Decimal("1000.00"), Decimal("0.00")))
+        self.assertEqual(paid.status, BillingStatement.Status.SETTLED)
+        self.assertEqual(owing.balance, Decimal("1250.00"))
+        self.assertEqual(owing.status, BillingStatement.Status.ISSUED)
+        self.assertEqual(draft.status, BillingStatement.Status.DRAFT)
+
+        # Already-correct rows are left untouched.
+        self.assertEqual(recalculate_statement_totals([paid.pk, owing.pk, draft.pk]), [])
+
+    def test_deferred_block_flushes_once(self):
+        statements = [self.make_statement(f"2024-{month:02d}") for month in range(1, 4)]
+        with CaptureQueriesContext(connection) as ctx:
+            with deferred_totals():
+                for statement in statements:
+                    for _ in range(3):
+                        self.add_item(statement, "100.00")
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].lstrip().startswith("WITH item_totals")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            set(BillingStatement.objects.filter(pk__in=[s.pk for s in statements]).values_list("sub_total", flat=True)),
+            {Decimal("300.00")},
+        )
+
+    def test_removing_payment_reopens_settled_statement(self):
+        statement = self.make_statement("2025-04")
+        self.add_item(statement, "500.00")
+        payment = Payment.objects.create(
+            client=self.customer,
+            payment_date=timezone.now().date(),
+            amount_received=Decimal("500.00"),
+            method=Payment.Method.CASH,
+            manual_invoice_no="INV-101",
+            recorded_by=self.user,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        allocation = PaymentAllocation.objects.bulk_create(
+            [PaymentAllocation(payment=payment, billing_statement=statement, amount_applied=Decimal("500.00"))]
+        )[0]
+        statement.recalculate_totals(save=True)
+        self.assertEqual(statement.status, BillingStatement.Status.SETTLED)
+
+        allocation.delete()
+        statement.refresh_from_db()
+        self.assertEqual(statement.status, BillingStatement.Status.ISSUED)
+        self.assertEqual(statement.balance, Decimal("500.00"))
@@ -0,0 +1,70 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from clients.models import Client
+from engagements.models import Engagement
+
+
+class TagFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="tagger", password="password123", role=User.Roles.ADMIN)
+        cls.acme = Client.objects.create(name="Acme", tags=["vat", "retail"], aliases=["ACME Corp"], status=Client.Status.ACTIVE)
+        cls.globex = Client.objects.create(name="Globex", tags=["vat"], status=Client.Status.ACTIVE)
+        cls.initech = Client.objects.create(name="Initech", tags=["nonvat"], status=Client.Status.INACTIVE)
+        for customer, tags in ((cls.acme, ["audit", "priority"]), (cls.globex, ["audit"]), (cls.initech, ["payroll"])):
+            Engagement.objects.create(
+                client=customer,
+                type=Engagement.Types.RETAINER,
+                title=f"{customer.name} retainer",
+                tags=tags,
+                status=Engagement.Status.ACTIVE,
+                start_date=date(2025, 1, 1),
+            )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def names(self, url, params, key="name"):
+        return sorted(row[key] for row in self.api.get(url, params).data["results"])
+
+    def test_client_tags_all_and_any_compile_to_one_operator(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.names("/api/clients/", {"tags": "vat,retail"}), ["Acme"])
+        self.assertEqual(sum('"tags" @> ' in query["sql"] for query in queries), 1)
+        self.assertEqual(self.names("/api/clients/", {"tags_any": "retail,nonvat"}), ["Acme", "Initech"])
+        self.assertEqual(self.names("/api/clients/", {"aliases": "ACME Corp"}), ["Acme"])
+
+    def test_engagement_json_tags(self):
+        url = "/api/engagements/"
+        self.assertEqual(self.names(url, {"tags": "audit,priority"}, "title"), ["Acme retainer"])
+        self.assertEqual(self.names(url, {"tags_any": "priority,payroll"}, "title"), ["Acme retainer", "Initech retainer"])
+        self.assertEqual(self.names(url, {"tags": " , "}, "title"), ["Acme retainer", "Globex retainer", "Initech retainer"])
+
+    def test_facets_count_tags_of_filtered_rows(self):
+        with self.assertNumQueries(1):
+            facets = self.api.get("/api/clients/tags/").data["results"]
+        self.assertEqual(facets, [{"tag": "vat", "count": 2}, {"tag": "nonvat", "count": 1}, {"tag": "retail", "count": 1}])
+        facets = self.api.get("/api/clients/tags/", {"status": "active"}).data["results"]
+        self.assertEqual([row["tag"] for row in facets], ["vat", "retail"])
+        facets = self.api.get("/api/engagements/tags/", {"tags": "audit"}).data["results"]
+        self.assertEqual(facets, [{"tag": "audit", "count": 2}, {"tag": "priority", "count": 1}])
+
+    def test_engagement_tags_must_be_a_list_of_strings(self):
+        engagement = Engagement.objects.get(client=self.globex)
+        for tags in ("audit", {"audit": True}, [{"name": "audit"}]):
+            response = self.api.patch(f"/api/engagements/{engagement.pk}/", {"tags": tags}, format="json")
+            self.assertEqual(response.status_code, 400, tags)
+        response = self.api.patch(f"/api/engagements/{engagement.pk}/", {"tags": ["audit", "vat"]}, format="json")
+        self.assertEqual(response.data["tags"], ["audit", "vat"])
+
+    def test_facets_skip_tags_that_are_not_arrays(self):
+        Engagement.objects.filter(client=self.initech).update(tags="payroll")
+        facets = self.api.get("/api/engagements/tags/").data["results"]
+        self.assertEqual(facets, [{"tag": "audit", "count": 2}, {"tag": "priority", "count": 1}])
@@ -38,3 +38,21 @@ axiosClient.interceptors.response.use(
     return Promise.reject(error);
   }
 );
+
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+// List endpoints return keyset pages; follow `next` links until the list is complete.
+export const fetchAll = async <T>(url: string): Promise<T[]> => {
+  const rows: T[] = [];
+  let nextUrl: string | null = url;
+  while (nextUrl) {
+    const response: { data: CursorPage<T> } = await axiosClient.get<CursorPage<T>>(nextUrl);
+    rows.push(...response.data.results);
+    nextUrl = response.data.next;
+  }
+  return rows;
+};
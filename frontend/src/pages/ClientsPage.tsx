@@ -2,7 +2,7 @@ import { useMemo, useState } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useForm } from "react-hook-form";
 
-import { axiosClient } from "../api/client";
+import { axiosClient, fetchAll } from "../api/client";
 import { InfoCallout } from "../components/InfoCallout";
 import { PageHeader } from "../components/PageHeader";
 import type { Client } from "../types/api";
@@ -26,8 +26,7 @@ const ClientsPage = () => {
   const { data: clients, isLoading } = useQuery<Client[]>({
     queryKey: ["clients"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<Client[]>("/clients/?ordering=name");
-      return data;
+      return fetchAll<Client>("/clients/?ordering=name");
     },
   });
 
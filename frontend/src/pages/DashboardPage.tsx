@@ -4,7 +4,7 @@ import { Link } from "react-router-dom";
 import { axiosClient } from "../api/client";
 import { useAuthStore } from "../hooks/useAuth";
 import { PageHeader } from "../components/PageHeader";
-import type { BillingStatement, Payment } from "../types/api";
+import type { DashboardSummary } from "../types/api";
 
 const DashboardPage = () => {
   const { user } = useAuthStore();
@@ -23,21 +23,19 @@ const DashboardPage = () => {
     },
   });
 
-  const { data: statements } = useQuery<BillingStatement[]>({
-    queryKey: ["statements", { limit: 5 }],
+  const { data: dashboard } = useQuery<DashboardSummary>({
+    queryKey: ["dashboard"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<BillingStatement[]>("/billing-statements/?ordering=-updated_at&limit=5");
-      return data;
-    },
-  });
-
-  const { data: payments } = useQuery<Payment[]>({
-    queryKey: ["payments", { limit: 5 }],
-    queryFn: async () => {
-      const { data } = await axiosClient.get<Payment[]>("/payments/?ordering=-payment_date&limit=5");
+      const { data } = await axiosClient.get<DashboardSummary>("/dashboard/");
       return data;
     },
   });
+  const statements = dashboard?.recent_statements;
+  const payments = dashboard?.recent_payments;
+  const openBalance = dashboard
+    ? Number(dashboard.statements_by_status.issued?.balance ?? 0) +
+      Number(dashboard.statements_by_status.pending_review?.balance ?? 0)
+    : 0;
 
   return (
     <div className="space-y-6">
@@ -60,6 +58,28 @@ const DashboardPage = () => {
         </button>
       )}
 
+      <div className="grid gap-4 md:grid-cols-3">
+        <section className="rounded-xl border border-slate-200 bg-white p-4">
+          <div className="text-xs uppercase text-slate-500">Collections this month</div>
+          <div className="mt-1 text-2xl font-semibold">₱{Number(dashboard?.month_collections.amount ?? 0).toLocaleString()}</div>
+          <div className="text-xs text-slate-500">{dashboard?.month_collections.count ?? 0} payment(s)</div>
+        </section>
+        <section className="rounded-xl border border-slate-200 bg-white p-4">
+          <div className="text-xs uppercase text-slate-500">Open balance</div>
+          <div className="mt-1 text-2xl font-semibold">₱{openBalance.toLocaleString()}</div>
+          <div className="text-xs text-slate-500">
+            {dashboard?.statements_by_status.issued?.count ?? 0} issued statement(s)
+          </div>
+        </section>
+        <section className="rounded-xl border border-slate-200 bg-white p-4">
+          <div className="text-xs uppercase text-slate-500">Pending review</div>
+          <div className="mt-1 text-2xl font-semibold">{dashboard?.pending_review ?? 0}</div>
+          <Link to="/statements" className="text-xs text-primary hover:underline">
+            Review drafts
+          </Link>
+        </section>
+      </div>
+
       <div className="grid gap-4 md:grid-cols-2">
         <section className="rounded-xl border border-slate-200 bg-white p-4">
           <div className="flex items-center justify-between">
@@ -73,8 +93,8 @@ const DashboardPage = () => {
               statements.map((stmt) => (
                 <li key={stmt.id} className="flex items-center justify-between rounded-md bg-slate-50 px-3 py-2">
                   <div>
-                    <div className="font-medium">{stmt.number ?? "Draft"}</div>
-                    <div className="text-xs text-slate-500">{stmt.client_name} • {stmt.period}</div>
+                    <div className="font-medium">{stmt.number || "Draft"}</div>
+                    <div className="text-xs text-slate-500">{stmt.client__name} • {stmt.period}</div>
                   </div>
                   <div className="text-right">
                     <div className="text-xs uppercase text-slate-500">Balance</div>
@@ -103,13 +123,13 @@ const DashboardPage = () => {
                   <div>
                     <div className="font-medium">₱{Number(payment.amount_received).toLocaleString()}</div>
                     <div className="text-xs text-slate-500">
-                      {payment.client_name} • {payment.payment_date}
+                      {payment.client__name} • {payment.payment_date}
                     </div>
                   </div>
                   <div className="text-right text-xs text-slate-500">
                     Method: {payment.method.replace("_", " ")}
                     <br />
-                    Remaining: ₱{Number(payment.remaining_unallocated).toLocaleString()}
+                    Remaining: ₱{Number(payment.unallocated_total).toLocaleString()}
                   </div>
                 </li>
               ))
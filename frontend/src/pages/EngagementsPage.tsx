@@ -2,7 +2,7 @@ import { useMemo, useState } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useForm } from "react-hook-form";
 
-import { axiosClient } from "../api/client";
+import { axiosClient, fetchAll } from "../api/client";
 import { PageHeader } from "../components/PageHeader";
 import type { Client, Engagement } from "../types/api";
 
@@ -31,16 +31,14 @@ const EngagementsPage = () => {
   const { data: clients } = useQuery<Client[]>({
     queryKey: ["clients", "all"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<Client[]>("/clients/?ordering=name");
-      return data;
+      return fetchAll<Client>("/clients/?ordering=name");
     },
   });
 
   const { data: engagements, isLoading } = useQuery<Engagement[]>({
     queryKey: ["engagements"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<Engagement[]>("/engagements/?ordering=client");
-      return data;
+      return fetchAll<Engagement>("/engagements/?ordering=client");
     },
   });
 
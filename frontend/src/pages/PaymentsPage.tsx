@@ -2,7 +2,7 @@ import { useMemo, useState } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useForm } from "react-hook-form";
 
-import { axiosClient } from "../api/client";
+import { axiosClient, fetchAll } from "../api/client";
 import { PageHeader } from "../components/PageHeader";
 import type { BillingStatement, Client, Payment } from "../types/api";
 
@@ -44,24 +44,21 @@ const PaymentsPage = () => {
   const { data: clients } = useQuery<Client[]>({
     queryKey: ["clients", "all"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<Client[]>("/clients/?ordering=name");
-      return data;
+      return fetchAll<Client>("/clients/?ordering=name");
     },
   });
 
   const { data: statements } = useQuery<BillingStatement[]>({
     queryKey: ["statements", { status: "open" }],
     queryFn: async () => {
-      const { data } = await axiosClient.get<BillingStatement[]>("/billing-statements/?status=issued");
-      return data;
+      return fetchAll<BillingStatement>("/billing-statements/?status=issued");
     },
   });
 
   const { data: payments, isLoading: paymentsLoading } = useQuery<Payment[]>({
     queryKey: ["payments"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<Payment[]>("/payments/?ordering=-payment_date,-created_at");
-      return data;
+      return fetchAll<Payment>("/payments/?ordering=-payment_date,-created_at");
     },
   });
 
@@ -2,18 +2,17 @@ import { useMemo, useState } from "react";
 import { addDays, format } from "date-fns";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 
-import { axiosClient } from "../api/client";
+import { axiosClient, fetchAll } from "../api/client";
 import { InfoCallout } from "../components/InfoCallout";
 import { PageHeader } from "../components/PageHeader";
-import type { BillingStatement } from "../types/api";
+import type { BillingStatement, RetainerCycleJob } from "../types/api";
 
 const StatementsPage = () => {
   const queryClient = useQueryClient();
   const { data: statements, isLoading } = useQuery<BillingStatement[]>({
     queryKey: ["statements"],
     queryFn: async () => {
-      const { data } = await axiosClient.get<BillingStatement[]>("/billing-statements/?ordering=-created_at");
-      return data;
+      return fetchAll<BillingStatement>("/billing-statements/?ordering=-created_at");
     },
   });
 
@@ -59,18 +58,34 @@ const StatementsPage = () => {
   });
 
   const runRetainerCycle = useMutation({
-    mutationFn: (period: string) => axiosClient.post("/engagements/run-cycle/", { period }),
-    onSuccess: () => queryClient.invalidateQueries({ queryKey: ["statements"] }),
+    mutationFn: (period: string) => axiosClient.post<RetainerCycleJob>("/engagements/run-cycle/", { period }),
     onError: (error: any) => {
       alert(error.response?.data?.detail ?? "Unable to start retainer cycle.");
     },
   });
 
+  const waitForCycleJob = async (jobId: number): Promise<RetainerCycleJob> => {
+    for (;;) {
+      const { data } = await axiosClient.get<RetainerCycleJob>(`/engagements/cycle-jobs/${jobId}/`);
+      if (data.status === "succeeded" || data.status === "failed") return data;
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+  };
+
   const handleRunCycle = async () => {
     const period = prompt("Generate retainer drafts for period (YYYY-MM)?", format(new Date(), "yyyy-MM"));
     if (!period) return;
-    await runRetainerCycle.mutateAsync(period);
-    alert("Retainer cycle triggered. Drafts will appear once generated.");
+    const { data: job } = await runRetainerCycle.mutateAsync(period);
+    alert("Retainer cycle queued. Drafts will appear once generated.");
+    const finished = await waitForCycleJob(job.id);
+    queryClient.invalidateQueries({ queryKey: ["statements"] });
+    if (finished.status === "failed") {
+      alert(`Retainer cycle ${finished.period} failed: ${finished.error}`);
+    } else {
+      alert(
+        `Retainer cycle ${finished.period} done: ${finished.created} created, ${finished.skipped} skipped, ${finished.failed} failed.`
+      );
+    }
   };
 
   const toggleStatementSelection = (statementId: number, checked: boolean) => {
@@ -65,6 +65,18 @@ export interface BillingStatement {
   items: BillingItem[];
 }
 
+export interface RetainerCycleJob {
+  id: number;
+  period: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  total: number;
+  processed: number;
+  created: number;
+  skipped: number;
+  failed: number;
+  error: string;
+}
+
 export interface PaymentAllocation {
   id: number;
   billing_statement: number;
@@ -90,3 +102,36 @@ export interface AgingBucketRow {
   bucket: string;
   total_balance: string;
 }
+
+export interface DashboardStatement {
+  id: number;
+  number: string;
+  period: string;
+  status: string;
+  client_id: number;
+  client__name: string;
+  due_date?: string | null;
+  balance: string;
+  created_at: string;
+}
+
+export interface DashboardPayment {
+  id: number;
+  client_id: number;
+  client__name: string;
+  payment_date: string;
+  amount_received: string;
+  method: string;
+  status: string;
+  unallocated_total: string;
+}
+
+export interface DashboardSummary {
+  as_of: string;
+  recent_statements: DashboardStatement[];
+  recent_payments: DashboardPayment[];
+  statements_by_status: Record<string, { count: number; sub_total: string; balance: string }>;
+  payments_by_status: Record<string, { count: number; amount: string }>;
+  month_collections: { start: string; count: number; amount: string };
+  pending_review: number;
+}